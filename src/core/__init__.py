@@ -1,6 +1,10 @@
 from .client import MCPClient
-from .tools import MCPTools
+from .pool import MCPClientPool
+from .tools import MCPTools, ToolCall, ToolResult
+from .catalog import ToolCatalogCache
+from .cache import ToolResultCache
 from .logger import MCPLogger
 from .orchestrator import ToolOrchestrator
+from .plan import PlanExecutor, PlanStep
 
-__all__ = ['MCPClient', 'MCPTools', 'MCPLogger', 'ToolOrchestrator']
+__all__ = ['MCPClient', 'MCPClientPool', 'MCPTools', 'ToolCall', 'ToolResult', 'ToolCatalogCache', 'ToolResultCache', 'MCPLogger', 'ToolOrchestrator', 'PlanExecutor', 'PlanStep']
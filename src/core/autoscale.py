@@ -0,0 +1,84 @@
+from typing import Optional
+import math
+import time
+
+
+class Autoscaler:
+    """Decides how many replicas a pool should run
+
+    The pool is grown when the backlog per replica exceeds
+    ``target_queue_depth`` or the p95 call latency exceeds ``target_p95``.
+    It is shrunk by one replica once load has stayed low for
+    ``scale_down_delay`` seconds. After any change, no further change is made
+    for ``cooldown`` seconds so the new replicas can absorb the load.
+    """
+
+    def __init__(self,
+                 target_queue_depth: float = 1.0,
+                 target_p95: Optional[float] = None,
+                 interval: float = 1.0,
+                 cooldown: float = 5.0,
+                 scale_down_delay: float = 30.0,
+                 scale_down_load: float = 0.5,
+                 min_samples: int = 5):
+        """
+        Args:
+            target_queue_depth: Calls waiting per replica above which the pool grows
+            target_p95: p95 latency in seconds above which the pool grows.
+                ``None`` scales on queue depth only.
+            interval: Seconds between scaling decisions
+            cooldown: Seconds after a change before the next one
+            scale_down_delay: Seconds load must stay low before shrinking
+            scale_down_load: Load per remaining replica below which the pool
+                counts as underused
+            min_samples: Latency samples needed before p95 is trusted
+        """
+        if target_queue_depth <= 0:
+            raise ValueError(f"target_queue_depth must be positive, got {target_queue_depth}")
+        self.target_queue_depth = target_queue_depth
+        self.target_p95 = target_p95
+        self.interval = interval
+        self.cooldown = cooldown
+        self.scale_down_delay = scale_down_delay
+        self.scale_down_load = scale_down_load
+        self.min_samples = min_samples
+        self._changed_at: Optional[float] = None
+        self._calm_since: Optional[float] = None
+
+    def desired_size(self,
+                     size: int,
+                     min_size: int,
+                     max_size: int,
+                     backlog: int,
+                     load: int,
+                     p95: Optional[float] = None,
+                     samples: int = 0) -> int:
+        """Replica count to run given the pool's current backlog, load and latency"""
+        now = time.monotonic()
+        slow = (
+            self.target_p95 is not None
+            and p95 is not None
+            and samples >= self.min_samples
+            and p95 > self.target_p95
+        )
+        if backlog / size > self.target_queue_depth or slow:
+            self._calm_since = None
+            desired = max(size + 1, math.ceil(backlog / self.target_queue_depth))
+        elif backlog == 0 and size > min_size and load <= (size - 1) * self.scale_down_load:
+            if self._calm_since is None:
+                self._calm_since = now
+            if now - self._calm_since < self.scale_down_delay:
+                return size
+            desired = size - 1
+        else:
+            self._calm_since = None
+            return size
+
+        desired = min(max(desired, min_size), max_size)
+        if desired == size:
+            return size
+        if self._changed_at is not None and now - self._changed_at < self.cooldown:
+            return size
+        self._changed_at = now
+        self._calm_since = None
+        return desired
@@ -0,0 +1,158 @@
+from typing import Any, Dict, Iterable, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+import json
+import time
+
+from src.core.logger import MCPLogger
+from src.core.tools import ToolResult, READ_ONLY_TOOLS, MUTATING_TOOLS
+
+
+def make_call_key(tool_name: str, args: Dict[str, Any], scope: Optional[str] = None) -> str:
+    """Canonical key for a tool call, independent of argument order
+
+    ``scope`` separates calls whose results depend on more than their
+    arguments, such as calls routed to a specific replica by affinity key.
+    """
+    key = f"{tool_name}:{json.dumps(args, sort_keys=True, separators=(',', ':'), default=str)}"
+    return key if scope is None else f"{scope}|{key}"
+
+
+@dataclass
+class _CacheEntry:
+    result: ToolResult
+    expires_at: float
+    size: int
+
+
+class ToolResultCache:
+    """LRU cache of successful results for idempotent tools
+
+    Only tools marked cacheable are stored. A call to a mutating tool drops
+    every cached entry produced by the same client, since the mutation may
+    have changed anything that server returns. Each invalidation also bumps
+    the client's generation, so a read dispatched before a mutation is not
+    stored when it completes after it.
+    """
+
+    def __init__(self,
+                 cacheable: Optional[Iterable[str]] = None,
+                 mutating: Optional[Iterable[str]] = None,
+                 default_ttl: float = 30.0,
+                 ttl: Optional[Dict[str, float]] = None,
+                 max_entries: int = 1024,
+                 max_bytes: Optional[int] = None,
+                 debug: bool = False):
+        """
+        Args:
+            cacheable: Tools whose results may be cached. Defaults to the
+                read-only tools of the reference filesystem and memory servers.
+            mutating: Tools that invalidate their client's cached entries.
+                Defaults to the mutating tools of the reference servers.
+            default_ttl: Seconds a cached result stays valid
+            ttl: Per-tool TTL overrides in seconds
+            max_entries: Maximum number of cached results
+            max_bytes: Optional limit on the approximate total result size,
+                measured as the length of each result's repr
+        """
+        self.cacheable = frozenset(READ_ONLY_TOOLS if cacheable is None else cacheable)
+        self.mutating = frozenset(MUTATING_TOOLS if mutating is None else mutating)
+        self.default_ttl = default_ttl
+        self.ttl = dict(ttl or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.logger = MCPLogger("result_cache", debug_mode=debug)
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        return tool_name in self.cacheable
+
+    def is_mutating(self, tool_name: str) -> bool:
+        return tool_name in self.mutating
+
+    def generation(self, client_name: Optional[str]) -> int:
+        """Counter that changes whenever the client's entries are invalidated"""
+        return self._epoch + self._generations.get(client_name, 0)
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size
+
+    def get(self, tool_name: str, args: Dict[str, Any], scope: Optional[str] = None) -> Optional[ToolResult]:
+        """Return a copy of the cached result for this call, or None"""
+        if not self.is_cacheable(tool_name):
+            return None
+        key = make_call_key(tool_name, args, scope)
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self.logger.log_debug(f"Cache hit for {tool_name}")
+        return replace(entry.result)
+
+    def put(self,
+            tool_name: str,
+            args: Dict[str, Any],
+            result: ToolResult,
+            scope: Optional[str] = None,
+            generation: Optional[int] = None):
+        """Cache a successful result of a cacheable tool
+
+        Args:
+            generation: The client's ``generation`` when the call was
+                dispatched. The result is not stored if the client has been
+                invalidated since, as it may predate a mutation.
+        """
+        if not self.is_cacheable(tool_name) or not result.success:
+            return
+        if generation is not None and generation != self.generation(result.client_name):
+            self.logger.log_debug(f"Result of {tool_name} raced a mutation, not caching")
+            return
+        # MCP reports tool-level failures inside a successful response
+        if getattr(result.data, "isError", False) is True:
+            return
+        ttl = self.ttl.get(tool_name, self.default_ttl)
+        if ttl <= 0:
+            return
+        size = len(repr(result.data))
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.logger.log_debug(f"Result of {tool_name} too large to cache ({size} bytes)")
+            return
+
+        key = make_call_key(tool_name, args, scope)
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = _CacheEntry(replace(result), time.monotonic() + ttl, size)
+        self.total_bytes += size
+
+        # Evict least recently used entries until within limits
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.total_bytes > self.max_bytes
+        ):
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, client_name: Optional[str] = None):
+        """Drop cached results from one client, or everything if no client is given"""
+        if client_name is None:
+            self._entries.clear()
+            self.total_bytes = 0
+            self._epoch += 1
+            return
+        self._generations[client_name] = self._generations.get(client_name, 0) + 1
+        stale = [key for key, entry in self._entries.items() if entry.result.client_name == client_name]
+        for key in stale:
+            self._drop(key)
+        if stale:
+            self.logger.log_debug(f"Invalidated {len(stale)} cached results from {client_name}")
@@ -0,0 +1,123 @@
+from mcp import StdioServerParameters
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+from datetime import datetime
+import hashlib
+import json
+import os
+import tempfile
+
+from src.core.logger import MCPLogger
+from src.core.tools import Tool
+
+
+class ToolCatalogCache:
+    """On-disk snapshot of each MCP server's tool catalog
+
+    Entries are keyed on a hash of the server's command, args and env, so the
+    environment (which may hold secrets) is never written to disk. The server
+    version reported during ``initialize`` is stored alongside the tools and
+    can be used to reject stale snapshots.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: Optional[Path] = None, debug: bool = False):
+        self.path = Path(path) if path else Path.home() / ".cache" / "mcp_adapter" / "tool_catalog.json"
+        self.logger = MCPLogger("catalog", debug_mode=debug)
+
+    @staticmethod
+    def key_for(server_params: StdioServerParameters) -> str:
+        """Stable cache key for a server configuration"""
+        payload = json.dumps({
+            "command": server_params.command,
+            "args": list(server_params.args or []),
+            "env": dict(server_params.env or {})
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("format_version") != self.FORMAT_VERSION:
+                self.logger.log_warning(f"Ignoring tool catalog with unsupported format: {self.path}")
+                return {}
+            return data.get("servers", {})
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.log_warning(f"Ignoring unreadable tool catalog {self.path}: {str(e)}")
+            return {}
+
+    def _write(self, servers: Dict[str, Any]):
+        # Write to a temp file and swap it in so concurrent readers never see a partial file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".tool_catalog.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"format_version": self.FORMAT_VERSION, "servers": servers}, fh)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def get_entry(self, server_params: StdioServerParameters) -> Optional[Dict[str, Any]]:
+        """Raw snapshot entry for a server, or None if not cached"""
+        return self._read().get(self.key_for(server_params))
+
+    def load(self,
+             server_params: StdioServerParameters,
+             server_version: Optional[str] = None) -> Optional[List[Tool]]:
+        """Load a server's cached tools
+
+        Args:
+            server_params: Server configuration to look up
+            server_version: If given, only accept a snapshot taken from this version
+
+        Returns:
+            The cached tools, or None on a miss
+        """
+        entry = self.get_entry(server_params)
+        if entry is None:
+            return None
+        if server_version is not None and entry.get("server_version") != server_version:
+            self.logger.log_debug(
+                f"Tool catalog version mismatch: cached {entry.get('server_version')}, server {server_version}"
+            )
+            return None
+        try:
+            return [Tool.from_dict(tool) for tool in entry["tools"]]
+        except Exception as e:
+            self.logger.log_warning(f"Ignoring corrupt tool catalog entry: {str(e)}")
+            return None
+
+    def store(self,
+              server_params: StdioServerParameters,
+              tools: List[Tool],
+              server_version: Optional[str] = None):
+        """Save a server's tools, replacing any previous snapshot"""
+        servers = self._read()
+        servers[self.key_for(server_params)] = {
+            "command": server_params.command,
+            "args": list(server_params.args or []),
+            "server_version": server_version,
+            "saved_at": datetime.now().isoformat(),
+            "tools": [tool.to_dict() for tool in tools if isinstance(tool, Tool)]
+        }
+        try:
+            self._write(servers)
+            self.logger.log_debug(f"Saved {len(tools)} tools for {server_params.command} to {self.path}")
+        except Exception as e:
+            # The cache is an optimization, never fail the caller because of it
+            self.logger.log_warning(f"Failed to save tool catalog: {str(e)}")
+
+    def invalidate(self, server_params: StdioServerParameters):
+        """Drop a server's snapshot"""
+        servers = self._read()
+        if servers.pop(self.key_for(server_params), None) is not None:
+            try:
+                self._write(servers)
+            except Exception as e:
+                self.logger.log_warning(f"Failed to update tool catalog: {str(e)}")
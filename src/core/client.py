@@ -1,19 +1,413 @@
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from contextlib import asynccontextmanager
 from pathlib import Path
+import asyncio
+import time
+import anyio
 from src.core.logger import MCPLogger
-from src.core.tools import Tool
+from src.core.tools import Tool, ToolResult, MUTATING_TOOLS
+
+# Errors raised when the server process exits or its stdio streams close
+_CONNECTION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+    EOFError,
+)
+
+# Per-call hook of execute_many: awaits send() to send the call, or returns a result of its own
+Dispatch = Callable[[str, Callable[[], Awaitable[ToolResult]]], Awaitable[ToolResult]]
+
+
+def _server_info(result: Any) -> Any:
+    """Server info from an ``initialize`` result, across mcp SDK versions"""
+    info = getattr(result, "server_info", None)
+    return info if info is not None else getattr(result, "serverInfo", None)
+
+
+class _PersistentSession:
+    """Keeps one MCP server process and its initialized session alive
+
+    The stdio transport and session context managers are entered and exited
+    inside a single background task, because the underlying anyio cancel
+    scopes must be closed by the same task that opened them.
+    """
+
+    def __init__(self, server_params: StdioServerParameters, logger: MCPLogger):
+        self.server_params = server_params
+        self.logger = logger
+        self.session: Optional[ClientSession] = None
+        self.server_info: Any = None
+        self._task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+        self._shutdown = asyncio.Event()
+        self._error: Optional[BaseException] = None
+        self.started_at = time.monotonic()
+        self.calls = 0
+        self.active = 0
+        self.retired = False
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self) -> ClientSession:
+        """Spawn the server and wait until the session is initialized"""
+        self._task = asyncio.create_task(self._run())
+        try:
+            await self._ready.wait()
+        except BaseException:
+            # The caller gave up (e.g. a startup deadline); nobody else holds
+            # this session, so tear the server process down here
+            self._shutdown.set()
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            raise
+        if self.session is None:
+            raise self._error or RuntimeError("MCP session closed during startup")
+        return self.session
+
+    async def _run(self):
+        try:
+            async with stdio_client(self.server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    self.logger.log_debug("Initializing persistent session")
+                    result = await session.initialize()
+                    self.server_info = _server_info(result)
+                    self.session = session
+                    self._ready.set()
+                    await self._shutdown.wait()
+        except Exception as e:
+            self._error = e
+            self.logger.log_error(f"Persistent session terminated: {str(e)}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def stop(self):
+        """Close the session and terminate the server process"""
+        self._shutdown.set()
+        if self._task and not self._task.done():
+            await self._task
+
 
 class MCPClient:
     def __init__(self, 
                  server_params: StdioServerParameters, 
                  debug: bool = False,
                  log_file: Optional[Path] = None,
-                 client_name: Optional[str] = "MCPClient"):
+                 client_name: Optional[str] = "MCPClient",
+                 persistent: bool = False,
+                 max_in_flight: Optional[int] = None,
+                 call_timeout: Optional[float] = None,
+                 tool_timeouts: Optional[Dict[str, float]] = None,
+                 recycle_on_timeout: bool = False,
+                 health_check_interval: Optional[float] = None,
+                 ping_timeout: float = 5.0,
+                 warm_standby: bool = False,
+                 retry_on_crash: Optional[bool] = None,
+                 max_calls: Optional[int] = None,
+                 max_lifetime: Optional[float] = None,
+                 idle_timeout: Optional[float] = None):
+        """
+        Args:
+            server_params: How to launch the MCP server
+            debug: Enable debug logging
+            log_file: Optional file to write logs to
+            client_name: Name used for logging
+            persistent: Keep one server process and session open across calls
+                instead of spawning the server for every request. The session
+                is opened on first use (or by ``connect``) and torn down by
+                ``close``.
+            max_in_flight: Maximum number of concurrent tool calls. Calls over
+                the limit wait in FIFO order for a free slot. With a persistent
+                session, concurrent calls are multiplexed over the same
+                JSON-RPC stream. ``None`` means unbounded.
+            call_timeout: Default deadline in seconds for a tool call,
+                including time spent waiting for a slot. ``None`` waits forever.
+            tool_timeouts: Per-tool deadlines overriding ``call_timeout``
+            recycle_on_timeout: Restart the persistent session after a call
+                times out, for servers that keep working on cancelled
+                requests. Other calls still running on that session fail.
+            health_check_interval: Seconds between pings of the persistent
+                session. A failed or slow ping respawns the server.
+            ping_timeout: Seconds a health check ping may take
+            warm_standby: Keep a second, initialized server process ready to
+                take over immediately when the active one dies
+            retry_on_crash: Retry a call once on the respawned session when
+                the server dies while it is in flight. ``None`` retries only
+                tools outside ``MUTATING_TOOLS``, since a mutation may already
+                have been applied; ``True`` retries every tool and ``False``
+                none.
+            max_calls: Replace the server process after it has served this
+                many calls, to bound memory growth in leaky servers
+            max_lifetime: Replace the server process once it is this many
+                seconds old. Calls already running on a replaced process
+                finish before it is shut down.
+            idle_timeout: Shut the server process down after this many seconds
+                without calls. The next call starts it again.
+        """
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight}")
         self.server_params = server_params
+        self.client_name = client_name
+        self.persistent = persistent
         self.logger = MCPLogger(client_name, debug_mode=debug, log_file=log_file)
-        self._current_session = None
+        self._current_session: Optional[_PersistentSession] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self.max_in_flight = max_in_flight
+        self._in_flight_limit: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.queued = 0
+        self.server_info: Any = None
+        self.call_timeout = call_timeout
+        self.tool_timeouts: Dict[str, float] = dict(tool_timeouts or {})
+        self.recycle_on_timeout = recycle_on_timeout
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self.warm_standby = warm_standby
+        self.retry_on_crash = retry_on_crash
+        self.restarts = 0
+        self.tools_changed = False
+        self.max_calls = max_calls
+        self.max_lifetime = max_lifetime
+        self.idle_timeout = idle_timeout
+        self.last_used = time.monotonic()
+        self._reaper: Optional[asyncio.Task] = None
+        self._tool_names: Optional[set] = None
+        self._standby: Optional[_PersistentSession] = None
+        self._standby_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[asyncio.Task] = None
+        self._background_tasks: set = set()
+
+    async def __aenter__(self) -> "MCPClient":
+        if self.persistent:
+            await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def connected(self) -> bool:
+        """Whether a persistent session is currently open"""
+        return self._current_session is not None and self._current_session.alive
+
+    @property
+    def server_version(self) -> Optional[str]:
+        """Server version reported by the last ``initialize`` handshake"""
+        version = getattr(self.server_info, "version", None)
+        return version if isinstance(version, str) else None
+
+    @property
+    def load(self) -> int:
+        """Number of calls running or waiting for a slot"""
+        return self.in_flight + self.queued
+
+    @property
+    def idle_for(self) -> float:
+        """Seconds since the last call finished, or 0 while calls are running"""
+        if self.load:
+            return 0.0
+        return time.monotonic() - self.last_used
+
+    async def connect(self) -> None:
+        """Start the server and keep its session open for subsequent calls"""
+        await self._ensure_session()
+
+    async def _ensure_session(self) -> ClientSession:
+        if self.connected and not self._due_for_recycle(self._current_session):
+            return self._current_session.session
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            holder = self._current_session
+            if holder is not None and holder.alive and self._due_for_recycle(holder):
+                self.logger.log_info(
+                    f"Recycling server process after {holder.calls} calls "
+                    f"and {time.monotonic() - holder.started_at:.0f}s"
+                )
+                self._current_session = None
+                self._retire(holder)
+            if self.connected:
+                return self._current_session.session
+            self.logger.log_debug("Starting persistent session")
+            holder = _PersistentSession(self.server_params, self.logger)
+            session = await holder.start()
+            self._current_session = holder
+            self.server_info = holder.server_info
+            self.logger.log_info("Persistent session established")
+            self.last_used = time.monotonic()
+            self._after_connect()
+            return session
+
+    def _due_for_recycle(self, holder: _PersistentSession) -> bool:
+        if self.max_calls is not None and holder.calls >= self.max_calls:
+            return True
+        return self.max_lifetime is not None and time.monotonic() - holder.started_at >= self.max_lifetime
+
+    def _retire(self, holder: _PersistentSession):
+        """Shut a replaced session down once its running calls have finished"""
+        holder.retired = True
+        if holder.active == 0:
+            self._spawn_background(holder.stop())
+
+    def _spawn_background(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def _after_connect(self):
+        """Start the standby process and watchdog that guard a persistent session"""
+        if self.warm_standby and self._standby is None and (
+            self._standby_task is None or self._standby_task.done()
+        ):
+            self._standby_task = self._spawn_background(self._start_standby())
+        if self.health_check_interval and (self._watchdog is None or self._watchdog.done()):
+            self._watchdog = self._spawn_background(self._watch())
+        if self.idle_timeout and (self._reaper is None or self._reaper.done()):
+            self._reaper = self._spawn_background(self._reap_idle())
+
+    async def _reap_idle(self):
+        """Shut the server process down once it has been idle for ``idle_timeout``"""
+        while self._current_session is not None:
+            remaining = self.idle_timeout - self.idle_for
+            if remaining > 0 or self.load:
+                await asyncio.sleep(remaining if remaining > 0 else self.idle_timeout)
+                continue
+            self.logger.log_info(f"Closing server process idle for {self.idle_for:.0f}s")
+            holder, self._current_session = self._current_session, None
+            self._retire(holder)
+            standby, self._standby = self._standby, None
+            if standby is not None:
+                self._spawn_background(standby.stop())
+
+    async def _start_standby(self):
+        holder = _PersistentSession(self.server_params, self.logger)
+        try:
+            await holder.start()
+        except Exception as e:
+            self.logger.log_error(f"Failed to start standby session: {str(e)}")
+            return
+        if self._current_session is None:
+            # The client was closed while the standby was starting
+            await holder.stop()
+            return
+        self._standby = holder
+        self.logger.log_debug("Standby session ready")
+
+    def _is_connection_error(self, error: Exception, holder: _PersistentSession) -> bool:
+        return (
+            not holder.alive
+            or isinstance(error, _CONNECTION_ERRORS)
+            or "connection closed" in str(error).lower()
+        )
+
+    async def _recover(self, holder: _PersistentSession) -> ClientSession:
+        """Replace a dead or wedged persistent session, promoting the standby if one is ready"""
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._current_session is not holder and self.connected:
+                # Another caller already recovered
+                return self._current_session.session
+            self.logger.log_warning("Persistent session lost, respawning server")
+            self._current_session = None
+            self._spawn_background(holder.stop())
+
+            standby, self._standby = self._standby, None
+            if standby is not None and standby.alive:
+                self.logger.log_info("Promoting standby session")
+                replacement = standby
+            else:
+                replacement = _PersistentSession(self.server_params, self.logger)
+                await replacement.start()
+            self._current_session = replacement
+            self.server_info = replacement.server_info
+            self.restarts += 1
+        self._after_connect()
+        self._spawn_background(self._revalidate_tools(replacement))
+        return replacement.session
+
+    async def _revalidate_tools(self, holder: _PersistentSession):
+        """Check that a respawned server still offers the tools callers know about"""
+        if self._tool_names is None or not holder.alive:
+            return
+        try:
+            tools = await holder.session.list_tools()
+            names = set()
+            for tool_data in tools.tools:
+                try:
+                    names.add(self._convert_to_tool(tool_data).name)
+                except Exception:
+                    continue
+        except Exception as e:
+            self.logger.log_error(f"Failed to revalidate tools after respawn: {str(e)}")
+            return
+        if names != self._tool_names:
+            self.tools_changed = True
+            self.logger.log_warning(
+                f"Tool list changed after respawn: added {sorted(names - self._tool_names)}, "
+                f"removed {sorted(self._tool_names - names)}"
+            )
+            self._tool_names = names
+
+    async def _watch(self):
+        """Periodically ping the persistent session and respawn it if it stops answering"""
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            holder = self._current_session
+            if holder is None:
+                continue
+            try:
+                if not holder.alive:
+                    raise ConnectionError("session closed")
+                await asyncio.wait_for(holder.session.send_ping(), self.ping_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.log_warning(f"Health check failed: {str(e) or e.__class__.__name__}")
+                try:
+                    await self._recover(holder)
+                except Exception as recover_error:
+                    self.logger.log_error(f"Failed to respawn server: {str(recover_error)}")
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Reserve an in-flight slot, waiting in line while the limit is reached"""
+        if self.max_in_flight is not None:
+            if self._in_flight_limit is None:
+                self._in_flight_limit = asyncio.Semaphore(self.max_in_flight)
+            self.queued += 1
+            try:
+                await self._in_flight_limit.acquire()
+            finally:
+                self.queued -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.last_used = time.monotonic()
+            if self._in_flight_limit is not None:
+                self._in_flight_limit.release()
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[ClientSession]:
+        """Yield an initialized session, either the persistent one or a fresh one"""
+        if self.persistent:
+            yield await self._ensure_session()
+            return
+        async with stdio_client(self.server_params) as (read, write):
+            async with ClientSession(read, write) as session:
+                self.logger.log_debug("Initializing session")
+                result = await session.initialize()
+                self.server_info = _server_info(result)
+                yield session
 
     def _convert_to_tool(self, tool_data: Tuple[Tuple[str, str], Tuple[str, str], List[Dict[str, Any]]]) -> Tool:
         """Convert raw tool data from server to Tool object"""
@@ -50,44 +444,173 @@ class MCPClient:
     async def get_tools(self) -> List[Tool]:
         self.logger.log_debug("Retrieving tools from MCP server")
         try:
-            async with stdio_client(self.server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    self.logger.log_debug("Initializing session")
-                    await session.initialize()
-                    tools = await session.list_tools()
-                    
-                    # Convert raw tool data to Tool objects
-                    tool_objects = []
-                    for tool_data in tools.tools:
-                        try:
-                            tool = self._convert_to_tool(tool_data)
-                            tool_objects.append(tool)
-                        except Exception as e:
-                            self.logger.log_error(f"Skipping tool due to conversion error: {str(e)}")
-                            continue
-                    
-                    self.logger.log_info(f"Retrieved {len(tool_objects)} tools")
-                    return tool_objects
+            async with self._session() as session:
+                tools = await session.list_tools()
+                
+                # Convert raw tool data to Tool objects
+                tool_objects = []
+                for tool_data in tools.tools:
+                    try:
+                        tool = self._convert_to_tool(tool_data)
+                        tool_objects.append(tool)
+                    except Exception as e:
+                        self.logger.log_error(f"Skipping tool due to conversion error: {str(e)}")
+                        continue
+                
+                self._tool_names = {tool.name for tool in tool_objects}
+                self.logger.log_info(f"Retrieved {len(tool_objects)} tools")
+                return tool_objects
         except Exception as e:
             self.logger.log_error(f"Failed to get tools: {str(e)}")
             raise
 
-    async def execute_tool(self, tool_name: str, tool_args: Dict[str, Any]) -> Any:
+    def timeout_for(self, tool_name: str, timeout: Optional[float] = None) -> Optional[float]:
+        """Effective deadline for a call: explicit, per-tool, then client default"""
+        if timeout is not None:
+            return timeout
+        return self.tool_timeouts.get(tool_name, self.call_timeout)
+
+    async def _handle_timeout(self):
+        if self.persistent and self.recycle_on_timeout and self._current_session is not None:
+            self.logger.log_warning("Recycling persistent session after timeout")
+            await self.close()
+
+    def _retries_on_crash(self, tool_name: str) -> bool:
+        """Whether a call cut off by a server crash may be sent again"""
+        if self.retry_on_crash is None:
+            return tool_name not in MUTATING_TOOLS
+        return self.retry_on_crash
+
+    async def _call_tool(self, tool_name: str, tool_args: Dict[str, Any]) -> Any:
+        async with self._slot():
+            if not self.persistent:
+                async with self._session() as session:
+                    return await session.call_tool(tool_name, tool_args)
+
+            session = await self._ensure_session()
+            holder = self._current_session
+            holder.active += 1
+            holder.calls += 1
+            try:
+                return await session.call_tool(tool_name, tool_args)
+            except Exception as e:
+                if not self._is_connection_error(e, holder):
+                    raise
+                self.logger.log_warning(f"Server connection lost during {tool_name}: {str(e)}")
+                session = await self._recover(holder)
+                if not self._retries_on_crash(tool_name):
+                    raise
+                return await session.call_tool(tool_name, tool_args)
+            finally:
+                holder.active -= 1
+                if holder.retired and holder.active == 0:
+                    self._spawn_background(holder.stop())
+
+    async def execute_tool(self,
+                           tool_name: str,
+                           tool_args: Dict[str, Any],
+                           timeout: Optional[float] = None) -> Any:
+        """Execute a tool on the server
+
+        Args:
+            tool_name: Name of the tool to call
+            tool_args: Arguments for the tool
+            timeout: Deadline in seconds, overriding the configured timeouts
+
+        Raises:
+            asyncio.TimeoutError: If the deadline passes. The pending request
+                is cancelled, which the MCP session reports to the server.
+        """
         self.logger.log_debug(f"Executing tool {tool_name} with args: {tool_args}")
+        timeout = self.timeout_for(tool_name, timeout)
         try:
-            async with stdio_client(self.server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    self.logger.log_debug("Initializing session")
-                    await session.initialize()
-                    result = await session.call_tool(tool_name, tool_args)
-                    self.logger.log_info(f"Successfully executed tool {tool_name}")
-                    return result
+            result = await asyncio.wait_for(self._call_tool(tool_name, tool_args), timeout)
+            self.logger.log_info(f"Successfully executed tool {tool_name}")
+            return result
+        except asyncio.TimeoutError:
+            self.logger.log_error(f"Tool {tool_name} timed out after {timeout}s")
+            await self._handle_timeout()
+            raise
         except Exception as e:
             self.logger.log_error(f"Failed to execute tool {tool_name}: {str(e)}")
             raise
 
+    async def execute_many(self,
+                           calls: List[Tuple[str, Dict[str, Any]]],
+                           dispatch: Optional[Dispatch] = None) -> List[ToolResult]:
+        """Execute a batch of tool calls concurrently over a single session
+
+        Args:
+            calls: List of (tool_name, tool_args) pairs
+            dispatch: Optional ``dispatch(tool_name, send)`` coroutine run for
+                each call. It decides when the call goes out by awaiting
+                ``send()``, which returns the call's ToolResult, or returns a
+                ToolResult of its own without sending the call.
+
+        Returns:
+            One ToolResult per call, in the same order as ``calls``
+        """
+        self.logger.log_debug(f"Executing batch of {len(calls)} tool calls")
+        server_timeouts = 0
+
+        async def call(session: ClientSession, tool_name: str, tool_args: Dict[str, Any]) -> Any:
+            if self.persistent:
+                # Goes through crash recovery on the shared session
+                return await self._call_tool(tool_name, tool_args)
+            async with self._slot():
+                return await session.call_tool(tool_name, tool_args)
+
+        async def send(session: ClientSession, tool_name: str, tool_args: Dict[str, Any]) -> ToolResult:
+            nonlocal server_timeouts
+            timeout = self.timeout_for(tool_name)
+            try:
+                result = await asyncio.wait_for(call(session, tool_name, tool_args), timeout)
+                return ToolResult(success=True, data=result, client_name=self.client_name)
+            except asyncio.TimeoutError:
+                server_timeouts += 1
+                self.logger.log_error(f"Tool {tool_name} timed out after {timeout}s")
+                return ToolResult(
+                    success=False,
+                    data=None,
+                    error=f"Tool '{tool_name}' timed out after {timeout}s",
+                    client_name=self.client_name,
+                    timed_out=True
+                )
+            except Exception as e:
+                self.logger.log_error(f"Failed to execute tool {tool_name}: {str(e)}")
+                return ToolResult(success=False, data=None, error=str(e), client_name=self.client_name)
+
+        async def run(session: ClientSession, tool_name: str, tool_args: Dict[str, Any]) -> ToolResult:
+            if dispatch is None:
+                return await send(session, tool_name, tool_args)
+            return await dispatch(tool_name, lambda: send(session, tool_name, tool_args))
+
+        try:
+            async with self._session() as session:
+                results = await asyncio.gather(*(run(session, name, args) for name, args in calls))
+        except Exception as e:
+            self.logger.log_error(f"Failed to execute batch: {str(e)}")
+            return [
+                ToolResult(success=False, data=None, error=str(e), client_name=self.client_name)
+                for _ in calls
+            ]
+        if server_timeouts:
+            await self._handle_timeout()
+        self.logger.log_info(f"Executed batch of {len(calls)} tool calls")
+        return list(results)
+
     async def close(self):
-        """Clean up any resources"""
+        """Close the persistent session and terminate its server process"""
         self.logger.log_debug("Closing client")
-        # Nothing to clean up for now, but this method exists for future use
-        # and interface consistency
\ No newline at end of file
+        holder, self._current_session = self._current_session, None
+        current = asyncio.current_task()
+        for task in [self._watchdog, self._standby_task, self._reaper]:
+            if task is not None and task is not current and not task.done():
+                task.cancel()
+        self._watchdog = self._standby_task = self._reaper = None
+        standby, self._standby = self._standby, None
+        if standby is not None:
+            await standby.stop()
+        if holder is not None:
+            await holder.stop()
+            self.logger.log_info("Persistent session closed")
@@ -0,0 +1,159 @@
+from typing import Deque, Optional
+from collections import deque
+import asyncio
+import math
+import time
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies and outcomes"""
+
+    def __init__(self, window: int = 200):
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+
+    def record(self, latency: float, success: bool = True):
+        self._latencies.append(latency)
+        self._outcomes.append(success)
+
+    @property
+    def count(self) -> int:
+        return len(self._latencies)
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Latency at the given percentile (0-100) of the window, or None if empty"""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, max(0, math.ceil(percentile / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+
+class CircuitBreaker:
+    """Stops calls to a server after repeated failures
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected without reaching the server. Once ``reset_timeout``
+    has passed, a single probe call is let through (half-open); its outcome
+    closes the circuit again or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def abandon_probe(self):
+        """Give up a half-open probe that never reached the server"""
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        self.state = self.CLOSED
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD controller for the number of concurrent calls to a server
+
+    The limit grows by roughly one slot per round of successful calls that
+    finish within ``target_latency`` (additive increase) and is multiplied by
+    ``backoff`` when a call fails or is slower than the target
+    (multiplicative decrease). Callers over the limit wait for a free slot.
+    """
+
+    def __init__(self,
+                 initial_limit: int = 4,
+                 min_limit: int = 1,
+                 max_limit: int = 64,
+                 target_latency: float = 1.0,
+                 backoff: float = 0.5):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self):
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self, latency: Optional[float] = None, success: bool = True):
+        """Free a slot, adjusting the limit unless no latency was observed"""
+        if latency is not None:
+            if success and latency <= self.target_latency:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            else:
+                self._limit = max(self.min_limit, self._limit * self.backoff)
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+
+class ServerHealth:
+    """Health state of one MCP server: circuit breaker, latency and concurrency limit"""
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0,
+                 initial_limit: int = 4,
+                 min_limit: int = 1,
+                 max_limit: int = 64,
+                 target_latency: float = 1.0,
+                 window: int = 200):
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.limiter = AdaptiveConcurrencyLimiter(initial_limit, min_limit, max_limit, target_latency)
+        self.latency = LatencyTracker(window)
+
+    async def record(self, latency: float, success: bool):
+        """Record the outcome of a call that held a limiter slot"""
+        self.latency.record(latency, success)
+        if success:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        await self.limiter.release(latency, success)
@@ -1,27 +1,155 @@
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Any, Iterable, Optional, List, Tuple, Union
 import asyncio
 from pathlib import Path
 
 from src.core.logger import MCPLogger
 from src.core.client import MCPClient
-from src.core.tools import Tool, MCPTools
+from src.core.pool import MCPClientPool
+from src.core.catalog import ToolCatalogCache
+from src.core.cache import ToolResultCache, make_call_key
+from src.core.singleflight import SingleFlight
+from src.core.health import ServerHealth
+from src.core.scheduler import FairScheduler
+from src.core.ratelimit import TokenBucket
+from src.core.plan import PlanExecutor, PlanStep
+from src.core.tools import Tool, MCPTools, ToolCall, ToolResult, MUTATING_TOOLS, READ_ONLY_TOOLS
 from mcp import StdioServerParameters
 
-@dataclass
-class ToolResult:
-    """Represents the result of a tool execution"""
-    success: bool
-    data: Any
-    error: Optional[str] = None
-    client_name: Optional[str] = None
-
 class ToolOrchestrator:
     """Orchestrates MCP servers, clients and tool execution"""
     def __init__(self, 
                  server_params: List[StdioServerParameters],
                  debug: bool = False,
-                 log_dir: Optional[Path] = None):
+                 log_dir: Optional[Path] = None,
+                 persistent: bool = False,
+                 replicas: Union[int, Dict[str, int]] = 1,
+                 max_in_flight: Optional[int] = None,
+                 startup_timeout: Optional[float] = None,
+                 catalog_cache: Optional[ToolCatalogCache] = None,
+                 tool_catalogs: Optional[Dict[str, List[Tool]]] = None,
+                 lazy: bool = False,
+                 result_cache: Optional[ToolResultCache] = None,
+                 coalesce: bool = False,
+                 call_timeout: Optional[float] = None,
+                 tool_timeouts: Optional[Dict[str, float]] = None,
+                 recycle_on_timeout: bool = False,
+                 health: Union[bool, Dict[str, Any]] = False,
+                 health_check_interval: Optional[float] = None,
+                 warm_standby: bool = False,
+                 retry_on_crash: Optional[bool] = None,
+                 max_replicas: Union[int, Dict[str, int], None] = None,
+                 idle_timeout: Optional[float] = None,
+                 max_calls: Optional[int] = None,
+                 max_lifetime: Optional[float] = None,
+                 autoscale: Union[bool, Dict[str, Any]] = False,
+                 hedge_percentile: Optional[float] = None,
+                 hedge_tools: Optional[Iterable[str]] = None,
+                 scheduler: Union[bool, Dict[str, Any]] = False,
+                 rate_limits: Optional[Dict[str, Union[float, Dict[str, Any]]]] = None,
+                 tool_rate_limits: Optional[Dict[str, Union[float, Dict[str, Any]]]] = None):
+        """
+        Args:
+            server_params: Parameters for each MCP server to orchestrate
+            debug: Enable debug logging
+            log_dir: Directory for orchestrator and client logs
+            persistent: Keep each server's session open across calls
+            replicas: Number of server processes per server, either for all
+                servers or keyed by client name. Servers with more than one
+                replica are served by an MCPClientPool.
+            max_in_flight: Per-session limit on concurrent tool calls
+            startup_timeout: Seconds each server may take to start and list
+                its tools during ``initialize``. ``None`` waits indefinitely.
+            catalog_cache: On-disk tool catalog. Servers with a cached snapshot
+                are registered from it without being contacted, and the
+                snapshot is revalidated against the server in the background.
+            tool_catalogs: Known tools per client name. Configured catalogs
+                are trusted as-is and take precedence over ``catalog_cache``.
+            lazy: Do not start servers whose catalog is already known until
+                the first call is routed to them. Servers without a known
+                catalog are still contacted during ``initialize``.
+            result_cache: Cache for results of idempotent tools. Calls to
+                mutating tools invalidate the entries of their client.
+            coalesce: Share one server request between concurrent identical
+                calls to non-mutating tools
+            call_timeout: Default deadline in seconds for a tool call
+            tool_timeouts: Per-tool deadlines overriding ``call_timeout``
+            recycle_on_timeout: Restart a persistent session whose call timed out
+            health: Track each server's health with a ServerHealth: a circuit
+                breaker that rejects calls after repeated failures and an
+                AIMD concurrency limit driven by observed latency. Pass True
+                for defaults or a dict of ServerHealth keyword arguments.
+            health_check_interval: Seconds between pings of persistent
+                sessions. Servers that stop answering are respawned.
+            warm_standby: Keep a spare initialized process for each
+                single-replica persistent server to take over on a crash
+            retry_on_crash: Retry a call once on the respawned server when the
+                server process dies while the call is in flight. ``None``
+                retries only tools outside ``MUTATING_TOOLS``; ``True`` retries
+                every tool and ``False`` none.
+            max_replicas: Upper bound on replicas per server, for all servers
+                or keyed by client name. Pools grow towards it while every
+                replica is busy; ``replicas`` is then the minimum.
+            idle_timeout: Seconds after which idle server processes are shut
+                down: extra pool replicas, or the single persistent session
+                of a server without a pool
+            max_calls: Replace a persistent server process after this many calls
+            max_lifetime: Replace a persistent server process after this many seconds
+            autoscale: Resize pools between ``replicas`` and ``max_replicas``
+                from queue depth and p95 latency. Pass True for defaults or a
+                dict of Autoscaler keyword arguments.
+            hedge_percentile: For servers with replicas, resend a call to
+                ``hedge_tools`` to a second replica when the first has not
+                answered within this percentile of the tool's observed
+                latency, and use whichever answers first
+            hedge_tools: Read-only tools that may be hedged. Defaults to the
+                known read-only reference server tools.
+            scheduler: Queue calls to each server through a FairScheduler
+                with priority classes and weighted fair sharing between
+                tenants. Pass True for defaults or a dict of FairScheduler
+                keyword arguments.
+            rate_limits: Token-bucket limits per client name, given as calls
+                per second or a dict of TokenBucket keyword arguments. Calls
+                over the limit wait for capacity instead of failing.
+            tool_rate_limits: Token-bucket limits per tool name, applied on
+                top of the limit of the tool's server
+        """
+        self.persistent = persistent
+        self.replicas = replicas
+        self.max_in_flight = max_in_flight
+        self.startup_timeout = startup_timeout
+        self.catalog_cache = catalog_cache
+        self.tool_catalogs = tool_catalogs or {}
+        self.lazy = lazy
+        self.result_cache = result_cache
+        self.coalesce = coalesce
+        self.call_timeout = call_timeout
+        self.tool_timeouts: Dict[str, float] = dict(tool_timeouts or {})
+        self.recycle_on_timeout = recycle_on_timeout
+        self.health_options: Optional[Dict[str, Any]] = (
+            dict(health) if isinstance(health, dict) else ({} if health else None)
+        )
+        self.health: Dict[str, ServerHealth] = {}
+        self.health_check_interval = health_check_interval
+        self.warm_standby = warm_standby
+        self.retry_on_crash = retry_on_crash
+        self.max_replicas = max_replicas
+        self.idle_timeout = idle_timeout
+        self.max_calls = max_calls
+        self.max_lifetime = max_lifetime
+        self.autoscale = autoscale
+        self.hedge_percentile = hedge_percentile
+        self.hedge_tools = frozenset(READ_ONLY_TOOLS if hedge_tools is None else hedge_tools)
+        self.scheduler_options: Optional[Dict[str, Any]] = (
+            dict(scheduler) if isinstance(scheduler, dict) else ({} if scheduler else None)
+        )
+        self.schedulers: Dict[str, FairScheduler] = {}
+        self.rate_limits: Dict[str, TokenBucket] = {
+            name: TokenBucket.from_config(config) for name, config in (rate_limits or {}).items()
+        }
+        self.tool_rate_limits: Dict[str, TokenBucket] = {
+            name: TokenBucket.from_config(config) for name, config in (tool_rate_limits or {}).items()
+        }
+        self._single_flight = SingleFlight()
         self.log_dir = Path(log_dir) if log_dir else Path("logs")
         self.log_dir.mkdir(exist_ok=True)
         
@@ -30,9 +158,12 @@ class ToolOrchestrator:
             debug_mode=debug,
             log_file=self.log_dir / "orchestrator.log"
         )
-        self.clients: Dict[str, MCPClient] = {}
+        self.clients: Dict[str, Union[MCPClient, MCPClientPool]] = {}
         self.tools = MCPTools()
         self.tool_to_client: Dict[str, str] = {}
+        self.failed_clients: Dict[str, str] = {}
+        self._background_tasks: set = set()
+        self._deferred_starts: Dict[str, Optional[List[Tool]]] = {}
         self._initialize_clients(server_params, debug)
 
     def _get_client_name(self, params: StdioServerParameters) -> str:
@@ -45,67 +176,205 @@ class ToolOrchestrator:
         """Initialize MCP clients for each server"""
         for params in server_params:
             client_name = self._get_client_name(params)
-            client = MCPClient(
-                params,
-                debug=debug,
-                log_file=self.log_dir / f"{client_name}.log",
-                client_name=client_name
-            )
+            if isinstance(self.replicas, dict):
+                replica_count = self.replicas.get(client_name, 1)
+            else:
+                replica_count = self.replicas
+            if isinstance(self.max_replicas, dict):
+                max_replicas = self.max_replicas.get(client_name, replica_count)
+            else:
+                max_replicas = self.max_replicas or replica_count
+            if max_replicas > 1:
+                client = MCPClientPool(
+                    params,
+                    size=replica_count,
+                    debug=debug,
+                    log_file=self.log_dir / f"{client_name}.log",
+                    client_name=client_name,
+                    max_in_flight=self.max_in_flight,
+                    call_timeout=self.call_timeout,
+                    tool_timeouts=self.tool_timeouts,
+                    recycle_on_timeout=self.recycle_on_timeout,
+                    health_check_interval=self.health_check_interval,
+                    retry_on_crash=self.retry_on_crash,
+                    max_size=max(max_replicas, replica_count),
+                    idle_timeout=self.idle_timeout,
+                    max_calls=self.max_calls,
+                    max_lifetime=self.max_lifetime,
+                    autoscale=self.autoscale
+                )
+            else:
+                client = MCPClient(
+                    params,
+                    debug=debug,
+                    log_file=self.log_dir / f"{client_name}.log",
+                    client_name=client_name,
+                    persistent=self.persistent,
+                    max_in_flight=self.max_in_flight,
+                    call_timeout=self.call_timeout,
+                    tool_timeouts=self.tool_timeouts,
+                    recycle_on_timeout=self.recycle_on_timeout,
+                    health_check_interval=self.health_check_interval,
+                    warm_standby=self.warm_standby,
+                    retry_on_crash=self.retry_on_crash,
+                    max_calls=self.max_calls,
+                    max_lifetime=self.max_lifetime,
+                    idle_timeout=self.idle_timeout
+                )
             self.clients[client_name] = client
+            if self.health_options is not None:
+                self.health[client_name] = ServerHealth(**self.health_options)
+            if self.scheduler_options is not None:
+                self.schedulers[client_name] = FairScheduler(**self.scheduler_options)
+
+    async def _fetch_tools(self, client_name: str, client: Union[MCPClient, MCPClientPool]) -> Optional[List[Any]]:
+        """Retrieve one client's tools within the startup timeout, or None on failure"""
+        try:
+            tools = await asyncio.wait_for(client.get_tools(), timeout=self.startup_timeout)
+            self.failed_clients.pop(client_name, None)
+            if self.catalog_cache:
+                self.catalog_cache.store(client.server_params, tools, client.server_version)
+            return tools
+        except asyncio.TimeoutError:
+            self.failed_clients[client_name] = f"Startup timed out after {self.startup_timeout}s"
+            self.logger.log_error(
+                f"Timed out initializing tools from client {client_name} after {self.startup_timeout}s"
+            )
+        except Exception as e:
+            self.failed_clients[client_name] = str(e)
+            self.logger.log_error(f"Error initializing tools from client {client_name}: {str(e)}")
+            self.logger.log_error(f"Exception details: {str(e.__class__.__name__)}")
+            import traceback
+            self.logger.log_error(f"Traceback: {traceback.format_exc()}")
+        return None
+
+    def _register_tools(self, client_name: str, tools: List[Any]):
+        """Map tools to their client and add them to the collection"""
+        self.logger.log_debug(f"Retrieved tools from {client_name}:")
+        for tool in tools:
+            self.logger.log_debug(f"Tool structure: {tool}")
+            
+            # Map tool to client
+            if isinstance(tool, Tool):
+                tool_name = tool.name
+                self.tool_to_client[tool_name] = client_name
+                self.logger.log_debug(f"  - {tool_name}")
+            else:
+                # Handle tuple structure
+                try:
+                    (internal_name, external_name), _, _ = tool
+                    tool_name = external_name
+                    self.tool_to_client[tool_name] = client_name
+                    self.logger.log_debug(f"  - {tool_name}")
+                except Exception as e:
+                    self.logger.log_error(f"Error parsing tool tuple: {str(e)}")
+                    continue
+        
+        # Add tools to collection
+        self.tools.add(tools)
+        self.logger.log_info(f"Initialized {len(tools)} tools from client: {client_name}")
+
+    def _unregister_tools(self, client_name: str):
+        """Remove every tool routed to a client"""
+        for tool_name in [name for name, owner in self.tool_to_client.items() if owner == client_name]:
+            del self.tool_to_client[tool_name]
+            self.tools.remove_tool(tool_name)
+
+    async def _revalidate(self, client_name: str, cached_tools: List[Tool]):
+        """Refresh a cached catalog from the server and re-register it if it changed"""
+        tools = await self._fetch_tools(client_name, self.clients[client_name])
+        if tools is None:
+            return
+        if [t.to_dict() for t in tools if isinstance(t, Tool)] != [t.to_dict() for t in cached_tools]:
+            self.logger.log_info(f"Tool catalog changed for client {client_name}, re-registering")
+            self._unregister_tools(client_name)
+            self._register_tools(client_name, tools)
+        else:
+            self.logger.log_debug(f"Cached tool catalog for client {client_name} is current")
+
+    def _spawn_background(self, coro):
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def _start_client(self, client_name: str, cached_tools: Optional[List[Tool]]):
+        """Bring up a client whose tools were registered from a known catalog
+
+        Cached catalogs are revalidated against the server, which also opens
+        persistent sessions; configured catalogs only need the session warmed.
+        """
+        client = self.clients[client_name]
+        if cached_tools is not None:
+            self._spawn_background(self._revalidate(client_name, cached_tools))
+        elif isinstance(client, MCPClientPool) or client.persistent:
+            self._spawn_background(client.connect())
+
+    def _activate(self, client_name: str):
+        """Start a lazily deferred client on first use"""
+        if client_name in self._deferred_starts:
+            self.logger.log_info(f"Starting deferred client {client_name} on first use")
+            self._start_client(client_name, self._deferred_starts.pop(client_name))
 
     async def initialize(self):
-        """Initialize tools from all clients"""
+        """Initialize tools from all clients concurrently
+
+        Every server is started at the same time, so startup is bounded by the
+        slowest server rather than the sum of all of them. A server that fails
+        or exceeds ``startup_timeout`` is recorded in ``failed_clients`` and
+        does not affect the others. Servers with a configured catalog or a
+        snapshot in ``catalog_cache`` are registered immediately; in lazy mode
+        they are not started until a call is routed to them.
+        """
+        known: Dict[str, Tuple[List[Tool], bool]] = {}
         for client_name, client in self.clients.items():
-            try:
-                # Get tools from each client
-                tools = await client.get_tools()
-                self.logger.log_debug(f"Retrieved tools from {client_name}:")
-                for tool in tools:
-                    self.logger.log_debug(f"Tool structure: {tool}")
-                    
-                    # Map tool to client
-                    if isinstance(tool, Tool):
-                        tool_name = tool.name
-                        self.tool_to_client[tool_name] = client_name
-                        self.logger.log_debug(f"  - {tool_name}")
-                    else:
-                        # Handle tuple structure
-                        try:
-                            (internal_name, external_name), _, _ = tool
-                            tool_name = external_name
-                            self.tool_to_client[tool_name] = client_name
-                            self.logger.log_debug(f"  - {tool_name}")
-                        except Exception as e:
-                            self.logger.log_error(f"Error parsing tool tuple: {str(e)}")
-                            continue
-                
-                # Add tools to collection
-                self.tools.add(tools)
-                self.logger.log_info(f"Initialized {len(tools)} tools from client: {client_name}")
-            except Exception as e:
-                self.logger.log_error(f"Error initializing tools from client {client_name}: {str(e)}")
-                self.logger.log_error(f"Exception details: {str(e.__class__.__name__)}")
-                import traceback
-                self.logger.log_error(f"Traceback: {traceback.format_exc()}")
-
-    async def execute(self, tool_name: str, args: Dict[str, Any]) -> ToolResult:
-        """Execute a tool using the appropriate client"""
+            if client_name in self.tool_catalogs:
+                known[client_name] = (self.tool_catalogs[client_name], False)
+            elif self.catalog_cache:
+                tools = self.catalog_cache.load(client.server_params)
+                if tools is not None:
+                    known[client_name] = (tools, True)
+                    self.logger.log_debug(f"Loaded cached tool catalog for client {client_name}")
+
+        client_names = [name for name in self.clients if name not in known]
+        results = await asyncio.gather(
+            *(self._fetch_tools(name, self.clients[name]) for name in client_names)
+        )
+        fetched = dict(zip(client_names, results))
+
+        # Register in configuration order so tool routing stays deterministic
+        for client_name in self.clients:
+            if client_name in known:
+                tools, from_cache = known[client_name]
+                self._register_tools(client_name, tools)
+                cached_tools = tools if from_cache else None
+                if self.lazy:
+                    self._deferred_starts[client_name] = cached_tools
+                    self.logger.log_debug(f"Deferring start of client {client_name} until first use")
+                else:
+                    self._start_client(client_name, cached_tools)
+            elif fetched.get(client_name) is not None:
+                self._register_tools(client_name, fetched[client_name])
+
+    def _prepare_call(self, tool_name: str, args: Dict[str, Any]) -> Tuple[Optional[str], Optional[ToolResult]]:
+        """Resolve the client for a tool call and validate its arguments
+
+        Returns the client name, or a failed ToolResult if the call cannot be made.
+        """
         # Find the client for this tool
         client_name = self.tool_to_client.get(tool_name)
         if not client_name:
-            return ToolResult(
+            return None, ToolResult(
                 success=False,
                 data=None,
                 error=f"No client found for tool '{tool_name}'",
                 client_name=None
             )
 
-        client = self.clients[client_name]
-        
         # Get tool schema for validation
         tool = self.tools.get_tool(tool_name)
         if not tool:
-            return ToolResult(
+            return None, ToolResult(
                 success=False,
                 data=None,
                 error=f"Tool '{tool_name}' not found",
@@ -115,22 +384,347 @@ class ToolOrchestrator:
         # Validate arguments
         missing_args = [arg for arg in tool.required if arg not in args]
         if missing_args:
-            return ToolResult(
+            return None, ToolResult(
                 success=False,
                 data=None,
                 error=f"Missing required arguments: {', '.join(missing_args)}",
                 client_name=client_name
             )
 
+        return client_name, None
+
+    def _affinity_scope(self, client_name: str, affinity_key: Optional[str]) -> Optional[str]:
+        """Affinity key that decides the replica of a call, if the client is a pool"""
+        if affinity_key is None or not isinstance(self.clients[client_name], MCPClientPool):
+            return None
+        return affinity_key
+
+    def _cached_result(self,
+                       client_name: str,
+                       tool_name: str,
+                       args: Dict[str, Any],
+                       scope: Optional[str] = None) -> Optional[ToolResult]:
+        """Look up a call in the result cache, invalidating it ahead of mutations"""
+        if self.result_cache is None:
+            return None
+        if self.result_cache.is_mutating(tool_name):
+            self.result_cache.invalidate(client_name)
+            return None
+        return self.result_cache.get(tool_name, args, scope)
+
+    def _cache_generation(self, client_name: str) -> Optional[int]:
+        """Cache generation of a client, captured when a call is dispatched"""
+        if self.result_cache is None:
+            return None
+        return self.result_cache.generation(client_name)
+
+    def _record_result(self,
+                       tool_name: str,
+                       args: Dict[str, Any],
+                       result: ToolResult,
+                       scope: Optional[str] = None,
+                       generation: Optional[int] = None):
+        """Update the result cache once a call has completed"""
+        if self.result_cache is None:
+            return
+        if self.result_cache.is_mutating(tool_name):
+            # Drop anything read while the mutation was in flight
+            self.result_cache.invalidate(result.client_name)
+        else:
+            # Reads that overlapped a mutation are not stored
+            self.result_cache.put(tool_name, args, result, scope, generation)
+
+    def _is_mutating(self, tool_name: str) -> bool:
+        if self.result_cache is not None:
+            return self.result_cache.is_mutating(tool_name)
+        return tool_name in MUTATING_TOOLS
+
+    def _should_hedge(self,
+                      client: Union[MCPClient, MCPClientPool],
+                      tool_name: str,
+                      affinity_key: Optional[str] = None) -> bool:
+        return (
+            self.hedge_percentile is not None
+            and affinity_key is None
+            and isinstance(client, MCPClientPool)
+            and tool_name in self.hedge_tools
+        )
+
+    def _deadline_for(self, tool_name: str, timeout: Optional[float]) -> Optional[float]:
+        """Absolute loop time by which a call must finish, or None"""
+        if timeout is None:
+            timeout = self.tool_timeouts.get(tool_name, self.call_timeout)
+        if timeout is None:
+            return None
+        return asyncio.get_running_loop().time() + timeout
+
+    @staticmethod
+    def _remaining(deadline: Optional[float]) -> Optional[float]:
+        if deadline is None:
+            return None
+        return max(0.0, deadline - asyncio.get_running_loop().time())
+
+    async def execute(self,
+                      tool_name: str,
+                      args: Dict[str, Any],
+                      timeout: Optional[float] = None,
+                      affinity_key: Optional[str] = None,
+                      tenant: Optional[str] = None,
+                      priority: int = FairScheduler.NORMAL) -> ToolResult:
+        """Execute a tool using the appropriate client
+
+        Args:
+            tool_name: Name of the tool to call
+            args: Arguments for the tool
+            timeout: Deadline in seconds, overriding ``tool_timeouts`` and
+                ``call_timeout``. A call that misses its deadline is cancelled
+                and returns a ToolResult with ``timed_out`` set.
+            affinity_key: Conversation or tenant id. On servers with replicas,
+                calls with the same key always reach the same replica.
+            tenant: Caller whose fair share this call counts against when a
+                scheduler is configured
+            priority: Scheduling class, such as ``FairScheduler.INTERACTIVE``
+                for agent turns or ``FairScheduler.BATCH`` for bulk jobs
+        """
+        client_name, failure = self._prepare_call(tool_name, args)
+        if failure:
+            return failure
+        deadline = self._deadline_for(tool_name, timeout)
+        scope = self._affinity_scope(client_name, affinity_key)
+
+        self._activate(client_name)
+        cached = self._cached_result(client_name, tool_name, args, scope)
+        if cached:
+            self.logger.log_debug(f"Serving tool '{tool_name}' from result cache")
+            return cached
+
+        if self.coalesce and not self._is_mutating(tool_name):
+            return await self._execute_coalesced(client_name, tool_name, args, deadline, scope, tenant, priority)
+        return await self._execute_and_record(client_name, tool_name, args, deadline, scope, tenant, priority)
+
+    async def _execute_coalesced(self,
+                                 client_name: str,
+                                 tool_name: str,
+                                 args: Dict[str, Any],
+                                 deadline: Optional[float] = None,
+                                 affinity_key: Optional[str] = None,
+                                 tenant: Optional[str] = None,
+                                 priority: int = FairScheduler.NORMAL) -> ToolResult:
+        """Join or start the single flight for a call, under the caller's own deadline
+
+        A flight runs under the deadline of the caller that started it. A
+        caller with a later deadline whose flight timed out early starts a
+        new one instead of inheriting the timeout.
+        """
+        key = make_call_key(tool_name, args, affinity_key)
+
+        async def flight() -> Tuple[Optional[float], ToolResult]:
+            result = await self._execute_and_record(
+                client_name, tool_name, args, deadline, affinity_key, tenant, priority
+            )
+            return deadline, result
+
+        while True:
+            try:
+                flight_deadline, result = await asyncio.wait_for(
+                    self._single_flight.do(key, flight), self._remaining(deadline)
+                )
+            except asyncio.TimeoutError:
+                return self._timeout_result(tool_name, client_name)
+            cut_short = (
+                result.timed_out
+                and flight_deadline is not None
+                and (deadline is None or flight_deadline < deadline)
+            )
+            if not cut_short:
+                return result
+            self.logger.log_debug(f"Shared call to '{tool_name}' timed out under an earlier deadline, retrying")
+
+    async def _execute_and_record(self,
+                                  client_name: str,
+                                  tool_name: str,
+                                  args: Dict[str, Any],
+                                  deadline: Optional[float] = None,
+                                  affinity_key: Optional[str] = None,
+                                  tenant: Optional[str] = None,
+                                  priority: int = FairScheduler.NORMAL) -> ToolResult:
+        generation = self._cache_generation(client_name)
+        scheduler = self.schedulers.get(client_name)
+        if scheduler is not None:
+            try:
+                await asyncio.wait_for(
+                    scheduler.acquire(tenant or "default", priority), self._remaining(deadline)
+                )
+            except asyncio.TimeoutError:
+                return self._timeout_result(tool_name, client_name)
+        try:
+            result = await self._execute_on_client(client_name, tool_name, args, deadline, affinity_key)
+        finally:
+            if scheduler is not None:
+                scheduler.release()
+        self._record_result(tool_name, args, result, affinity_key, generation)
+        return result
+
+    async def _take_tokens(self, client_name: str, tool_name: str):
+        """Wait for rate limit capacity on the call's server and tool
+
+        Called once a call has been admitted by the scheduler and health
+        limiter, right before it is sent, so queued calls cannot spend their
+        tokens early and then reach the server in a burst.
+        """
+        for bucket in (self.rate_limits.get(client_name), self.tool_rate_limits.get(tool_name)):
+            if bucket is not None:
+                await bucket.acquire()
+
+    async def _tokens_within(self, client_name: str, tool_name: str, deadline: Optional[float]) -> bool:
+        """Take rate limit tokens, returning False if the deadline passes first"""
+        try:
+            await asyncio.wait_for(self._take_tokens(client_name, tool_name), self._remaining(deadline))
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def _timeout_result(self, tool_name: str, client_name: str) -> ToolResult:
+        self.logger.log_error(f"Tool {tool_name} with client {client_name} timed out")
+        return ToolResult(
+            success=False,
+            data=None,
+            error=f"Tool '{tool_name}' timed out",
+            client_name=client_name,
+            timed_out=True
+        )
+
+    async def _execute_on_client(self,
+                                 client_name: str,
+                                 tool_name: str,
+                                 args: Dict[str, Any],
+                                 deadline: Optional[float] = None,
+                                 affinity_key: Optional[str] = None) -> ToolResult:
+        """Run a validated tool call on its client, subject to the client's health"""
+        return await self._send_admitted(
+            client_name, tool_name, deadline,
+            lambda: self._call_client(client_name, tool_name, args, deadline, affinity_key)
+        )
+
+    async def _send_admitted(self,
+                             client_name: str,
+                             tool_name: str,
+                             deadline: Optional[float],
+                             send: Callable[[], Awaitable[ToolResult]]) -> ToolResult:
+        """Send one call once the client's health and rate limits admit it
+
+        The call holds a limiter slot while it runs, and its own latency and
+        outcome are recorded.
+        """
+        health = self.health.get(client_name)
+        if health is None:
+            if not await self._tokens_within(client_name, tool_name, deadline):
+                return self._timeout_result(tool_name, client_name)
+            return await send()
+
+        if not health.breaker.allow_request():
+            self.logger.log_warning(f"Circuit open for client {client_name}, rejecting tool {tool_name}")
+            return self._circuit_open_result(client_name)
+        try:
+            await asyncio.wait_for(health.limiter.acquire(), self._remaining(deadline))
+        except asyncio.TimeoutError:
+            health.breaker.abandon_probe()
+            return self._timeout_result(tool_name, client_name)
+        except asyncio.CancelledError:
+            health.breaker.abandon_probe()
+            raise
+        try:
+            admitted = await self._tokens_within(client_name, tool_name, deadline)
+        except asyncio.CancelledError:
+            health.breaker.abandon_probe()
+            await health.limiter.release()
+            raise
+        if not admitted:
+            health.breaker.abandon_probe()
+            await health.limiter.release()
+            return self._timeout_result(tool_name, client_name)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            result = await send()
+        except asyncio.CancelledError:
+            health.breaker.abandon_probe()
+            await health.limiter.release()
+            raise
+        await health.record(loop.time() - started, result.success)
+        if health.breaker.state == health.breaker.OPEN and not result.success:
+            self.logger.log_warning(f"Circuit opened for client {client_name}")
+        return result
+
+    @staticmethod
+    def _circuit_open_result(client_name: str) -> ToolResult:
+        return ToolResult(
+            success=False,
+            data=None,
+            error=f"Circuit open for client '{client_name}'",
+            client_name=client_name
+        )
+
+    async def _execute_batch_on_client(self,
+                                       client_name: str,
+                                       batch_calls: List[Tuple[str, Dict[str, Any]]],
+                                       deadlines: Dict[str, Optional[float]],
+                                       affinity_key: Optional[str] = None) -> List[ToolResult]:
+        """Run a client's share of a batch, admitting each call on its own
+
+        Every call goes through the circuit breaker, holds its own limiter
+        slot and takes its rate limit tokens right before it is sent, so a
+        batch never puts more calls on the server than the limiter allows.
+        Each call must finish by the deadline of its tool in ``deadlines``.
+        """
+        async def dispatch(tool_name: str, send: Callable[[], Awaitable[ToolResult]]) -> ToolResult:
+            deadline = deadlines[tool_name]
+
+            async def send_by_deadline() -> ToolResult:
+                try:
+                    return await asyncio.wait_for(send(), self._remaining(deadline))
+                except asyncio.TimeoutError:
+                    return self._timeout_result(tool_name, client_name)
+
+            return await self._send_admitted(client_name, tool_name, deadline, send_by_deadline)
+
+        client = self.clients[client_name]
+        if affinity_key is not None:
+            return await client.execute_many(batch_calls, affinity_key=affinity_key, dispatch=dispatch)
+        return await client.execute_many(batch_calls, dispatch=dispatch)
+
+    async def _call_client(self,
+                           client_name: str,
+                           tool_name: str,
+                           args: Dict[str, Any],
+                           deadline: Optional[float] = None,
+                           affinity_key: Optional[str] = None) -> ToolResult:
+        """Send a tool call to its client and wrap the outcome in a ToolResult"""
+        client = self.clients[client_name]
+        call_kwargs: Dict[str, Any] = {}
+        remaining = self._remaining(deadline)
+        if remaining is not None:
+            call_kwargs["timeout"] = remaining
+        if affinity_key is not None:
+            call_kwargs["affinity_key"] = affinity_key
+
         try:
             # Execute tool
             self.logger.log_info(f"Executing tool '{tool_name}' using client '{client_name}'")
-            result = await client.execute_tool(tool_name, args)
+            if self._should_hedge(client, tool_name, affinity_key):
+                result = await client.execute_hedged(
+                    tool_name, args, percentile=self.hedge_percentile, **call_kwargs
+                )
+            else:
+                result = await client.execute_tool(tool_name, args, **call_kwargs)
             return ToolResult(
                 success=True,
                 data=result,
                 client_name=client_name
             )
+        except asyncio.TimeoutError:
+            return self._timeout_result(tool_name, client_name)
         except Exception as e:
             self.logger.log_error(f"Error executing tool {tool_name} with client {client_name}: {str(e)}")
             return ToolResult(
@@ -140,7 +734,101 @@ class ToolOrchestrator:
                 client_name=client_name
             )
 
+    async def execute_many(self,
+                           calls: List[Tuple[str, Dict[str, Any]]],
+                           affinity_key: Optional[str] = None,
+                           tenant: Optional[str] = None,
+                           priority: int = FairScheduler.NORMAL,
+                           timeout: Optional[float] = None) -> List[ToolResult]:
+        """Execute a batch of tool calls, returning results in call order
+
+        Calls are grouped per client so each server handles its share of the
+        batch over one session, and all groups are dispatched concurrently.
+        With an affinity key, each replicated server runs its share on the
+        key's replica. With a scheduler, each server's share is admitted as
+        one unit whose cost is its number of calls. Rate limits apply to each
+        call as it is sent, so a batch does not reach its server in a burst.
+
+        Args:
+            timeout: Deadline in seconds for each call, overriding
+                ``tool_timeouts`` and ``call_timeout``. Calls that miss it,
+                including while waiting for rate limit tokens, return a
+                ToolResult with ``timed_out`` set.
+        """
+        results: List[Optional[ToolResult]] = [None] * len(calls)
+        batches: Dict[str, List[int]] = {}
+        for index, (tool_name, args) in enumerate(calls):
+            client_name, failure = self._prepare_call(tool_name, args)
+            if failure:
+                results[index] = failure
+                continue
+            self._activate(client_name)
+            cached = self._cached_result(
+                client_name, tool_name, args, self._affinity_scope(client_name, affinity_key)
+            )
+            if cached:
+                results[index] = cached
+            else:
+                batches.setdefault(client_name, []).append(index)
+
+        async def run_batch(client_name: str, indices: List[int]):
+            self.logger.log_info(f"Executing batch of {len(indices)} tools using client '{client_name}'")
+            scope = self._affinity_scope(client_name, affinity_key)
+            batch_calls = [calls[index] for index in indices]
+            deadlines = {tool_name: self._deadline_for(tool_name, timeout) for tool_name, _ in batch_calls}
+            generation = self._cache_generation(client_name)
+            scheduler = self.schedulers.get(client_name)
+            if scheduler is not None:
+                await scheduler.acquire(tenant or "default", priority, cost=len(batch_calls))
+            try:
+                batch_results = await self._execute_batch_on_client(client_name, batch_calls, deadlines, scope)
+            finally:
+                if scheduler is not None:
+                    scheduler.release()
+            for index, result in zip(indices, batch_results):
+                result.client_name = client_name
+                results[index] = result
+                self._record_result(*calls[index], result, scope, generation)
+
+        await asyncio.gather(*(run_batch(name, indices) for name, indices in batches.items()))
+        return results
+
+    async def execute_tool_calls(self, calls: List[ToolCall], **kwargs) -> Dict[str, ToolResult]:
+        """Execute the tool calls of one LLM response concurrently
+
+        Each call goes through ``execute``, so caching, coalescing, deadlines
+        and scheduling apply per call. Keyword arguments such as ``timeout``
+        or ``tenant`` are passed to every call.
+
+        Returns:
+            Results keyed by call id
+        """
+        self.logger.log_debug(f"Dispatching {len(calls)} tool calls concurrently")
+        results = await asyncio.gather(*(self.execute(call.name, call.args, **kwargs) for call in calls))
+        return {call.id: result for call, result in zip(calls, results)}
+
+    async def execute_plan(self,
+                           steps: List[PlanStep],
+                           infer_conflicts: bool = True,
+                           **kwargs) -> Dict[str, ToolResult]:
+        """Execute a plan of tool calls, running independent steps concurrently
+
+        See PlanExecutor for how dependencies and conflicts are resolved.
+
+        Returns:
+            Results keyed by step id
+        """
+        executor = PlanExecutor(
+            self,
+            infer_conflicts=infer_conflicts,
+            mutating=self.result_cache.mutating if self.result_cache is not None else None
+        )
+        return await executor.run(steps, **kwargs)
+
     async def close(self):
-        """Close all clients"""
+        """Cancel background work and close all clients"""
+        for task in list(self._background_tasks):
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
         for client in self.clients.values():
             await client.close()
@@ -0,0 +1,200 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+from dataclasses import dataclass, field
+import asyncio
+import posixpath
+
+from src.core.logger import MCPLogger
+from src.core.tools import ToolResult, MUTATING_TOOLS
+
+if TYPE_CHECKING:
+    from src.core.orchestrator import ToolOrchestrator
+
+# Argument names holding file paths in the reference filesystem server
+_PATH_ARGS = ("path", "source", "destination")
+_PATH_LIST_ARGS = ("paths",)
+
+# Tools that read a server's whole store rather than named paths or entities
+WHOLE_STORE_TOOLS = frozenset({"read_graph", "search_nodes", "list_allowed_directories"})
+
+
+@dataclass
+class PlanStep:
+    """A tool call in a plan, with the ids of the steps it must wait for"""
+    id: str
+    name: str
+    args: Dict[str, Any]
+    depends_on: List[str] = field(default_factory=list)
+
+
+def _normalize_path(path: str) -> str:
+    return posixpath.normpath(str(path).replace("\\", "/"))
+
+
+def _paths_overlap(first: str, second: str) -> bool:
+    """Whether one path is the other or contains it"""
+    if first == second:
+        return True
+    shorter, longer = sorted((first, second), key=len)
+    return longer.startswith(shorter.rstrip("/") + "/")
+
+
+def step_resources(step: PlanStep) -> Tuple[Set[str], Set[str]]:
+    """Paths and memory entity names a step touches, inferred from its arguments"""
+    args = step.args or {}
+    paths = {_normalize_path(args[name]) for name in _PATH_ARGS if isinstance(args.get(name), str)}
+    for name in _PATH_LIST_ARGS:
+        paths.update(_normalize_path(path) for path in args.get(name) or [] if isinstance(path, str))
+
+    entities: Set[str] = set()
+    for name in args.get("entityNames") or args.get("names") or []:
+        entities.add(str(name))
+    for key, fields in (("entities", ("name",)),
+                        ("relations", ("from", "to")),
+                        ("observations", ("entityName",)),
+                        ("deletions", ("entityName",))):
+        for item in args.get(key) or []:
+            if isinstance(item, dict):
+                entities.update(str(item[f]) for f in fields if f in item)
+    return paths, entities
+
+
+class PlanExecutor:
+    """Runs a plan of tool calls as a dependency graph on a ToolOrchestrator
+
+    Steps wait for the steps they explicitly depend on. With
+    ``infer_conflicts``, a step also waits for every earlier step on the
+    same server it conflicts with, where at least one of them mutates and
+    they touch the same path (or one path contains the other), the same
+    memory entity, or the whole store: a step whose resources cannot be
+    inferred or a tool such as ``read_graph`` conflicts with every write.
+    Two writes to memory entities always conflict, because the memory
+    server rewrites its whole graph on each write. Everything else runs
+    concurrently.
+    """
+
+    def __init__(self,
+                 orchestrator: "ToolOrchestrator",
+                 infer_conflicts: bool = True,
+                 mutating: Optional[Sequence[str]] = None,
+                 stop_on_failure: bool = True,
+                 debug: bool = False):
+        """
+        Args:
+            orchestrator: Orchestrator that executes each step
+            infer_conflicts: Order conflicting steps as listed in the plan
+            mutating: Tools treated as writes when inferring conflicts.
+                Defaults to the mutating tools of the reference servers.
+            stop_on_failure: Skip steps whose dependencies failed
+        """
+        self.orchestrator = orchestrator
+        self.infer_conflicts = infer_conflicts
+        self.mutating = frozenset(MUTATING_TOOLS if mutating is None else mutating)
+        self.stop_on_failure = stop_on_failure
+        self.logger = MCPLogger("plan_executor", debug_mode=debug)
+
+    def _conflicts(self, first: PlanStep, second: PlanStep,
+                   resources: Dict[str, Tuple[Set[str], Set[str]]]) -> bool:
+        first_mutates = first.name in self.mutating
+        second_mutates = second.name in self.mutating
+        if not first_mutates and not second_mutates:
+            return False
+        tool_to_client = self.orchestrator.tool_to_client
+        first_client = tool_to_client.get(first.name)
+        second_client = tool_to_client.get(second.name)
+        if first_client is not None and second_client is not None and first_client != second_client:
+            return False
+        first_paths, first_entities = resources[first.id]
+        second_paths, second_entities = resources[second.id]
+        for step, paths, entities in ((first, first_paths, first_entities), (second, second_paths, second_entities)):
+            if step.name in WHOLE_STORE_TOOLS or not (paths or entities):
+                return True
+        if first_entities & second_entities:
+            return True
+        if first_mutates and second_mutates and first_entities and second_entities:
+            return True
+        return any(_paths_overlap(a, b) for a in first_paths for b in second_paths)
+
+    def dependencies(self, steps: List[PlanStep]) -> Dict[str, Set[str]]:
+        """Declared and inferred dependencies of every step
+
+        Raises:
+            ValueError: On duplicate ids, unknown dependencies or cycles
+        """
+        ids = [step.id for step in steps]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Plan step ids must be unique")
+        known = set(ids)
+        graph: Dict[str, Set[str]] = {}
+        for step in steps:
+            unknown = set(step.depends_on) - known
+            if unknown:
+                raise ValueError(f"Step '{step.id}' depends on unknown steps: {sorted(unknown)}")
+            graph[step.id] = set(step.depends_on)
+
+        if self.infer_conflicts:
+            resources = {step.id: step_resources(step) for step in steps}
+            for index, step in enumerate(steps):
+                for earlier in steps[:index]:
+                    if self._conflicts(earlier, step, resources):
+                        graph[step.id].add(earlier.id)
+                        if step.id in self._reachable(graph, earlier.id):
+                            # Declared order wins over plan order
+                            graph[step.id].discard(earlier.id)
+        self._check_acyclic(graph)
+        return graph
+
+    @staticmethod
+    def _reachable(graph: Dict[str, Set[str]], start: str) -> Set[str]:
+        """Steps that ``start`` transitively depends on"""
+        seen: Set[str] = set()
+        stack = list(graph[start])
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                stack.extend(graph[node])
+        return seen
+
+    def _check_acyclic(self, graph: Dict[str, Set[str]]):
+        for node in graph:
+            if node in self._reachable(graph, node):
+                raise ValueError(f"Plan has a dependency cycle through step '{node}'")
+
+    async def run(self, steps: List[PlanStep], **kwargs) -> Dict[str, ToolResult]:
+        """Execute a plan, returning results keyed by step id in plan order
+
+        Keyword arguments such as ``timeout`` or ``tenant`` are passed to
+        ``ToolOrchestrator.execute`` for every step.
+        """
+        graph = self.dependencies(steps)
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_step(step: PlanStep) -> ToolResult:
+            dependencies = sorted(graph[step.id])
+            results = await asyncio.gather(*(tasks[dependency] for dependency in dependencies))
+            failed = [dependency for dependency, result in zip(dependencies, results) if not result.success]
+            if failed and self.stop_on_failure:
+                self.logger.log_warning(f"Skipping step '{step.id}': dependency '{failed[0]}' failed")
+                return ToolResult(
+                    success=False,
+                    data=None,
+                    error=f"Skipped: dependency '{failed[0]}' failed"
+                )
+            return await self.orchestrator.execute(step.name, step.args, **kwargs)
+
+        # Create tasks in dependency order so every step can find its dependencies
+        pending = list(steps)
+        while pending:
+            ready = [step for step in pending if graph[step.id] <= tasks.keys()]
+            for step in ready:
+                tasks[step.id] = asyncio.ensure_future(run_step(step))
+            pending = [step for step in pending if step.id not in tasks]
+
+        self.logger.log_debug(f"Running plan of {len(steps)} steps")
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+        return {step.id: tasks[step.id].result() for step in steps}
@@ -0,0 +1,370 @@
+from mcp import StdioServerParameters
+from typing import Any, Dict, List, Optional, Tuple, Union
+from pathlib import Path
+import asyncio
+
+from src.core.autoscale import Autoscaler
+from src.core.client import Dispatch, MCPClient
+from src.core.hashring import ConsistentHashRing
+from src.core.health import LatencyTracker
+from src.core.logger import MCPLogger
+from src.core.tools import Tool, ToolResult
+
+
+class MCPClientPool:
+    """Pool of persistent MCPClient replicas for the same MCP server
+
+    Each replica owns its own server process and session. Tool calls are
+    routed to the replica with the fewest running or queued requests, so concurrent
+    traffic is spread across server processes instead of queueing behind a
+    single stdio stream.
+
+    The pool starts with ``size`` replicas and adds one, up to ``max_size``,
+    whenever every replica is busy. With ``idle_timeout`` set, replicas above
+    ``min_size`` that have been idle that long are shut down. With
+    ``autoscale``, an Autoscaler instead decides growth from the backlog of
+    waiting calls and the p95 call latency, and resizes the pool between
+    those bounds.
+
+    Calls given an affinity key always go to the replica that key hashes to
+    on a consistent hash ring, so stateful servers see every call for a
+    conversation or tenant. Only the first ``min_size`` replicas are on the
+    ring and they are never reaped or scaled away, so resizing the pool
+    never moves a key to another replica mid-conversation.
+    """
+
+    def __init__(self,
+                 server_params: StdioServerParameters,
+                 size: int = 2,
+                 debug: bool = False,
+                 log_file: Optional[Path] = None,
+                 client_name: Optional[str] = "MCPClientPool",
+                 max_in_flight: Optional[int] = None,
+                 call_timeout: Optional[float] = None,
+                 tool_timeouts: Optional[Dict[str, float]] = None,
+                 recycle_on_timeout: bool = False,
+                 health_check_interval: Optional[float] = None,
+                 retry_on_crash: Optional[bool] = None,
+                 min_size: Optional[int] = None,
+                 max_size: Optional[int] = None,
+                 idle_timeout: Optional[float] = None,
+                 max_calls: Optional[int] = None,
+                 max_lifetime: Optional[float] = None,
+                 autoscale: Union[bool, Dict[str, Any]] = False):
+        min_size = size if min_size is None else min_size
+        max_size = max(size, min_size) if max_size is None else max_size
+        if not 1 <= min_size <= size <= max_size:
+            raise ValueError(
+                f"Pool sizes must satisfy 1 <= min_size <= size <= max_size, "
+                f"got {min_size}, {size}, {max_size}"
+            )
+        self.server_params = server_params
+        self.client_name = client_name
+        self.debug = debug
+        self.log_file = log_file
+        self.max_in_flight = max_in_flight
+        self.call_timeout = call_timeout
+        self.tool_timeouts = dict(tool_timeouts or {})
+        self.recycle_on_timeout = recycle_on_timeout
+        self.health_check_interval = health_check_interval
+        self.retry_on_crash = retry_on_crash
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_calls = max_calls
+        self.max_lifetime = max_lifetime
+        self._reaper: Optional[asyncio.Task] = None
+        self.autoscaler: Optional[Autoscaler] = (
+            Autoscaler(**autoscale) if isinstance(autoscale, dict) else (Autoscaler() if autoscale else None)
+        )
+        self.latency = LatencyTracker()
+        self.tool_latency: Dict[str, LatencyTracker] = {}
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._autoscale_task: Optional[asyncio.Task] = None
+        self.logger = MCPLogger(client_name, debug_mode=debug, log_file=log_file)
+        self.replicas: List[MCPClient] = []
+        self._ring = ConsistentHashRing()
+        self._replica_count = 0
+        self._next = 0
+        for index in range(size):
+            self._add_replica(pinned=index < min_size)
+
+    @property
+    def size(self) -> int:
+        return len(self.replicas)
+
+    @property
+    def in_flight(self) -> int:
+        return sum(replica.in_flight for replica in self.replicas)
+
+    @property
+    def queued(self) -> int:
+        return sum(replica.queued for replica in self.replicas)
+
+    @property
+    def load(self) -> int:
+        return self.in_flight + self.queued
+
+    @property
+    def backlog(self) -> int:
+        """Calls waiting for a replica slot, or beyond one per replica when slots are unbounded"""
+        if self.max_in_flight is not None:
+            return self.queued
+        return max(0, self.load - self.size)
+
+    @property
+    def restarts(self) -> int:
+        return sum(replica.restarts for replica in self.replicas)
+
+    @property
+    def server_version(self) -> Optional[str]:
+        return next((r.server_version for r in self.replicas if r.server_version), None)
+
+    def _add_replica(self, pinned: bool = False) -> MCPClient:
+        """Start tracking a new replica; pinned replicas serve affinity keys"""
+        replica = MCPClient(
+            self.server_params,
+            debug=self.debug,
+            log_file=self.log_file,
+            client_name=f"{self.client_name}-{self._replica_count}",
+            persistent=True,
+            max_in_flight=self.max_in_flight,
+            call_timeout=self.call_timeout,
+            tool_timeouts=self.tool_timeouts,
+            recycle_on_timeout=self.recycle_on_timeout,
+            health_check_interval=self.health_check_interval,
+            retry_on_crash=self.retry_on_crash,
+            max_calls=self.max_calls,
+            max_lifetime=self.max_lifetime
+        )
+        self._replica_count += 1
+        self.replicas.append(replica)
+        if pinned:
+            self._ring.add(replica.client_name)
+        return replica
+
+    def _remove_replica(self, replica: MCPClient):
+        self.replicas.remove(replica)
+        if replica.client_name in self._ring:
+            self._ring.remove(replica.client_name)
+
+    def replica_for(self, affinity_key: str) -> MCPClient:
+        """Replica that owns an affinity key"""
+        name = self._ring.get(affinity_key)
+        return next(replica for replica in self.replicas if replica.client_name == name)
+
+    def _select_replica(self, affinity_key: Optional[str] = None) -> MCPClient:
+        """Pick the least-loaded replica, rotating the start point to break ties"""
+        if affinity_key is not None:
+            self._start_reaper()
+            return self.replica_for(affinity_key)
+        count = len(self.replicas)
+        start = self._next % count
+        self._next = start + 1
+        candidates = self.replicas[start:] + self.replicas[:start]
+        replica = min(candidates, key=lambda replica: replica.load)
+        # With an autoscaler, its queue depth and latency targets alone decide growth
+        busy = replica.load >= (self.max_in_flight or 1)
+        if busy and self.autoscaler is None and self.size < self.max_size:
+            replica = self._add_replica()
+            self.logger.log_info(f"All replicas busy, grew pool to {self.size}")
+        self._start_reaper()
+        return replica
+
+    def _start_reaper(self):
+        if self.idle_timeout and (self._reaper is None or self._reaper.done()):
+            self._reaper = asyncio.ensure_future(self._reap_idle())
+        if self.autoscaler is not None and (self._autoscale_task is None or self._autoscale_task.done()):
+            self._autoscale_task = asyncio.ensure_future(self._autoscale())
+
+    async def _autoscale(self):
+        """Periodically resize the pool to the autoscaler's desired size"""
+        while True:
+            await asyncio.sleep(self.autoscaler.interval)
+            desired = self.autoscaler.desired_size(
+                self.size,
+                self.min_size,
+                self.max_size,
+                backlog=self.backlog,
+                load=self.load,
+                p95=self.latency.percentile(95),
+                samples=self.latency.count
+            )
+            if desired != self.size:
+                await self.scale_to(desired)
+
+    async def scale_to(self, size: int):
+        """Grow or shrink the pool towards ``size`` within its bounds
+
+        New replicas start their server on first use. Only idle replicas are
+        shut down when shrinking.
+        """
+        size = min(max(size, self.min_size), self.max_size)
+        previous = self.size
+        while self.size < size:
+            self._add_replica()
+        idle = [
+            replica for replica in reversed(self.replicas)
+            if replica.load == 0 and replica.client_name not in self._ring
+        ]
+        retired = idle[:max(0, self.size - size)]
+        for replica in retired:
+            self._remove_replica(replica)
+        if self.size != previous:
+            self.logger.log_info(f"Scaled pool from {previous} to {self.size} replicas")
+            # Latencies from before the change no longer describe the pool
+            self.latency = LatencyTracker()
+        if retired:
+            await asyncio.gather(*(replica.close() for replica in retired))
+
+    async def _reap_idle(self):
+        """Shut down replicas above ``min_size`` once they have been idle for ``idle_timeout``"""
+        while self.size > self.min_size:
+            await asyncio.sleep(self.idle_timeout / 2)
+            idle = [
+                r for r in self.replicas
+                if r.idle_for >= self.idle_timeout and r.client_name not in self._ring
+            ]
+            idle = idle[:self.size - self.min_size]
+            for replica in idle:
+                self._remove_replica(replica)
+            if idle:
+                self.logger.log_info(f"Shrinking pool to {self.size} after idle timeout")
+                await asyncio.gather(*(replica.close() for replica in idle))
+
+    async def connect(self) -> None:
+        """Start every replica's server process concurrently"""
+        self.logger.log_debug(f"Connecting {self.size} replicas")
+        await asyncio.gather(*(replica.connect() for replica in self.replicas))
+        self.logger.log_info(f"Connected {self.size} replicas")
+
+    async def get_tools(self) -> List[Tool]:
+        # Replicas run the same server, so any one of them can answer
+        return await self._select_replica().get_tools()
+
+    async def execute_tool(self,
+                           tool_name: str,
+                           tool_args: Dict[str, Any],
+                           timeout: Optional[float] = None,
+                           affinity_key: Optional[str] = None) -> Any:
+        replica = self._select_replica(affinity_key)
+        self.logger.log_debug(f"Routing tool {tool_name} to {replica.client_name}")
+        return await self._call_replica(replica, tool_name, tool_args, timeout)
+
+    async def _call_replica(self,
+                            replica: MCPClient,
+                            tool_name: str,
+                            tool_args: Dict[str, Any],
+                            timeout: Optional[float] = None) -> Any:
+        """Run a call on one replica, recording its latency unless it was cancelled"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            result = await replica.execute_tool(tool_name, tool_args, timeout=timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._record_latency(tool_name, loop.time() - started, False)
+            raise
+        self._record_latency(tool_name, loop.time() - started, True)
+        return result
+
+    def _record_latency(self, tool_name: str, latency: float, success: bool):
+        self.latency.record(latency, success)
+        self.tool_latency.setdefault(tool_name, LatencyTracker()).record(latency, success)
+
+    def hedge_delay(self, tool_name: str, percentile: float = 95.0, min_samples: int = 10) -> Optional[float]:
+        """Latency at ``percentile`` for the tool, or None until enough calls were observed"""
+        tracker = self.tool_latency.get(tool_name)
+        if tracker is None or tracker.count < min_samples:
+            return None
+        return tracker.percentile(percentile)
+
+    async def execute_hedged(self,
+                             tool_name: str,
+                             tool_args: Dict[str, Any],
+                             timeout: Optional[float] = None,
+                             percentile: float = 95.0) -> Any:
+        """Execute a read-only tool, hedging slow calls on a second replica
+
+        If the first replica has not answered within the tool's observed
+        ``percentile`` latency, the same call is sent to another replica. The
+        first successful answer wins and the other call is cancelled. Only
+        use this for tools that are safe to run twice.
+        """
+        if timeout is not None:
+            return await asyncio.wait_for(self._hedge(tool_name, tool_args, percentile), timeout)
+        return await self._hedge(tool_name, tool_args, percentile)
+
+    async def _hedge(self, tool_name: str, tool_args: Dict[str, Any], percentile: float) -> Any:
+        delay = self.hedge_delay(tool_name, percentile)
+        primary = self._select_replica()
+        first = asyncio.ensure_future(self._call_replica(primary, tool_name, tool_args))
+        if delay is None or self.size < 2:
+            return await first
+
+        attempts = [first]
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if done:
+                return first.result()
+
+            others = [replica for replica in self.replicas if replica is not primary]
+            secondary = min(others, key=lambda replica: replica.load)
+            self.hedged += 1
+            self.logger.log_debug(
+                f"Hedging {tool_name} on {secondary.client_name} after {delay:.3f}s"
+            )
+            second = asyncio.ensure_future(self._call_replica(secondary, tool_name, tool_args))
+            attempts.append(second)
+            pending = set(attempts)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    async def execute_many(self,
+                           calls: List[Tuple[str, Dict[str, Any]]],
+                           affinity_key: Optional[str] = None,
+                           dispatch: Optional[Dispatch] = None) -> List[ToolResult]:
+        """Spread a batch over the replicas, least-loaded first, keeping call order
+
+        With an affinity key the whole batch runs on that key's replica.
+        ``dispatch`` is passed to every replica, see ``MCPClient.execute_many``.
+        """
+        if affinity_key is not None:
+            return await self._select_replica(affinity_key).execute_many(calls, dispatch=dispatch)
+        replicas = sorted(self.replicas, key=lambda replica: replica.load)[:len(calls)]
+        assignments: List[List[int]] = [[] for _ in replicas]
+        for index in range(len(calls)):
+            assignments[index % len(replicas)].append(index)
+
+        results: List[Optional[ToolResult]] = [None] * len(calls)
+
+        async def run(replica: MCPClient, indices: List[int]):
+            batch_results = await replica.execute_many([calls[index] for index in indices], dispatch=dispatch)
+            for index, result in zip(indices, batch_results):
+                results[index] = result
+
+        await asyncio.gather(*(run(replica, indices) for replica, indices in zip(replicas, assignments)))
+        return results
+
+    async def close(self):
+        """Close every replica and terminate its server process"""
+        self.logger.log_debug("Closing pool")
+        for task in [self._reaper, self._autoscale_task]:
+            if task is not None:
+                task.cancel()
+        self._reaper = self._autoscale_task = None
+        await asyncio.gather(*(replica.close() for replica in self.replicas))
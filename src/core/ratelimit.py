@@ -0,0 +1,64 @@
+from typing import Any, Dict, Optional, Union
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Token bucket that makes callers wait for capacity instead of failing
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``,
+    which bounds the burst size. Waiting callers are served in FIFO order.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second, i.e. the sustained calls per second
+            capacity: Maximum stored tokens. Defaults to one second's worth
+                of tokens, and at least one.
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = max(1.0, rate) if capacity is None else capacity
+        if self.capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def from_config(cls, config: Union[float, Dict[str, Any]]) -> "TokenBucket":
+        """Build a bucket from a rate or a dict of keyword arguments"""
+        if isinstance(config, dict):
+            return cls(**config)
+        return cls(config)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if they are available right now"""
+        if self._lock is not None and self._lock.locked():
+            return False
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until enough tokens are available, then take them"""
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket of {self.capacity}")
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
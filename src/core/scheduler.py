@@ -0,0 +1,90 @@
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from contextlib import asynccontextmanager
+import asyncio
+import heapq
+import itertools
+
+
+class FairScheduler:
+    """Priority classes with weighted fair queueing between tenants
+
+    At most ``max_concurrent`` calls run at once. When calls have to wait,
+    a waiting call of a more urgent priority class always goes first. Within
+    a class, tenants share capacity in proportion to their weights: each
+    call gets a virtual finish time of ``start + cost / weight``, and the
+    call with the earliest finish time runs next, so a tenant queueing a
+    large batch cannot starve the others.
+    """
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BATCH = 2
+
+    def __init__(self,
+                 max_concurrent: int = 8,
+                 weights: Optional[Dict[str, float]] = None,
+                 default_weight: float = 1.0):
+        """
+        Args:
+            max_concurrent: Calls allowed to run at once
+            weights: Share of capacity per tenant, relative to ``default_weight``
+            default_weight: Weight of tenants not listed in ``weights``
+        """
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be at least 1, got {max_concurrent}")
+        self.max_concurrent = max_concurrent
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self.running = 0
+        self._waiting: List[Tuple[int, float, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._virtual_time: Dict[int, float] = {}
+        self._last_finish: Dict[Tuple[int, str], float] = {}
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for *_, future in self._waiting if not future.done())
+
+    def _tag(self, tenant: str, priority: int, cost: float) -> Tuple[float, float]:
+        """Virtual start and finish time of a tenant's next call"""
+        weight = self.weights.get(tenant, self.default_weight)
+        start = max(self._virtual_time.get(priority, 0.0), self._last_finish.get((priority, tenant), 0.0))
+        finish = start + cost / weight
+        self._last_finish[(priority, tenant)] = finish
+        return start, finish
+
+    async def acquire(self, tenant: str = "default", priority: int = NORMAL, cost: float = 1.0):
+        """Wait for a slot in the order given by priority and fair share"""
+        start, finish = self._tag(tenant, priority, cost)
+        if self.running < self.max_concurrent and not self.queued:
+            self.running += 1
+            self._virtual_time[priority] = max(self._virtual_time.get(priority, 0.0), start)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, finish, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as the caller gave up
+                self.release()
+            raise
+
+    def release(self):
+        """Hand the slot to the next waiting call, or free it"""
+        while self._waiting:
+            priority, finish, _, future = heapq.heappop(self._waiting)
+            if future.done():
+                continue
+            self._virtual_time[priority] = max(self._virtual_time.get(priority, 0.0), finish)
+            future.set_result(None)
+            return
+        self.running -= 1
+
+    @asynccontextmanager
+    async def slot(self, tenant: str = "default", priority: int = NORMAL, cost: float = 1.0) -> AsyncIterator[None]:
+        await self.acquire(tenant, priority, cost)
+        try:
+            yield
+        finally:
+            self.release()
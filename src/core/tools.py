@@ -1,8 +1,45 @@
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass
 from pathlib import Path
+import hashlib
+import json
 
 from src.core.logger import MCPLogger
 
+if TYPE_CHECKING:
+    from mcp import StdioServerParameters
+    from src.core.catalog import ToolCatalogCache
+
+# Tools of the reference filesystem and memory servers that never change state
+READ_ONLY_TOOLS = frozenset({
+    "read_file", "read_multiple_files", "list_directory", "directory_tree",
+    "search_files", "get_file_info", "list_allowed_directories",
+    "read_graph", "search_nodes", "open_nodes",
+})
+
+# Tools of the reference filesystem and memory servers that change state
+MUTATING_TOOLS = frozenset({
+    "write_file", "edit_file", "create_directory", "move_file",
+    "create_entities", "create_relations", "add_observations",
+    "delete_entities", "delete_observations", "delete_relations",
+})
+
+@dataclass
+class ToolResult:
+    """Represents the result of a tool execution"""
+    success: bool
+    data: Any
+    error: Optional[str] = None
+    client_name: Optional[str] = None
+    timed_out: bool = False
+
+@dataclass
+class ToolCall:
+    """A tool call requested by an LLM, identified by the provider's call id"""
+    id: str
+    name: str
+    args: Dict[str, Any]
+
 class Tool:
     def __init__(self, name: str, 
                  description: str, 
@@ -14,12 +51,53 @@ class Tool:
         self.function_type = function_type
         self.properties = properties
         self.required = required
+        self._fingerprint: Optional[str] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the tool's definition, computed once per tool"""
+        if self._fingerprint is None:
+            payload = json.dumps(self.to_dict(), sort_keys=True, default=str)
+            self._fingerprint = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return self._fingerprint
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the tool to a JSON-compatible dict"""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "function_type": self.function_type,
+            "properties": self.properties,
+            "required": self.required
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Tool":
+        """Create a tool from the output of ``to_dict``"""
+        return cls(
+            name=data["name"],
+            description=data.get("description", ""),
+            function_type=data.get("function_type", "object"),
+            properties=data.get("properties", {}),
+            required=data.get("required", [])
+        )
 
 
 class MCPTools:
     def __init__(self):
         self.tools: Dict[str, Tool] = {}
         self.logger = MCPLogger("tools")
+        self._fingerprint: Optional[str] = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the catalog, recomputed only after ``add`` or ``remove_tool``"""
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for tool in self.tools.values():
+                digest.update(tool.fingerprint.encode("ascii"))
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
     
     def add(self, tools: List[Union[Tool, Tuple[Tuple[str, str], Tuple[str, str], List[Dict[str, Any]]]]]) -> None:
         """Add tools to the collection
@@ -32,6 +110,7 @@ class MCPTools:
                     - description tuple (internal_desc, external_desc)
                     - list containing [None, schema_dict]
         """
+        self._fingerprint = None
         for tool in tools:
             try:
                 if isinstance(tool, Tool):
@@ -85,4 +164,17 @@ class MCPTools:
         return list(self.tools.values())
         
     def remove_tool(self, tool_name: str):
-        self.tools.pop(tool_name, None)
+        if self.tools.pop(tool_name, None) is not None:
+            self._fingerprint = None
+
+    def load_cached(self, cache: "ToolCatalogCache", server_params: "StdioServerParameters") -> bool:
+        """Add a server's tools from a ToolCatalogCache without contacting the server
+
+        Returns:
+            True if a snapshot was found and loaded
+        """
+        tools = cache.load(server_params)
+        if tools is None:
+            return False
+        self.add(tools)
+        return True
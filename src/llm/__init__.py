@@ -1,5 +1,7 @@
 from .base import BaseLLMAdapter
 from .gemini import GeminiAdapter
 from .openai import OpenAIAdapter
+from .session import ChatSession
+from .streaming import StreamingResponse
 
-__all__ = ['BaseLLMAdapter', 'GeminiAdapter', 'OpenAIAdapter']
+__all__ = ['BaseLLMAdapter', 'GeminiAdapter', 'OpenAIAdapter', 'ChatSession', 'StreamingResponse']
@@ -1,8 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
+import json
 
-from src.core import MCPLogger, MCPTools
+from src.core import MCPLogger, MCPTools, ToolCall, ToolResult
+from src.llm.declarations import Extractor, PreparedTools, compile_extractor
+from src.llm.session import ChatSession
+from src.llm.streaming import StreamingResponse
+
+if TYPE_CHECKING:
+    from src.core.orchestrator import ToolOrchestrator
 
 class BaseLLMAdapter(ABC):
     """Base class for LLM adapters"""
@@ -15,6 +22,8 @@ class BaseLLMAdapter(ABC):
         self.model = None
         self.chat = None
         self.tools = None
+        self._extractors: Dict[str, Extractor] = {}
+        self._indexed_tools: Any = None
         self.logger = MCPLogger(self.__class__.__name__, debug_mode=debug, log_file=log_file)
 
     @abstractmethod
@@ -27,48 +36,94 @@ class BaseLLMAdapter(ABC):
         """Prepare tools for the LLM"""
         pass
 
+    def _use_prepared(self, tools: Any, prepared: PreparedTools) -> Any:
+        """Install prepared declarations as ``self.tools`` along with their extractors"""
+        self.tools = tools
+        self._extractors = prepared.extractors
+        self._indexed_tools = tools
+        return tools
+
+    def _tool_schemas(self) -> Iterable[Tuple[str, Dict[str, Any]]]:
+        """Name and parameter schema of every declaration in ``self.tools``"""
+        return ()
+
+    def _extractor(self, tool_name: str) -> Optional[Extractor]:
+        """Compiled argument extractor for a prepared tool, found by name"""
+        if self._indexed_tools is not self.tools:
+            # Tools were assigned directly instead of through prepare_tools
+            self._extractors = {name: compile_extractor(schema) for name, schema in self._tool_schemas()}
+            self._indexed_tools = self.tools
+        return self._extractors.get(tool_name)
+
     @abstractmethod
     async def send_message(self, message: str) -> Any:
         """Send a message to the LLM and get response"""
         pass
 
+    def start_chat(self) -> Any:
+        """Create the provider-side state of a new conversation"""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support conversations")
+
+    def session(self, conversation_id: Optional[str] = None) -> ChatSession:
+        """Start a conversation on this configured adapter
+
+        Sessions share the adapter's model, tool declarations and HTTP
+        connections and hold only their own history, so one adapter can
+        serve many concurrent conversations.
+        """
+        return ChatSession(self, self.start_chat(), conversation_id)
+
+    async def send_tool_results(self,
+                                calls: List[ToolCall],
+                                results: Dict[str, ToolResult],
+                                chat: Any,
+                                stream: bool = False,
+                                orchestrator: Optional["ToolOrchestrator"] = None,
+                                **execute_kwargs: Any) -> Any:
+        """Send the results of a response's tool calls back to the LLM"""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support tool results")
+
+    @staticmethod
+    def _tool_result_content(result: ToolResult) -> str:
+        if not result.success:
+            return f"Error: {result.error}"
+        if isinstance(result.data, str):
+            return result.data
+        return json.dumps(result.data, default=str)
+
+    def _stream_events(self, message: str, chat: Any = None) -> AsyncIterator[Union[str, ToolCall]]:
+        """Stream a response as text chunks and completed tool calls"""
+        raise NotImplementedError(f"{self.__class__.__name__} does not support streaming")
+
+    async def stream_message(self,
+                             message: str,
+                             orchestrator: Optional["ToolOrchestrator"] = None,
+                             chat: Any = None,
+                             **execute_kwargs: Any) -> StreamingResponse:
+        """Send a message and stream the response
+
+        Tool calls are handed to ``orchestrator`` as soon as their arguments
+        are complete, while the model is still generating.
+        """
+        self.logger.log_debug(f"Streaming message: {message[:100]}...")
+        return StreamingResponse(self._stream_events(message, chat), orchestrator, **execute_kwargs)
+
     @abstractmethod
     def extract_tool_call(self, response: Any) -> Tuple[str, Dict[str, Any]]:
         """Extract tool call from LLM response"""
         pass
 
+    def extract_tool_calls(self, response: Any) -> List[ToolCall]:
+        """Extract every tool call from LLM response
+
+        Adapters whose providers return several calls per response override
+        this; the default wraps ``extract_tool_call``.
+        """
+        tool_name, tool_args = self.extract_tool_call(response)
+        if not tool_name:
+            return []
+        return [ToolCall(id="call_0", name=tool_name, args=tool_args)]
+
     def _extract_by_schema(self, value: Any, schema: Dict[str, Any]) -> Any:
         """Extract value according to the schema definition"""
-        # Handle primitive types
-        if schema.get("type") == "string":
-            return str(value)
-        elif schema.get("type") == "number":
-            return float(value)
-        elif schema.get("type") == "integer":
-            return int(value)
-        elif schema.get("type") == "boolean":
-            return bool(value)
-            
-        # Handle arrays
-        elif schema.get("type") == "array":
-            items_schema = schema.get("items", {})
-            if hasattr(value, '__iter__'):
-                return [self._extract_by_schema(item, items_schema) for item in value]
-            return []
-            
-        # Handle objects
-        elif schema.get("type") == "object":
-            if hasattr(value, 'items'):
-                properties = schema.get("properties", {})
-                result = {}
-                items = dict(value.items())
-                
-                for prop_name, prop_schema in properties.items():
-                    if prop_name in items:
-                        result[prop_name] = self._extract_by_schema(items[prop_name], prop_schema)
-                        
-                return result
-            return {}
-            
-        # Default
-        return value
+        return compile_extractor(schema)(value)
@@ -0,0 +1,135 @@
+from typing import Any, Callable, Dict, List, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.core.tools import MCPTools, Tool
+
+Extractor = Callable[[Any], Any]
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+_PRIMITIVES: Dict[str, Extractor] = {
+    "string": str,
+    "number": float,
+    "integer": int,
+    "boolean": bool,
+}
+
+
+def compile_extractor(schema: Dict[str, Any]) -> Extractor:
+    """Build a function that extracts a value according to a schema
+
+    Equivalent to ``BaseLLMAdapter._extract_by_schema``, but the schema is
+    walked once up front instead of on every call.
+    """
+    if not isinstance(schema, dict):
+        return _identity
+    kind = schema.get("type")
+    if kind in _PRIMITIVES:
+        return _PRIMITIVES[kind]
+
+    if kind == "array":
+        extract_item = compile_extractor(schema.get("items", {}))
+
+        def extract_array(value: Any) -> List[Any]:
+            if hasattr(value, '__iter__'):
+                return [extract_item(item) for item in value]
+            return []
+        return extract_array
+
+    if kind == "object":
+        fields = [(name, compile_extractor(prop_schema))
+                  for name, prop_schema in schema.get("properties", {}).items()]
+
+        def extract_object(value: Any) -> Dict[str, Any]:
+            if not hasattr(value, 'items'):
+                return {}
+            items = dict(value.items())
+            return {name: extract(items[name]) for name, extract in fields if name in items}
+        return extract_object
+
+    return _identity
+
+
+def tool_extractor(tool: Tool) -> Extractor:
+    """Compiled argument extractor for a tool's input schema"""
+    return compile_extractor({
+        "type": tool.function_type,
+        "properties": tool.properties,
+        "required": tool.required
+    })
+
+
+@dataclass
+class PreparedTools:
+    """Provider declarations of a catalog and argument extractors by tool name"""
+    declarations: List[Dict[str, Any]]
+    extractors: Dict[str, Extractor]
+
+
+class ToolDeclarationCache:
+    """Provider tool declarations memoized by catalog fingerprint
+
+    Each adapter module keeps one cache shared by all of its adapter
+    instances, so preparing the same catalog again is a dictionary lookup.
+    When the catalog changes, only tools whose own fingerprint is new are
+    converted; the declarations of unchanged tools are reused. The returned
+    declarations are shared and must not be modified.
+    """
+
+    def __init__(self,
+                 convert: Callable[[Tool], Dict[str, Any]],
+                 max_catalogs: int = 32,
+                 max_tools: int = 4096):
+        """
+        Args:
+            convert: Builds a provider declaration from a tool
+            max_catalogs: Catalogs kept, least recently used evicted first
+            max_tools: Converted tools kept, least recently used evicted first
+        """
+        self.convert = convert
+        self.max_catalogs = max_catalogs
+        self.max_tools = max_tools
+        self._catalogs: "OrderedDict[str, PreparedTools]" = OrderedDict()
+        self._tools: "OrderedDict[str, Tuple[Dict[str, Any], Extractor]]" = OrderedDict()
+        self.conversions = 0
+
+    def __len__(self) -> int:
+        return len(self._catalogs)
+
+    def _prepare(self, tool: Tool) -> Tuple[Dict[str, Any], Extractor]:
+        prepared = self._tools.get(tool.fingerprint)
+        if prepared is None:
+            prepared = (self.convert(tool), tool_extractor(tool))
+            self.conversions += 1
+            self._tools[tool.fingerprint] = prepared
+            while len(self._tools) > self.max_tools:
+                self._tools.popitem(last=False)
+        else:
+            self._tools.move_to_end(tool.fingerprint)
+        return prepared
+
+    def get(self, mcp_tools: MCPTools) -> PreparedTools:
+        """Declarations and extractors for every tool of the catalog, in catalog order"""
+        key = mcp_tools.fingerprint
+        prepared = self._catalogs.get(key)
+        if prepared is not None:
+            self._catalogs.move_to_end(key)
+            return prepared
+        tools = mcp_tools.list_tools()
+        converted = [self._prepare(tool) for tool in tools]
+        prepared = PreparedTools(
+            declarations=[declaration for declaration, _ in converted],
+            extractors={tool.name: extractor for tool, (_, extractor) in zip(tools, converted)}
+        )
+        self._catalogs[key] = prepared
+        while len(self._catalogs) > self.max_catalogs:
+            self._catalogs.popitem(last=False)
+        return prepared
+
+    def clear(self):
+        self._catalogs.clear()
+        self._tools.clear()
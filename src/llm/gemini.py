@@ -1,9 +1,40 @@
 import google.generativeai as genai
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
 
-from src.core import MCPLogger, MCPTools
+from src.core import MCPLogger, MCPTools, ToolCall, ToolResult
+from src.core.tools import Tool
 from src.llm.base import BaseLLMAdapter
+from src.llm.declarations import ToolDeclarationCache
+
+if TYPE_CHECKING:
+    from src.core.orchestrator import ToolOrchestrator
+
+def _function_declaration(tool: Tool) -> Dict[str, Any]:
+    # Clean up properties to remove 'default' field
+    properties = {}
+    for key, value in tool.properties.items():
+        if isinstance(value, dict) and 'default' in value:
+            cleaned_value = value.copy()
+            del cleaned_value['default']
+            properties[key] = cleaned_value
+        else:
+            properties[key] = value
+
+    return {
+        "name": tool.name,
+        "description": tool.description,
+        "parameters": {
+            "type": tool.function_type,
+            "properties": properties,
+            "required": tool.required
+        },
+    }
+
+
+# Function declarations shared by every adapter, keyed by catalog fingerprint
+_declarations = ToolDeclarationCache(_function_declaration)
+
 
 class GeminiAdapter(BaseLLMAdapter):
     def __init__(self, 
@@ -27,74 +58,131 @@ class GeminiAdapter(BaseLLMAdapter):
             raise
 
     async def prepare_tools(self, mcp_tools: MCPTools) -> Dict:
-        """Prepare tools for Gemini model"""
-        tools = mcp_tools.list_tools()
-        self.logger.log_debug(f"Preparing {len(tools)} tools for Gemini")
-        self.tools = [{"function_declarations": []}]
+        """Prepare tools for Gemini model
+
+        Declarations are memoized across adapters by catalog fingerprint and
+        only new or changed tools are converted; treat them as read-only.
+        """
+        self.logger.log_debug(f"Preparing {len(mcp_tools.tools)} tools for Gemini")
         try:
-            for tool in tools:
-                self.logger.log_debug(f"Converting tool: {tool.name}")
-
-                # Clean up properties to remove 'default' field
-                properties = {}
-                for key, value in tool.properties.items():
-                    if isinstance(value, dict) and 'default' in value:
-                        cleaned_value = value.copy()
-                        del cleaned_value['default']
-                        properties[key] = cleaned_value
-                    else:
-                        properties[key] = value
-
-                tool_dict = {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": {
-                        "type": tool.function_type,
-                        "properties": properties,
-                        "required": tool.required
-                    },
-                }
-                self.tools[0]["function_declarations"].append(tool_dict)
-            
-            self.logger.log_info(f"Successfully prepared {len(tools)} tools")
+            prepared = _declarations.get(mcp_tools)
+            self._use_prepared([{"function_declarations": prepared.declarations}], prepared)
+            self.logger.log_info(f"Successfully prepared {len(prepared.declarations)} tools")
             return self.tools
             
         except Exception as e:
             self.logger.log_error(f"Failed to prepare tools: {str(e)}")
             raise
 
-    async def send_message(self, message: str) -> Any:
+    def start_chat(self) -> Any:
+        """Start a conversation; Gemini chat sessions keep their own history"""
+        return self.model.start_chat()
+
+    async def send_message(self,
+                           message: Any,
+                           stream: bool = False,
+                           orchestrator: Optional["ToolOrchestrator"] = None,
+                           chat: Any = None,
+                           **execute_kwargs: Any) -> Any:
+        """Send a message in ``chat``, or in the adapter's own chat by default"""
+        if stream:
+            return await self.stream_message(message, orchestrator, chat=chat, **execute_kwargs)
         self.logger.log_debug(f"Sending message to Gemini: {message[:100]}...")
         try:
-            response = await self.chat.send_message_async(message)
+            response = await (chat or self.chat).send_message_async(message)
             self.logger.log_info("Successfully received response from Gemini")
             return response
         except Exception as e:
             self.logger.log_error(f"Failed to send message: {str(e)}")
             raise
 
+    async def send_tool_results(self,
+                                calls: List[ToolCall],
+                                results: Dict[str, ToolResult],
+                                chat: Any = None,
+                                stream: bool = False,
+                                orchestrator: Optional["ToolOrchestrator"] = None,
+                                **execute_kwargs: Any) -> Any:
+        """Send the results of a response's function calls as function responses"""
+        parts = [
+            genai.protos.Part(function_response=genai.protos.FunctionResponse(
+                name=call.name,
+                response={"result": self._tool_result_content(results[call.id])}
+            ))
+            for call in calls
+        ]
+        return await self.send_message(parts, stream, orchestrator, chat=chat, **execute_kwargs)
+
+    async def _stream_events(self, message: Any, chat: Any = None) -> AsyncIterator[Union[str, ToolCall]]:
+        """Stream text chunks; Gemini sends each function call whole in one chunk"""
+        try:
+            response = await (chat or self.chat).send_message_async(message, stream=True)
+        except Exception as e:
+            self.logger.log_error(f"Failed to send message: {str(e)}")
+            raise
+
+        calls = 0
+        async for chunk in response:
+            for part in chunk.parts:
+                function_call = getattr(part, "function_call", None)
+                if function_call and function_call.name:
+                    try:
+                        tool_name, tool_args = self._parse_function_call(function_call)
+                    except Exception as e:
+                        self.logger.log_error(f"Failed to extract streamed tool call: {str(e)}")
+                        continue
+                    yield ToolCall(id=f"call_{calls}", name=tool_name, args=tool_args)
+                    calls += 1
+                elif getattr(part, "text", None):
+                    yield part.text
+        self.logger.log_info("Finished streaming response from Gemini")
+
     def extract_tool_call(self, response: Any) -> tuple[str, Dict[str, Any]]:
         """
         Extract tool call using the tool's schema definition.
         """
         try:
-            function_call = response.parts[0].function_call
-            tool_name = str(function_call.name)
-            
-            # Get the tool schema
-            tool = next((t for t in self.tools[0]["function_declarations"] 
-                        if t["name"] == tool_name), None)
-            
-            if not tool:
-                raise ValueError(f"Unknown tool: {tool_name}")
-                
-            # Extract according to schema
-            raw_args = function_call.args
-            tool_args = self._extract_by_schema(raw_args, tool["parameters"])
-            
-            self.logger.log_debug(f"Extracted arguments: {tool_args}")
-            return tool_name, tool_args
-            
+            return self._parse_function_call(response.parts[0].function_call)
         except Exception as e:
             self.logger.log_error(f"Failed to extract tool call: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def _tool_schemas(self) -> Iterable[Tuple[str, Dict[str, Any]]]:
+        for tool in self.tools or []:
+            for declaration in tool.get("function_declarations", []):
+                yield declaration["name"], declaration["parameters"]
+
+    def _parse_function_call(self, function_call: Any) -> Tuple[str, Dict[str, Any]]:
+        """Parse one function call's arguments using the tool's schema definition"""
+        tool_name = str(function_call.name)
+        
+        # Get the tool's compiled extractor
+        extract = self._extractor(tool_name)
+        if extract is None:
+            raise ValueError(f"Unknown tool: {tool_name}")
+            
+        # Extract according to schema
+        raw_args = function_call.args
+        tool_args = extract(raw_args)
+        
+        self.logger.log_debug(f"Extracted arguments: {tool_args}")
+        return tool_name, tool_args
+
+    def extract_tool_calls(self, response: Any) -> List[ToolCall]:
+        """Extract the function calls of every response part
+
+        Gemini does not assign call ids, so each call is keyed by its
+        position in the response (``call_0``, ``call_1``, ...).
+        """
+        calls = []
+        try:
+            for part in response.parts:
+                function_call = getattr(part, "function_call", None)
+                if not function_call or not function_call.name:
+                    continue
+                tool_name, tool_args = self._parse_function_call(function_call)
+                calls.append(ToolCall(id=f"call_{len(calls)}", name=tool_name, args=tool_args))
+        except Exception as e:
+            self.logger.log_error(f"Failed to extract tool calls: {str(e)}")
+            raise
+        return calls
\ No newline at end of file
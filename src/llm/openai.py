@@ -1,102 +1,334 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
 from pathlib import Path
-from openai import OpenAI
+from openai import AsyncOpenAI
+import httpx
+import asyncio
 import json
+import weakref
 
 from src.llm.base import BaseLLMAdapter
-from src.core.tools import MCPTools
+from src.core.tools import MCPTools, Tool, ToolCall, ToolResult
 from src.core.logger import MCPLogger
+from src.llm.declarations import ToolDeclarationCache
+from src.llm.streaming import StreamingResponse
+
+if TYPE_CHECKING:
+    from src.core.orchestrator import ToolOrchestrator
+
+# Connection pools shared by every adapter with the same limits, per event loop
+_shared_http_clients: "weakref.WeakKeyDictionary[Any, Dict[Tuple[int, int, float], httpx.AsyncClient]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def get_shared_http_client(max_connections: int = 100,
+                           max_keepalive_connections: int = 20,
+                           keepalive_expiry: float = 5.0) -> httpx.AsyncClient:
+    """Return the async HTTP client for the given pool limits on the running event loop
+
+    Pooled connections belong to the loop that opened them, so each event
+    loop gets its own clients.
+    """
+    clients = _shared_http_clients.setdefault(asyncio.get_running_loop(), {})
+    key = (max_connections, max_keepalive_connections, keepalive_expiry)
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=httpx.Timeout(600.0, connect=5.0)
+        )
+        clients[key] = client
+    return client
+
+
+async def close_shared_http_clients():
+    """Close the running loop's shared HTTP clients, e.g. at application shutdown"""
+    clients = _shared_http_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+def _tool_declaration(tool: Tool) -> Dict[str, Any]:
+    return {
+        "type": "function",
+        "function": {
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": {
+                "type": tool.function_type,
+                "properties": tool.properties,
+                "required": tool.required
+            }
+        }
+    }
+
+
+# Tool declarations shared by every adapter, keyed by catalog fingerprint
+_declarations = ToolDeclarationCache(_tool_declaration)
+
 
 class OpenAIAdapter(BaseLLMAdapter):
     def __init__(self, 
                  model_name: str = 'gpt-4o-mini',
                  debug: bool = False,
-                 log_file: Optional[Path] = None):
+                 log_file: Optional[Path] = None,
+                 max_connections: int = 100,
+                 max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 5.0,
+                 http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            model_name: OpenAI model to use
+            debug: Enable debug logging
+            log_file: Optional file to write logs to
+            max_connections: Connection limit of the shared HTTP pool
+            max_keepalive_connections: Idle connections kept open in the pool
+            keepalive_expiry: Seconds an idle connection is kept open
+            http_client: Use this async HTTP client instead of the shared pool
+        """
         super().__init__(model_name, debug, log_file)
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http_client = http_client
+        self.client = None
         
     async def configure(self, api_key: str, **kwargs):
-        """Configure OpenAI client with API key"""
+        """Configure the async OpenAI client with API key
+
+        Requests go through a connection pool shared by all adapters with the
+        same limits, so concurrent conversations reuse warm connections.
+        """
         try:
-            self.client = OpenAI(api_key=api_key)
+            http_client = self.http_client or get_shared_http_client(
+                self.max_connections,
+                self.max_keepalive_connections,
+                self.keepalive_expiry
+            )
+            self.client = AsyncOpenAI(api_key=api_key, http_client=http_client)
             self.logger.log_info(f"Successfully configured OpenAI client with model {self.model_name}")
         except Exception as e:
             self.logger.log_error(f"Failed to configure OpenAI client: {str(e)}")
             raise e
 
     async def prepare_tools(self, mcp_tools: MCPTools) -> Dict:
-        """Prepare tools for OpenAI model"""
-        tools = mcp_tools.list_tools()
-        self.logger.log_debug(f"Preparing {len(tools)} tools for OpenAI")
-        self.tools = []
-        
+        """Prepare tools for OpenAI model
+
+        Declarations are memoized across adapters by catalog fingerprint and
+        only new or changed tools are converted; treat them as read-only.
+        """
+        self.logger.log_debug(f"Preparing {len(mcp_tools.tools)} tools for OpenAI")
         try:
-            for tool in tools:
-                self.logger.log_debug(f"Converting tool: {tool.name}")
-                
-                tool_dict = {
-                    "type": "function",
-                    "function": {
-                        "name": tool.name,
-                        "description": tool.description,
-                        "parameters": {
-                            "type": tool.function_type,
-                            "properties": tool.properties,
-                            "required": tool.required
-                        }
-                    }
-                }
-                self.tools.append(tool_dict)
-            
-            self.logger.log_info(f"Successfully prepared {len(tools)} tools")
+            prepared = _declarations.get(mcp_tools)
+            self._use_prepared(prepared.declarations, prepared)
+            self.logger.log_info(f"Successfully prepared {len(self.tools)} tools")
             return self.tools
             
         except Exception as e:
             self.logger.log_error(f"Failed to prepare tools: {str(e)}")
             raise e
 
-    async def send_message(self, message: str) -> Any:
-        """Send a message to OpenAI and get response"""
+    def start_chat(self) -> List[Dict[str, Any]]:
+        """Start a conversation, held as the list of messages sent so far"""
+        return []
+
+    @staticmethod
+    def _messages(chat: Optional[List[Dict[str, Any]]], *new_messages: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Append new messages to a conversation, or start a throwaway one"""
+        messages = [] if chat is None else chat
+        messages.extend(new_messages)
+        return messages
+
+    async def send_message(self,
+                           message: str,
+                           stream: bool = False,
+                           orchestrator: Optional["ToolOrchestrator"] = None,
+                           chat: Optional[List[Dict[str, Any]]] = None,
+                           **execute_kwargs: Any) -> Any:
+        """Send a message to OpenAI and get response
+
+        With ``stream=True`` a StreamingResponse is returned instead; see
+        ``stream_message``. ``chat`` is a conversation from ``start_chat``;
+        without one the message is sent on its own.
+        """
+        if stream:
+            return await self.stream_message(message, orchestrator, chat=chat, **execute_kwargs)
         self.logger.log_debug(f"Sending message to OpenAI: {message[:100]}...")
+        return await self._complete(self._messages(chat, {"role": "user", "content": message}))
+
+    async def send_tool_results(self,
+                                calls: List[ToolCall],
+                                results: Dict[str, ToolResult],
+                                chat: List[Dict[str, Any]],
+                                stream: bool = False,
+                                orchestrator: Optional["ToolOrchestrator"] = None,
+                                **execute_kwargs: Any) -> Any:
+        """Send the results of a response's tool calls, keyed by call id"""
+        messages = self._messages(chat, *(
+            {"role": "tool", "tool_call_id": call.id, "content": self._tool_result_content(results[call.id])}
+            for call in calls
+        ))
+        if stream:
+            return StreamingResponse(self._stream_completion(messages), orchestrator, **execute_kwargs)
+        return await self._complete(messages)
+
+    async def _complete(self, messages: List[Dict[str, Any]]) -> Any:
+        """Request a completion and append the assistant's reply to the messages"""
         try:
-            completion = self.client.chat.completions.create(
+            completion = await self.client.chat.completions.create(
                 model=self.model_name,
-                messages=[{"role": "user", "content": message}],
+                messages=messages,
                 tools=self.tools
             )
             self.logger.log_info("Successfully received response from OpenAI")
-            return completion
-            
         except Exception as e:
             self.logger.log_error(f"Failed to send message: {str(e)}")
             raise e
 
+        reply = completion.choices[0].message
+        # Calls that do not parse are skipped by extract_tool_calls and never
+        # answered, and an unanswered call id would fail every later request
+        messages.append(self._assistant_message(reply.content, [
+            (tool_call.id, tool_call.function.name, tool_call.function.arguments)
+            for tool_call in reply.tool_calls or [] if self._parses(tool_call)
+        ]))
+        return completion
+
+    def _parses(self, tool_call: Any) -> bool:
+        try:
+            self._parse_tool_call(tool_call)
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _assistant_message(content: Optional[str], tool_calls: List[Tuple[str, str, str]]) -> Dict[str, Any]:
+        message: Dict[str, Any] = {"role": "assistant", "content": content}
+        if tool_calls:
+            message["tool_calls"] = [
+                {"id": call_id, "type": "function", "function": {"name": name, "arguments": arguments}}
+                for call_id, name, arguments in tool_calls
+            ]
+        return message
+
+    def _stream_events(self, message: str,
+                       chat: Optional[List[Dict[str, Any]]] = None) -> AsyncIterator[Union[str, ToolCall]]:
+        return self._stream_completion(self._messages(chat, {"role": "user", "content": message}))
+
+    async def _stream_completion(self, messages: List[Dict[str, Any]]) -> AsyncIterator[Union[str, ToolCall]]:
+        """Stream text deltas, yielding each tool call once its arguments parse
+
+        OpenAI streams a tool call's arguments as JSON fragments. The
+        arguments are a single object, so the first prefix that parses is the
+        complete call and it can be dispatched before the stream ends. The
+        assistant's reply is appended to the messages once the stream ends.
+        """
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                tools=self.tools,
+                stream=True
+            )
+        except Exception as e:
+            self.logger.log_error(f"Failed to send message: {str(e)}")
+            raise
+
+        pending: Dict[int, Dict[str, Any]] = {}
+        text: List[str] = []
+
+        def complete(index: int) -> Optional[ToolCall]:
+            call = pending[index]
+            if call["done"]:
+                return None
+            try:
+                tool_name, tool_args = self._parse_arguments(call["name"], call["arguments"])
+            except Exception:
+                return None
+            call["done"] = True
+            return ToolCall(id=call["id"], name=tool_name, args=tool_args)
+
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                text.append(delta.content)
+                yield delta.content
+            for fragment in delta.tool_calls or []:
+                call = pending.setdefault(
+                    fragment.index, {"id": None, "name": "", "arguments": "", "done": False}
+                )
+                if fragment.id:
+                    call["id"] = fragment.id
+                if fragment.function is not None:
+                    call["name"] += fragment.function.name or ""
+                    call["arguments"] += fragment.function.arguments or ""
+                # Arguments are a JSON object, so only a closing brace can complete them;
+                # parsing on every fragment would be quadratic in the argument size
+                if call["name"] and call["arguments"].rstrip().endswith("}"):
+                    tool_call = complete(fragment.index)
+                    if tool_call is not None:
+                        yield tool_call
+
+        # Calls that never parsed are reported the same way as in extract_tool_calls
+        for call in pending.values():
+            if not call["done"]:
+                self.logger.log_error(f"Failed to extract streamed tool call {call['id']}: {call['arguments']!r}")
+        messages.append(self._assistant_message("".join(text) or None, [
+            (call["id"], call["name"], call["arguments"]) for call in pending.values() if call["done"]
+        ]))
+        self.logger.log_info("Finished streaming response from OpenAI")
+
+    def _tool_schemas(self) -> Iterable[Tuple[str, Dict[str, Any]]]:
+        return ((tool["function"]["name"], tool["function"]["parameters"]) for tool in self.tools or [])
+
+    def _parse_tool_call(self, tool_call: Any) -> Tuple[str, Dict[str, Any]]:
+        """Parse one tool call's arguments using the tool's schema definition"""
+        return self._parse_arguments(tool_call.function.name, tool_call.function.arguments)
+
+    def _parse_arguments(self, tool_name: str, arguments: str) -> Tuple[str, Dict[str, Any]]:
+        """Parse a tool call's JSON arguments using the tool's schema definition"""
+
+        # Find the tool's compiled extractor
+        extract = self._extractor(tool_name)
+        if extract is None:
+            raise ValueError(f"Schema not found for tool: {tool_name}")
+        
+        # Extract arguments according to schema
+        args_dict = json.loads(arguments)
+        tool_args = extract(args_dict)
+        
+        self.logger.log_debug(f"Extracted arguments: {tool_args}")
+        return tool_name, tool_args
+
     def extract_tool_call(self, response: Any) -> Tuple[str, Dict[str, Any]]:
         """Extract tool call using the tool's schema definition"""
         try:
             if not response.choices[0].message.tool_calls:
                 return None, None
                 
-            tool_call = response.choices[0].message.tool_calls[0]
-            tool_name = tool_call.function.name
-            
-            # Find the tool schema
-            tool_schema = None
-            for tool in self.tools:
-                if tool["function"]["name"] == tool_name:
-                    tool_schema = tool["function"]["parameters"]
-                    break
-            
-            if not tool_schema:
-                self.logger.log_error(f"Schema not found for tool: {tool_name}")
-                return None, None
-            
-            # Extract arguments according to schema
-            args_dict = json.loads(tool_call.function.arguments)
-            tool_args = self._extract_by_schema(args_dict, tool_schema)
-            
-            self.logger.log_debug(f"Extracted arguments: {tool_args}")
-            return tool_name, tool_args
+            return self._parse_tool_call(response.choices[0].message.tool_calls[0])
             
         except Exception as e:
             self.logger.log_error(f"Failed to extract tool call: {str(e)}")
             return None, None
+
+    def extract_tool_calls(self, response: Any) -> List[ToolCall]:
+        """Extract every tool call of a response, keyed by OpenAI's call id
+
+        Calls that cannot be parsed are logged and skipped. They are also left
+        out of the chat history, so the remaining calls' results complete it.
+        """
+        calls = []
+        for tool_call in response.choices[0].message.tool_calls or []:
+            try:
+                tool_name, tool_args = self._parse_tool_call(tool_call)
+            except Exception as e:
+                self.logger.log_error(f"Failed to extract tool call {tool_call.id}: {str(e)}")
+                continue
+            calls.append(ToolCall(id=tool_call.id, name=tool_name, args=tool_args))
+        return calls
@@ -0,0 +1,56 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+import uuid
+
+from src.core import ToolCall, ToolResult
+
+if TYPE_CHECKING:
+    from src.core.orchestrator import ToolOrchestrator
+    from src.llm.base import BaseLLMAdapter
+
+
+class ChatSession:
+    """One conversation on a shared, configured LLM adapter
+
+    The adapter owns the model, the prepared tool declarations and the HTTP
+    connections; a session holds only the conversation's history, so
+    creating one costs no ``configure`` or ``prepare_tools`` call. Send one
+    message at a time per session; different sessions can run concurrently.
+    """
+
+    def __init__(self, adapter: "BaseLLMAdapter", chat: Any, conversation_id: Optional[str] = None):
+        """
+        Args:
+            adapter: Configured adapter the session sends through
+            chat: Provider-side conversation state from ``adapter.start_chat()``
+            conversation_id: Identifier of the conversation. Defaults to a random id.
+        """
+        self.adapter = adapter
+        self.chat = chat
+        self.id = conversation_id or uuid.uuid4().hex
+
+    async def send_message(self,
+                           message: str,
+                           stream: bool = False,
+                           orchestrator: Optional["ToolOrchestrator"] = None,
+                           **execute_kwargs: Any) -> Any:
+        """Send a message in this conversation; see the adapter's ``send_message``"""
+        return await self.adapter.send_message(
+            message, stream=stream, orchestrator=orchestrator, chat=self.chat, **execute_kwargs
+        )
+
+    async def send_tool_results(self,
+                                calls: List[ToolCall],
+                                results: Dict[str, ToolResult],
+                                stream: bool = False,
+                                orchestrator: Optional["ToolOrchestrator"] = None,
+                                **execute_kwargs: Any) -> Any:
+        """Send the results of the last response's tool calls, keyed by call id"""
+        return await self.adapter.send_tool_results(
+            calls, results, self.chat, stream=stream, orchestrator=orchestrator, **execute_kwargs
+        )
+
+    def extract_tool_call(self, response: Any) -> Tuple[str, Dict[str, Any]]:
+        return self.adapter.extract_tool_call(response)
+
+    def extract_tool_calls(self, response: Any) -> List[ToolCall]:
+        return self.adapter.extract_tool_calls(response)
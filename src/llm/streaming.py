@@ -0,0 +1,64 @@
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Union
+import asyncio
+
+from src.core import ToolCall, ToolResult
+
+if TYPE_CHECKING:
+    from src.core.orchestrator import ToolOrchestrator
+
+
+class StreamingResponse:
+    """Text tokens of a streamed LLM response, with early tool call dispatch
+
+    Iterating yields the response's text as it arrives. Each tool call is
+    collected as soon as its arguments are complete and, when an
+    orchestrator is given, starts executing right away while the model is
+    still generating. ``tool_results`` waits for those executions.
+    """
+
+    def __init__(self,
+                 events: AsyncIterator[Union[str, ToolCall]],
+                 orchestrator: Optional["ToolOrchestrator"] = None,
+                 **execute_kwargs: Any):
+        self._events = events
+        self.orchestrator = orchestrator
+        self.execute_kwargs = execute_kwargs
+        self.chunks: List[str] = []
+        self.tool_calls: List[ToolCall] = []
+        self._executions: Dict[str, asyncio.Task] = {}
+        self._consumed = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks)
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[str]:
+        if self._consumed:
+            raise RuntimeError("Streaming response can only be iterated once")
+        self._consumed = True
+        async for event in self._events:
+            if isinstance(event, ToolCall):
+                self.tool_calls.append(event)
+                if self.orchestrator is not None:
+                    self._executions[event.id] = asyncio.ensure_future(
+                        self.orchestrator.execute(event.name, event.args, **self.execute_kwargs)
+                    )
+            else:
+                self.chunks.append(event)
+                yield event
+
+    async def consume(self) -> str:
+        """Read the rest of the stream and return the full text"""
+        if not self._consumed:
+            async for _ in self:
+                pass
+        return self.text
+
+    async def tool_results(self) -> Dict[str, ToolResult]:
+        """Finish the stream and wait for the dispatched tool calls, keyed by call id"""
+        await self.consume()
+        results = await asyncio.gather(*self._executions.values())
+        return dict(zip(self._executions.keys(), results))
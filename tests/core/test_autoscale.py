@@ -0,0 +1,56 @@
+"""
+Tests for the autoscale module in the MCP adapter.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from src.core.autoscale import Autoscaler
+
+class TestAutoscaler(unittest.TestCase):
+    """Test the Autoscaler class."""
+
+    def test_invalid_target(self):
+        """Test that the queue depth target must be positive."""
+        with self.assertRaises(ValueError):
+            Autoscaler(target_queue_depth=0)
+
+    def test_grow_on_queue_depth(self):
+        """Test that a deep queue grows the pool in proportion, within bounds."""
+        scaler = Autoscaler(target_queue_depth=2, cooldown=0)
+        self.assertEqual(scaler.desired_size(2, 1, 8, backlog=4, load=6), 2)
+        self.assertEqual(scaler.desired_size(2, 1, 8, backlog=5, load=7), 3)
+        self.assertEqual(scaler.desired_size(2, 1, 8, backlog=12, load=14), 6)
+        self.assertEqual(scaler.desired_size(2, 1, 4, backlog=12, load=14), 4)
+
+    def test_grow_on_latency(self):
+        """Test that a slow p95 grows the pool once enough samples exist."""
+        scaler = Autoscaler(target_p95=1.0, cooldown=0, min_samples=5)
+        self.assertEqual(scaler.desired_size(2, 1, 8, backlog=0, load=2, p95=3.0, samples=2), 2)
+        self.assertEqual(scaler.desired_size(2, 1, 8, backlog=0, load=2, p95=3.0, samples=5), 3)
+        self.assertEqual(scaler.desired_size(2, 1, 8, backlog=0, load=2, p95=0.5, samples=5), 2)
+
+    def test_cooldown(self):
+        """Test that no change is made during the cooldown after a change."""
+        scaler = Autoscaler(cooldown=10)
+        self.assertEqual(scaler.desired_size(1, 1, 8, backlog=3, load=4), 3)
+        self.assertEqual(scaler.desired_size(3, 1, 8, backlog=9, load=12), 3)
+
+    @patch("src.core.autoscale.time.monotonic")
+    def test_shrink_after_sustained_low_load(self, mock_monotonic):
+        """Test that the pool shrinks one replica at a time once load stays low."""
+        scaler = Autoscaler(cooldown=0, scale_down_delay=30)
+        mock_monotonic.return_value = 100.0
+        self.assertEqual(scaler.desired_size(4, 1, 8, backlog=0, load=0), 4)
+        mock_monotonic.return_value = 120.0
+        self.assertEqual(scaler.desired_size(4, 1, 8, backlog=0, load=0), 4)
+        mock_monotonic.return_value = 131.0
+        self.assertEqual(scaler.desired_size(4, 1, 8, backlog=0, load=0), 3)
+        
+        # A busy pool does not shrink, and never below its minimum
+        mock_monotonic.return_value = 200.0
+        self.assertEqual(scaler.desired_size(3, 1, 8, backlog=0, load=3), 3)
+        self.assertEqual(scaler.desired_size(1, 1, 8, backlog=0, load=0), 1)
+
+if __name__ == "__main__":
+    unittest.main()
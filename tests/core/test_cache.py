@@ -0,0 +1,121 @@
+"""
+Tests for the tool result cache in the MCP adapter.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from src.core.cache import ToolResultCache, make_call_key
+from src.core.tools import ToolResult
+
+class TestToolResultCache(unittest.TestCase):
+    """Test the ToolResultCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache = ToolResultCache(
+            cacheable=["read_file", "list_directory"],
+            mutating=["write_file"],
+            default_ttl=10.0
+        )
+        self.result = ToolResult(success=True, data="contents", client_name="filesystem")
+
+    def test_call_key_ignores_argument_order(self):
+        """Test that argument order does not change the key."""
+        self.assertEqual(
+            make_call_key("read_file", {"a": 1, "b": [1, 2]}),
+            make_call_key("read_file", {"b": [1, 2], "a": 1})
+        )
+        self.assertNotEqual(
+            make_call_key("read_file", {"a": 1}),
+            make_call_key("list_directory", {"a": 1})
+        )
+
+    def test_hit_and_miss(self):
+        """Test storing and retrieving a result."""
+        self.assertIsNone(self.cache.get("read_file", {"path": "a"}))
+        self.cache.put("read_file", {"path": "a"}, self.result)
+        
+        cached = self.cache.get("read_file", {"path": "a"})
+        self.assertEqual(cached, self.result)
+        self.assertIsNot(cached, self.result)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_only_cacheable_successes_are_stored(self):
+        """Test that non-cacheable tools and failures are not stored."""
+        self.cache.put("write_file", {"path": "a"}, self.result)
+        self.cache.put("read_file", {"path": "b"}, ToolResult(success=False, data=None, error="boom"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after their TTL, with per-tool overrides."""
+        self.cache.ttl["list_directory"] = 1.0
+        with patch("src.core.cache.time.monotonic", return_value=100.0):
+            self.cache.put("read_file", {"path": "a"}, self.result)
+            self.cache.put("list_directory", {"path": "/"}, self.result)
+        with patch("src.core.cache.time.monotonic", return_value=105.0):
+            self.assertIsNotNone(self.cache.get("read_file", {"path": "a"}))
+            self.assertIsNone(self.cache.get("list_directory", {"path": "/"}))
+        with patch("src.core.cache.time.monotonic", return_value=111.0):
+            self.assertIsNone(self.cache.get("read_file", {"path": "a"}))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        self.cache.max_entries = 2
+        self.cache.put("read_file", {"path": "a"}, self.result)
+        self.cache.put("read_file", {"path": "b"}, self.result)
+        self.cache.get("read_file", {"path": "a"})
+        self.cache.put("read_file", {"path": "c"}, self.result)
+        
+        self.assertIsNotNone(self.cache.get("read_file", {"path": "a"}))
+        self.assertIsNone(self.cache.get("read_file", {"path": "b"}))
+        self.assertIsNotNone(self.cache.get("read_file", {"path": "c"}))
+
+    def test_byte_limit(self):
+        """Test that the approximate byte budget is enforced."""
+        self.cache.max_bytes = 20
+        self.cache.put("read_file", {"path": "a"}, ToolResult(success=True, data="x" * 10))
+        self.cache.put("read_file", {"path": "b"}, ToolResult(success=True, data="y" * 10))
+        self.assertEqual(len(self.cache), 1)
+        self.assertLessEqual(self.cache.total_bytes, 20)
+        
+        # A single oversized result is never stored
+        self.cache.put("read_file", {"path": "c"}, ToolResult(success=True, data="z" * 100))
+        self.assertIsNone(self.cache.get("read_file", {"path": "c"}))
+
+    def test_invalidate_by_client(self):
+        """Test dropping the entries of one client."""
+        self.cache.put("read_file", {"path": "a"}, self.result)
+        self.cache.put("list_directory", {"path": "/"}, ToolResult(success=True, data=[], client_name="other"))
+        self.cache.invalidate("filesystem")
+        self.assertIsNone(self.cache.get("read_file", {"path": "a"}))
+        self.assertIsNotNone(self.cache.get("list_directory", {"path": "/"}))
+        
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.total_bytes, 0)
+
+    def test_put_skips_stale_generation(self):
+        """Test that a result dispatched before an invalidation is not stored."""
+        generation = self.cache.generation("filesystem")
+        self.cache.invalidate("filesystem")
+        self.cache.put("read_file", {"path": "a"}, self.result, generation=generation)
+        self.assertIsNone(self.cache.get("read_file", {"path": "a"}))
+        
+        # Other clients keep their generation
+        other = ToolResult(success=True, data=[], client_name="other")
+        self.cache.put("list_directory", {"path": "/"}, other, generation=self.cache.generation("other"))
+        self.assertIsNotNone(self.cache.get("list_directory", {"path": "/"}))
+        
+        # A full invalidation changes every generation
+        generation = self.cache.generation("other")
+        self.cache.invalidate()
+        self.cache.put("list_directory", {"path": "/"}, other, generation=generation)
+        self.assertIsNone(self.cache.get("list_directory", {"path": "/"}))
+        
+        self.cache.put("read_file", {"path": "a"}, self.result, generation=self.cache.generation("filesystem"))
+        self.assertIsNotNone(self.cache.get("read_file", {"path": "a"}))
+
+if __name__ == "__main__":
+    unittest.main()
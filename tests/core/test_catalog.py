@@ -0,0 +1,105 @@
+"""
+Tests for the tool catalog cache in the MCP adapter.
+"""
+
+import unittest
+import tempfile
+from pathlib import Path
+from mcp import StdioServerParameters
+
+from src.core.catalog import ToolCatalogCache
+from src.core.tools import Tool, MCPTools
+
+class TestToolCatalogCache(unittest.TestCase):
+    """Test the ToolCatalogCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = Path(self.temp_dir.name) / "catalog" / "tools.json"
+        self.cache = ToolCatalogCache(self.cache_path)
+        
+        self.server_params = StdioServerParameters(
+            command="npx",
+            args=["-y", "@modelcontextprotocol/server-filesystem", "/path/to/files"],
+            env={"TOKEN": "secret-value"}
+        )
+        
+        self.tool = Tool(
+            name="read_file",
+            description="Read a file",
+            function_type="object",
+            properties={"path": {"type": "string"}},
+            required=["path"]
+        )
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.temp_dir.cleanup()
+
+    def test_miss(self):
+        """Test that an empty cache returns None."""
+        self.assertIsNone(self.cache.load(self.server_params))
+
+    def test_store_and_load(self):
+        """Test round-tripping tools through the cache file."""
+        self.cache.store(self.server_params, [self.tool], server_version="1.2.3")
+        
+        # A fresh instance reads the same file
+        tools = ToolCatalogCache(self.cache_path).load(self.server_params)
+        self.assertEqual(len(tools), 1)
+        self.assertEqual(tools[0].to_dict(), self.tool.to_dict())
+        self.assertEqual(self.cache.get_entry(self.server_params)["server_version"], "1.2.3")
+
+    def test_env_not_written(self):
+        """Test that server environment values are never persisted."""
+        self.cache.store(self.server_params, [self.tool])
+        self.assertNotIn("secret-value", self.cache_path.read_text())
+
+    def test_key_depends_on_configuration(self):
+        """Test that different arguments or env get separate entries."""
+        other_params = StdioServerParameters(
+            command="npx",
+            args=["-y", "@modelcontextprotocol/server-filesystem", "/other/path"],
+            env={"TOKEN": "secret-value"}
+        )
+        self.cache.store(self.server_params, [self.tool])
+        self.assertIsNone(self.cache.load(other_params))
+        self.assertNotEqual(
+            ToolCatalogCache.key_for(self.server_params),
+            ToolCatalogCache.key_for(other_params)
+        )
+
+    def test_version_mismatch(self):
+        """Test that a snapshot from another server version is rejected."""
+        self.cache.store(self.server_params, [self.tool], server_version="1.0.0")
+        self.assertIsNone(self.cache.load(self.server_params, server_version="2.0.0"))
+        self.assertIsNotNone(self.cache.load(self.server_params, server_version="1.0.0"))
+
+    def test_corrupt_file(self):
+        """Test that an unreadable cache file is treated as a miss."""
+        self.cache_path.parent.mkdir(parents=True)
+        self.cache_path.write_text("{not json")
+        self.assertIsNone(self.cache.load(self.server_params))
+        
+        # Storing replaces the corrupt file
+        self.cache.store(self.server_params, [self.tool])
+        self.assertIsNotNone(self.cache.load(self.server_params))
+
+    def test_invalidate(self):
+        """Test dropping a snapshot."""
+        self.cache.store(self.server_params, [self.tool])
+        self.cache.invalidate(self.server_params)
+        self.assertIsNone(self.cache.load(self.server_params))
+
+    def test_mcp_tools_load_cached(self):
+        """Test loading cached tools into an MCPTools collection."""
+        tools = MCPTools()
+        self.assertFalse(tools.load_cached(self.cache, self.server_params))
+        
+        self.cache.store(self.server_params, [self.tool])
+        self.assertTrue(tools.load_cached(self.cache, self.server_params))
+        self.assertIsNotNone(tools.get_tool("read_file"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,12 +4,14 @@ Tests for the client module in the MCP adapter.
 
 import unittest
 import asyncio
+import anyio
 from unittest.mock import AsyncMock, MagicMock, patch
 from pathlib import Path
+from types import SimpleNamespace
 from mcp import StdioServerParameters
 
 from src.core.client import MCPClient
-from src.core.tools import Tool
+from src.core.tools import Tool, ToolResult
 
 class TestMCPClient(unittest.TestCase):
     """Test the MCPClient class."""
@@ -147,6 +149,391 @@ class TestMCPClient(unittest.TestCase):
         # but this still increases code coverage
         pass
 
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_persistent_session_reused(self, mock_session_class, mock_stdio_client):
+        """Test that a persistent client spawns the server once across calls."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.call_tool.return_value = {"status": "success"}
+        
+        client = MCPClient(self.server_params, client_name="persistent_client", persistent=True)
+        await client.execute_tool("test_tool", {"param1": "a"})
+        await client.execute_tool("test_tool", {"param1": "b"})
+        
+        self.assertTrue(client.connected)
+        mock_stdio_client.assert_called_once_with(self.server_params)
+        mock_session.initialize.assert_called_once()
+        self.assertEqual(mock_session.call_tool.call_count, 2)
+        
+        # Closing tears down the transport and session
+        await client.close()
+        self.assertFalse(client.connected)
+        mock_stdio_client.return_value.__aexit__.assert_called_once()
+        mock_session_class.return_value.__aexit__.assert_called_once()
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_server_version(self, mock_session_class, mock_stdio_client):
+        """Test reading the server version from either initialize field name."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.call_tool.return_value = {"status": "success"}
+        
+        # Current SDKs name the field server_info, older ones serverInfo
+        for field in ("server_info", "serverInfo"):
+            mock_session.initialize.return_value = SimpleNamespace(**{field: SimpleNamespace(version="1.2.3")})
+            for persistent in (True, False):
+                client = MCPClient(self.server_params, client_name="versioned_client", persistent=persistent)
+                await client.execute_tool("test_tool", {"param1": "a"})
+                self.assertEqual(client.server_version, "1.2.3")
+                await client.close()
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_persistent_session_startup_failure(self, mock_session_class, mock_stdio_client):
+        """Test that a failed handshake surfaces the error and leaves the client disconnected."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.initialize.side_effect = RuntimeError("handshake failed")
+        
+        client = MCPClient(self.server_params, client_name="persistent_client", persistent=True)
+        with self.assertRaises(RuntimeError):
+            await client.connect()
+        self.assertFalse(client.connected)
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_connect_cancelled(self, mock_session_class, mock_stdio_client):
+        """Test that cancelling a connect during startup shuts the server down."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        
+        async def slow_initialize():
+            await asyncio.sleep(10)
+        
+        mock_session.initialize.side_effect = slow_initialize
+        
+        client = MCPClient(self.server_params, client_name="persistent_client", persistent=True)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.connect(), timeout=0.05)
+        
+        # The transport was exited and no session task is left running
+        mock_stdio_client.return_value.__aexit__.assert_called_once()
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        self.assertEqual(pending, [])
+        self.assertFalse(client.connected)
+        await client.close()
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_max_in_flight(self, mock_session_class, mock_stdio_client):
+        """Test that concurrent calls share one session and queue beyond the limit."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        
+        release = asyncio.Event()
+        
+        async def slow_call(tool_name, tool_args):
+            await release.wait()
+            return tool_args["param1"]
+        
+        mock_session.call_tool.side_effect = slow_call
+        
+        client = MCPClient(
+            self.server_params,
+            client_name="multiplexed_client",
+            persistent=True,
+            max_in_flight=2
+        )
+        tasks = [
+            asyncio.create_task(client.execute_tool("test_tool", {"param1": i}))
+            for i in range(5)
+        ]
+        for _ in range(10):
+            await asyncio.sleep(0)
+        
+        self.assertEqual(client.in_flight, 2)
+        self.assertEqual(client.queued, 3)
+        self.assertEqual(client.load, 5)
+        
+        release.set()
+        results = await asyncio.gather(*tasks)
+        
+        # Results come back per caller, over a single server session
+        self.assertEqual(results, [0, 1, 2, 3, 4])
+        self.assertEqual(client.load, 0)
+        mock_stdio_client.assert_called_once_with(self.server_params)
+        mock_session.initialize.assert_called_once()
+        await client.close()
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_execute_many(self, mock_session_class, mock_stdio_client):
+        """Test executing a batch of tools over one session."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        
+        async def call_tool(tool_name, tool_args):
+            if tool_name == "broken_tool":
+                raise RuntimeError("tool failed")
+            return tool_args["param1"]
+        
+        mock_session.call_tool.side_effect = call_tool
+        
+        results = await self.client.execute_many([
+            ("test_tool", {"param1": "a"}),
+            ("broken_tool", {"param1": "b"}),
+            ("test_tool", {"param1": "c"}),
+        ])
+        
+        # One spawn and handshake for the whole batch
+        mock_stdio_client.assert_called_once_with(self.server_params)
+        mock_session.initialize.assert_called_once()
+        self.assertEqual(mock_session.call_tool.call_count, 3)
+        
+        # Results keep the call order and isolate failures
+        self.assertEqual([r.success for r in results], [True, False, True])
+        self.assertEqual(results[0].data, "a")
+        self.assertEqual(results[2].data, "c")
+        self.assertIn("tool failed", results[1].error)
+        self.assertEqual(results[0].client_name, "test_client")
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_execute_many_dispatch(self, mock_session_class, mock_stdio_client):
+        """Test that a dispatch hook decides when and whether each batch call is sent."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.call_tool.side_effect = lambda tool_name, tool_args: tool_args["param1"]
+        dispatched = []
+        
+        async def dispatch(tool_name, send):
+            dispatched.append(tool_name)
+            if tool_name == "held_tool":
+                return ToolResult(success=False, data=None, error="held back", timed_out=True)
+            return await send()
+        
+        client = MCPClient(self.server_params, client_name="test_client",
+                           persistent=True, recycle_on_timeout=True)
+        results = await client.execute_many([
+            ("test_tool", {"param1": "a"}),
+            ("held_tool", {"param1": "b"}),
+        ], dispatch=dispatch)
+        
+        self.assertEqual(dispatched, ["test_tool", "held_tool"])
+        self.assertEqual(results[0].data, "a")
+        self.assertEqual(results[1].error, "held back")
+        mock_session.call_tool.assert_called_once_with("test_tool", {"param1": "a"})
+        # A call the hook never sent does not recycle the session
+        self.assertTrue(client.connected)
+        await client.close()
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_execute_tool_timeout(self, mock_session_class, mock_stdio_client):
+        """Test that a hung call times out and recycles the persistent session."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        
+        async def call_tool(tool_name, tool_args):
+            if tool_name == "hung_tool":
+                await asyncio.sleep(10)
+            return "done"
+        
+        mock_session.call_tool.side_effect = call_tool
+        
+        client = MCPClient(
+            self.server_params,
+            client_name="timeout_client",
+            persistent=True,
+            tool_timeouts={"hung_tool": 0.05},
+            recycle_on_timeout=True
+        )
+        self.assertEqual(await client.execute_tool("fast_tool", {}), "done")
+        self.assertTrue(client.connected)
+        
+        with self.assertRaises(asyncio.TimeoutError):
+            await client.execute_tool("hung_tool", {})
+        self.assertFalse(client.connected)
+        self.assertEqual(client.load, 0)
+        
+        # An explicit timeout overrides the configured ones
+        with self.assertRaises(asyncio.TimeoutError):
+            await client.execute_tool("fast_tool", {}, timeout=0)
+        
+        # The batch API reports timeouts per call
+        results = await client.execute_many([("hung_tool", {}), ("fast_tool", {})])
+        self.assertTrue(results[0].timed_out)
+        self.assertFalse(results[0].success)
+        self.assertTrue(results[1].success)
+        await client.close()
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_respawn_after_crash(self, mock_session_class, mock_stdio_client):
+        """Test that a call retries on a respawned server when the process dies."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.call_tool.side_effect = [anyio.ClosedResourceError(), "ok"]
+        
+        client = MCPClient(self.server_params, client_name="crash_client", persistent=True)
+        self.assertEqual(await client.execute_tool("test_tool", {}), "ok")
+        self.assertEqual(client.restarts, 1)
+        self.assertTrue(client.connected)
+        self.assertEqual(mock_stdio_client.call_count, 2)
+        
+        # Application errors do not respawn the server
+        mock_session.call_tool.side_effect = ValueError("bad arguments")
+        with self.assertRaises(ValueError):
+            await client.execute_tool("test_tool", {})
+        self.assertEqual(client.restarts, 1)
+        
+        # Mutating tools are not re-sent by default, but the session is still replaced
+        mock_session.call_tool.side_effect = [anyio.ClosedResourceError(), "ok"]
+        with self.assertRaises(anyio.ClosedResourceError):
+            await client.execute_tool("write_file", {})
+        self.assertEqual(client.restarts, 2)
+        self.assertEqual(await client.execute_tool("write_file", {}), "ok")
+        
+        # Opting in retries mutating tools too
+        client.retry_on_crash = True
+        mock_session.call_tool.side_effect = [anyio.ClosedResourceError(), "ok"]
+        self.assertEqual(await client.execute_tool("write_file", {}), "ok")
+        self.assertEqual(client.restarts, 3)
+        
+        # Without retries the crash is surfaced for every tool
+        client.retry_on_crash = False
+        mock_session.call_tool.side_effect = [anyio.ClosedResourceError(), "ok"]
+        with self.assertRaises(anyio.ClosedResourceError):
+            await client.execute_tool("test_tool", {})
+        self.assertEqual(client.restarts, 4)
+        self.assertEqual(await client.execute_tool("test_tool", {}), "ok")
+        await client.close()
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_warm_standby_promoted(self, mock_session_class, mock_stdio_client):
+        """Test that a warm standby takes over without a cold start."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.call_tool.return_value = "ok"
+        
+        client = MCPClient(self.server_params, client_name="standby_client", persistent=True, warm_standby=True)
+        await client.connect()
+        await asyncio.sleep(0.01)
+        self.assertIsNotNone(client._standby)
+        self.assertEqual(mock_stdio_client.call_count, 2)
+        standby = client._standby
+        
+        mock_session.call_tool.side_effect = [ConnectionError("connection closed"), "ok"]
+        self.assertEqual(await client.execute_tool("test_tool", {}), "ok")
+        self.assertIs(client._current_session, standby)
+        
+        # A fresh standby is started behind the promoted one
+        await asyncio.sleep(0.01)
+        self.assertIsNotNone(client._standby)
+        self.assertIsNot(client._standby, standby)
+        self.assertEqual(mock_stdio_client.call_count, 3)
+        await client.close()
+        self.assertIsNone(client._standby)
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_health_check_respawns(self, mock_session_class, mock_stdio_client):
+        """Test that a failed ping respawns the server and revalidates its tools."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_tools = MagicMock()
+        mock_tools.tools = [self.tool_data]
+        mock_session.list_tools.return_value = mock_tools
+        mock_session.send_ping.side_effect = [RuntimeError("no pong")] + [None] * 100
+        
+        client = MCPClient(
+            self.server_params,
+            client_name="watched_client",
+            persistent=True,
+            health_check_interval=0.01
+        )
+        await client.get_tools()
+        self.assertFalse(client.tools_changed)
+        await asyncio.sleep(0.05)
+        self.assertEqual(client.restarts, 1)
+        self.assertTrue(client.connected)
+        self.assertFalse(client.tools_changed)
+        await client.close()
+        self.assertIsNone(client._watchdog)
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_recycle_after_max_calls(self, mock_session_class, mock_stdio_client):
+        """Test that a session is replaced after max_calls, letting running calls finish."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        
+        release = asyncio.Event()
+        
+        async def call_tool(tool_name, tool_args):
+            if tool_name == "slow_tool":
+                await release.wait()
+            return tool_name
+        
+        mock_session.call_tool.side_effect = call_tool
+        
+        client = MCPClient(self.server_params, client_name="recycled_client", persistent=True, max_calls=2)
+        await client.execute_tool("fast_tool", {})
+        slow = asyncio.create_task(client.execute_tool("slow_tool", {}))
+        await asyncio.sleep(0.01)
+        old = client._current_session
+        
+        # The third call starts a new process; the old one drains first
+        self.assertEqual(await client.execute_tool("fast_tool", {}), "fast_tool")
+        self.assertIsNot(client._current_session, old)
+        self.assertEqual(mock_stdio_client.call_count, 2)
+        self.assertTrue(old.alive)
+        
+        release.set()
+        self.assertEqual(await slow, "slow_tool")
+        await asyncio.sleep(0.01)
+        self.assertFalse(old.alive)
+        await client.close()
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_idle_timeout(self, mock_session_class, mock_stdio_client):
+        """Test that an idle persistent session is closed and reopened on demand."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        mock_session.call_tool.return_value = "ok"
+        
+        client = MCPClient(self.server_params, client_name="idle_client", persistent=True, idle_timeout=0.03)
+        await client.execute_tool("test_tool", {})
+        self.assertTrue(client.connected)
+        await asyncio.sleep(0.1)
+        self.assertFalse(client.connected)
+        
+        self.assertEqual(await client.execute_tool("test_tool", {}), "ok")
+        self.assertEqual(mock_stdio_client.call_count, 2)
+        await client.close()
+
+    def test_invalid_max_in_flight(self):
+        """Test that the in-flight limit must be positive."""
+        with self.assertRaises(ValueError):
+            MCPClient(self.server_params, max_in_flight=0)
+
     def test_convert_to_tool(self):
         """Test converting tool data to Tool object."""
         # Call _convert_to_tool
@@ -199,5 +586,109 @@ class TestMCPClient(unittest.TestCase):
         finally:
             loop.close()
 
+    def test_persistent_session_reused(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_persistent_session_reused())
+        finally:
+            loop.close()
+
+    def test_server_version(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_server_version())
+        finally:
+            loop.close()
+
+    def test_persistent_session_startup_failure(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_persistent_session_startup_failure())
+        finally:
+            loop.close()
+
+    def test_connect_cancelled(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_connect_cancelled())
+        finally:
+            loop.close()
+            
+    def test_max_in_flight(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_max_in_flight())
+        finally:
+            loop.close()
+
+    def test_execute_many(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_execute_many())
+        finally:
+            loop.close()
+
+    def test_execute_many_dispatch(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_execute_many_dispatch())
+        finally:
+            loop.close()
+
+    def test_execute_tool_timeout(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_execute_tool_timeout())
+        finally:
+            loop.close()
+
+    def test_respawn_after_crash(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_respawn_after_crash())
+        finally:
+            loop.close()
+
+    def test_warm_standby_promoted(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_warm_standby_promoted())
+        finally:
+            loop.close()
+
+    def test_health_check_respawns(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_health_check_respawns())
+        finally:
+            loop.close()
+
+    def test_recycle_after_max_calls(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_recycle_after_max_calls())
+        finally:
+            loop.close()
+
+    def test_idle_timeout(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_idle_timeout())
+        finally:
+            loop.close()
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
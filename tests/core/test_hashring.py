@@ -0,0 +1,55 @@
+"""
+Tests for the consistent hash ring in the MCP adapter.
+"""
+
+import unittest
+
+from src.core.hashring import ConsistentHashRing
+
+class TestConsistentHashRing(unittest.TestCase):
+    """Test the ConsistentHashRing class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.ring = ConsistentHashRing(["a", "b", "c"])
+        self.keys = [f"conversation-{i}" for i in range(600)]
+
+    def test_invalid_vnodes(self):
+        """Test that each node needs at least one point on the ring."""
+        with self.assertRaises(ValueError):
+            ConsistentHashRing(vnodes=0)
+
+    def test_empty_ring(self):
+        """Test that an empty ring owns no keys."""
+        self.assertIsNone(ConsistentHashRing().get("key"))
+
+    def test_stable_and_balanced(self):
+        """Test that keys map consistently and spread over every node."""
+        owners = [self.ring.get(key) for key in self.keys]
+        self.assertEqual(owners, [self.ring.get(key) for key in self.keys])
+        for node in ["a", "b", "c"]:
+            self.assertGreater(owners.count(node), 100)
+
+    def test_adding_node_moves_few_keys(self):
+        """Test that a new node only takes keys, never reshuffles the others."""
+        before = {key: self.ring.get(key) for key in self.keys}
+        self.ring.add("d")
+        self.assertEqual(len(self.ring), 4)
+        self.assertIn("d", self.ring)
+        moved = [key for key in self.keys if self.ring.get(key) != before[key]]
+        self.assertTrue(all(self.ring.get(key) == "d" for key in moved))
+        self.assertLess(len(moved), len(self.keys) / 2)
+
+    def test_removing_node_moves_only_its_keys(self):
+        """Test that removing a node only remaps the keys it owned."""
+        before = {key: self.ring.get(key) for key in self.keys}
+        self.ring.remove("b")
+        self.assertNotIn("b", self.ring)
+        for key in self.keys:
+            if before[key] != "b":
+                self.assertEqual(self.ring.get(key), before[key])
+            else:
+                self.assertIn(self.ring.get(key), ["a", "c"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Tests for server health tracking in the MCP adapter.
+"""
+
+import unittest
+import asyncio
+from unittest.mock import patch
+
+from src.core.health import (
+    LatencyTracker, CircuitBreaker, AdaptiveConcurrencyLimiter, ServerHealth
+)
+
+class TestLatencyTracker(unittest.TestCase):
+    """Test the LatencyTracker class."""
+
+    def test_percentiles_and_error_rate(self):
+        """Test percentile and error rate over the window."""
+        tracker = LatencyTracker(window=10)
+        self.assertIsNone(tracker.percentile(95))
+        for i in range(1, 11):
+            tracker.record(i / 10, success=i % 5 != 0)
+        self.assertEqual(tracker.percentile(50), 0.5)
+        self.assertEqual(tracker.percentile(100), 1.0)
+        self.assertAlmostEqual(tracker.error_rate, 0.2)
+        
+        # Old samples fall out of the window
+        tracker.record(5.0)
+        self.assertEqual(tracker.count, 10)
+        self.assertEqual(tracker.percentile(100), 5.0)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test the CircuitBreaker class."""
+
+    def test_opens_after_threshold_and_recovers(self):
+        """Test the closed, open and half-open transitions."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0)
+        with patch("src.core.health.time.monotonic", return_value=100.0):
+            breaker.record_failure()
+            self.assertTrue(breaker.allow_request())
+            breaker.record_failure()
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+            self.assertFalse(breaker.allow_request())
+        
+        with patch("src.core.health.time.monotonic", return_value=111.0):
+            # Only a single probe is let through
+            self.assertTrue(breaker.allow_request())
+            self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+            self.assertFalse(breaker.allow_request())
+            
+            # A failed probe re-opens the circuit
+            breaker.record_failure()
+            self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        
+        with patch("src.core.health.time.monotonic", return_value=122.0):
+            self.assertTrue(breaker.allow_request())
+            breaker.record_success()
+            self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+            self.assertTrue(breaker.allow_request())
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+    """Test the AdaptiveConcurrencyLimiter class."""
+
+    async def async_test_aimd(self):
+        """Test additive increase, multiplicative decrease and waiting."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, min_limit=1, max_limit=4, target_latency=1.0)
+        
+        await limiter.acquire()
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+        
+        # Fast successes grow the limit by about one slot per round
+        await limiter.release(0.1, True)
+        await limiter.release(0.1, True)
+        await waiter
+        await limiter.release(0.1, True)
+        self.assertEqual(limiter.limit, 3)
+        
+        # A slow call halves it
+        await limiter.acquire()
+        await limiter.release(5.0, True)
+        self.assertEqual(limiter.limit, 1)
+        
+        # Failures never drop below the minimum
+        await limiter.acquire()
+        await limiter.release(0.1, False)
+        self.assertEqual(limiter.limit, 1)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_aimd(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_aimd())
+        finally:
+            loop.close()
+
+
+class TestServerHealth(unittest.TestCase):
+    """Test the ServerHealth class."""
+
+    async def async_test_record(self):
+        """Test that outcomes feed the breaker, tracker and limiter."""
+        health = ServerHealth(failure_threshold=1, initial_limit=2)
+        await health.limiter.acquire()
+        await health.record(0.2, False)
+        self.assertEqual(health.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(health.latency.error_rate, 1.0)
+        self.assertEqual(health.limiter.limit, 1)
+
+    def test_record(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_record())
+        finally:
+            loop.close()
+
+if __name__ == "__main__":
+    unittest.main()
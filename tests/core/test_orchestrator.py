@@ -4,10 +4,17 @@ Tests for the orchestrator module in the MCP adapter.
 
 import unittest
 import asyncio
-from unittest.mock import Mock, AsyncMock, patch
+import tempfile
+from pathlib import Path
+from unittest.mock import ANY, Mock, AsyncMock, patch
 from src.core.orchestrator import ToolOrchestrator
-from src.core.tools import Tool, MCPTools
+from src.core.tools import Tool, MCPTools, ToolCall, ToolResult
 from src.core.client import MCPClient
+from src.core.pool import MCPClientPool
+from src.core.catalog import ToolCatalogCache
+from src.core.cache import ToolResultCache
+from src.core.scheduler import FairScheduler
+from src.core.plan import PlanStep
 from mcp import StdioServerParameters
 
 class TestToolOrchestrator(unittest.TestCase):
@@ -17,10 +24,14 @@ class TestToolOrchestrator(unittest.TestCase):
         """Set up test fixtures."""
         # Create mock server parameters
         self.server_params1 = Mock(spec=StdioServerParameters)
+        self.server_params1.command = "npx"
         self.server_params1.args = ["npx", "server-filesystem", "/path/to/files"]
+        self.server_params1.env = None
         
         self.server_params2 = Mock(spec=StdioServerParameters)
+        self.server_params2.command = "npx"
         self.server_params2.args = ["npx", "server-memory", "/path/to/memory"]
+        self.server_params2.env = None
         
         # Create mock clients for tool execution testing
         self.client1 = MCPClient(self.server_params1, client_name="filesystem")
@@ -64,11 +75,14 @@ class TestToolOrchestrator(unittest.TestCase):
         self.client2.get_tools.return_value = [self.tool2]
         
         # Set up orchestrator with mock server parameters
-        self.orchestrator = ToolOrchestrator([self.server_params1, self.server_params2])
+        self.log_dir = tempfile.TemporaryDirectory()
+        self.orchestrator = ToolOrchestrator([self.server_params1, self.server_params2],
+                                             log_dir=Path(self.log_dir.name))
     
     def tearDown(self):
         """Clean up after tests."""
         self.patcher.stop()
+        self.log_dir.cleanup()
 
     async def asyncSetUp(self):
         """Set up async fixtures."""
@@ -113,6 +127,157 @@ class TestToolOrchestrator(unittest.TestCase):
         finally:
             loop.close()
 
+    def test_initialize_concurrently(self):
+        """Test that servers start concurrently and failures are isolated."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        try:
+            started = []
+            
+            async def filesystem_tools():
+                started.append("filesystem")
+                # Both servers must be starting before either finishes
+                while len(started) < 2:
+                    await asyncio.sleep(0)
+                return [self.tool1]
+            
+            async def memory_tools():
+                started.append("memory")
+                raise RuntimeError("server crashed")
+            
+            self.client1.get_tools.side_effect = filesystem_tools
+            self.client2.get_tools.side_effect = memory_tools
+            
+            loop.run_until_complete(asyncio.wait_for(self.orchestrator.initialize(), timeout=1))
+            
+            self.assertIn("tool1", self.orchestrator.tools.tools)
+            self.assertNotIn("tool2", self.orchestrator.tools.tools)
+            self.assertEqual(self.orchestrator.tool_to_client["tool1"], "filesystem")
+            self.assertIn("memory", self.orchestrator.failed_clients)
+            self.assertIn("server crashed", self.orchestrator.failed_clients["memory"])
+        finally:
+            loop.close()
+
+    def test_initialize_startup_timeout(self):
+        """Test that a server exceeding the startup timeout is skipped."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        try:
+            async def hang():
+                await asyncio.sleep(10)
+            
+            self.client2.get_tools.side_effect = hang
+            self.orchestrator.startup_timeout = 0.05
+            
+            loop.run_until_complete(self.orchestrator.initialize())
+            
+            self.assertIn("tool1", self.orchestrator.tools.tools)
+            self.assertNotIn("tool2", self.orchestrator.tools.tools)
+            self.assertIn("timed out", self.orchestrator.failed_clients["memory"])
+        finally:
+            loop.close()
+
+    def test_initialize_from_catalog_cache(self):
+        """Test warm start from a cached catalog with background revalidation."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ToolCatalogCache(Path(temp_dir) / "tools.json")
+            stale_tool = Tool(
+                name="old_tool",
+                description="Removed from the server",
+                function_type="object",
+                properties={"param1": {"type": "string"}},
+                required=[]
+            )
+            cache.store(self.server_params1, [stale_tool])
+            self.orchestrator.catalog_cache = cache
+            
+            try:
+                # The filesystem server is served from the snapshot without waiting on it
+                release = asyncio.Event()
+                
+                async def filesystem_tools():
+                    await release.wait()
+                    return [self.tool1]
+                
+                self.client1.get_tools.side_effect = filesystem_tools
+                loop.run_until_complete(self.orchestrator.initialize())
+                self.assertEqual(self.orchestrator.tool_to_client["old_tool"], "filesystem")
+                self.assertEqual(self.orchestrator.tool_to_client["tool2"], "memory")
+                
+                # Once revalidation completes, the catalog is refreshed in memory and on disk
+                release.set()
+                loop.run_until_complete(
+                    asyncio.gather(*self.orchestrator._background_tasks)
+                )
+                self.assertNotIn("old_tool", self.orchestrator.tool_to_client)
+                self.assertEqual(self.orchestrator.tool_to_client["tool1"], "filesystem")
+                self.assertEqual([t.name for t in cache.load(self.server_params1)], ["tool1"])
+                self.assertEqual([t.name for t in cache.load(self.server_params2)], ["tool2"])
+            finally:
+                loop.close()
+
+    def test_lazy_start_with_configured_catalog(self):
+        """Test that servers with a known catalog are not contacted until used."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        try:
+            self.orchestrator.lazy = True
+            self.orchestrator.tool_catalogs = {"filesystem": [self.tool1]}
+            self.client1.execute_tool.return_value = {"status": "success"}
+            
+            loop.run_until_complete(self.orchestrator.initialize())
+            
+            # Known catalog is routed without spawning the server
+            self.client1.get_tools.assert_not_called()
+            self.client2.get_tools.assert_called_once()
+            self.assertEqual(self.orchestrator.tool_to_client["tool1"], "filesystem")
+            
+            result = loop.run_until_complete(
+                self.orchestrator.execute("tool1", {"param1": "test"})
+            )
+            self.assertTrue(result.success)
+            self.client1.execute_tool.assert_called_once_with("tool1", {"param1": "test"})
+            
+            # Configured catalogs are trusted, so first use does not list tools
+            self.client1.get_tools.assert_not_called()
+        finally:
+            loop.close()
+
+    def test_lazy_start_revalidates_cache_on_first_use(self):
+        """Test that a lazily started server revalidates its cached catalog once."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ToolCatalogCache(Path(temp_dir) / "tools.json")
+            cache.store(self.server_params1, [self.tool1])
+            cache.store(self.server_params2, [self.tool2])
+            self.orchestrator.catalog_cache = cache
+            self.orchestrator.lazy = True
+            
+            try:
+                loop.run_until_complete(self.orchestrator.initialize())
+                self.client1.get_tools.assert_not_called()
+                self.client2.get_tools.assert_not_called()
+                
+                loop.run_until_complete(self.orchestrator.execute("tool1", {"param1": "a"}))
+                loop.run_until_complete(self.orchestrator.execute("tool1", {"param1": "b"}))
+                loop.run_until_complete(
+                    asyncio.gather(*self.orchestrator._background_tasks)
+                )
+                
+                # Only the server that was used is started
+                self.client1.get_tools.assert_called_once()
+                self.client2.get_tools.assert_not_called()
+            finally:
+                loop.close()
+
     def test_execute(self):
         """Test the execute method."""
         # Create event loop
@@ -138,6 +303,286 @@ class TestToolOrchestrator(unittest.TestCase):
         finally:
             loop.close()
 
+    def test_execute_with_result_cache(self):
+        """Test that repeated idempotent calls are served from the cache."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        try:
+            self.orchestrator.result_cache = ToolResultCache(cacheable=["tool1"], mutating=["tool3"])
+            self.orchestrator.tool_catalogs = {"filesystem": [
+                self.tool1,
+                Tool(name="tool3", description="Mutating tool", function_type="object",
+                     properties={"param1": {"type": "string"}}, required=[])
+            ]}
+            self.client1.execute_tool.return_value = {"status": "success"}
+            loop.run_until_complete(self.orchestrator.initialize())
+            
+            first = loop.run_until_complete(self.orchestrator.execute("tool1", {"param1": "a"}))
+            second = loop.run_until_complete(self.orchestrator.execute("tool1", {"param1": "a"}))
+            self.assertEqual(first, second)
+            self.assertEqual(self.client1.execute_tool.call_count, 1)
+            
+            # A mutating call on the same client invalidates the cached read
+            loop.run_until_complete(self.orchestrator.execute("tool3", {}))
+            loop.run_until_complete(self.orchestrator.execute("tool1", {"param1": "a"}))
+            self.assertEqual(self.client1.execute_tool.call_count, 3)
+        finally:
+            loop.close()
+
+    def test_result_cache_skips_reads_overlapping_writes(self):
+        """Test that a read which overlaps a write to the same client is not cached."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        try:
+            self.orchestrator.result_cache = ToolResultCache(cacheable=["tool1"], mutating=["tool3"])
+            self.orchestrator.tool_catalogs = {"filesystem": [
+                self.tool1,
+                Tool(name="tool3", description="Mutating tool", function_type="object",
+                     properties={"param1": {"type": "string"}}, required=[])
+            ]}
+            store = {"value": "old"}
+            read_started = asyncio.Event()
+            release_read = asyncio.Event()
+            
+            async def execute_tool(tool_name, args):
+                if tool_name == "tool3":
+                    store["value"] = args["param1"]
+                    return "written"
+                value = store["value"]
+                if not read_started.is_set():
+                    read_started.set()
+                    await release_read.wait()
+                return value
+            
+            self.client1.execute_tool.side_effect = execute_tool
+            loop.run_until_complete(self.orchestrator.initialize())
+            
+            async def run():
+                # A slow read starts, a write lands, then the read completes
+                slow_read = asyncio.create_task(self.orchestrator.execute("tool1", {"param1": "a"}))
+                await read_started.wait()
+                await self.orchestrator.execute("tool3", {"param1": "new"})
+                release_read.set()
+                first = await slow_read
+                second = await self.orchestrator.execute("tool1", {"param1": "a"})
+                return first, second
+            
+            first, second = loop.run_until_complete(run())
+            self.assertEqual(first.data, "old")
+            self.assertEqual(second.data, "new")
+            self.assertEqual(self.client1.execute_tool.call_count, 3)
+        finally:
+            loop.close()
+
+    def test_execute_coalesces_identical_calls(self):
+        """Test that identical concurrent calls share one server request."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        try:
+            self.orchestrator.coalesce = True
+            release = asyncio.Event()
+            
+            async def slow_execute(tool_name, args):
+                await release.wait()
+                return {"args": args}
+            
+            self.client1.execute_tool.side_effect = slow_execute
+            loop.run_until_complete(self.orchestrator.initialize())
+            
+            async def run():
+                tasks = [
+                    asyncio.create_task(self.orchestrator.execute("tool1", {"param1": "same"}))
+                    for _ in range(3)
+                ]
+                tasks.append(asyncio.create_task(self.orchestrator.execute("tool1", {"param1": "other"})))
+                await asyncio.sleep(0)
+                release.set()
+                return await asyncio.gather(*tasks)
+            
+            results = loop.run_until_complete(run())
+            self.assertTrue(all(result.success for result in results))
+            self.assertIs(results[0], results[1])
+            self.assertEqual(results[3].data, {"args": {"param1": "other"}})
+            self.assertEqual(self.client1.execute_tool.call_count, 2)
+        finally:
+            loop.close()
+
+    def test_coalesced_calls_keep_own_deadlines(self):
+        """Test that callers joining a shared call are bound by their own deadline."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        try:
+            self.orchestrator.coalesce = True
+            
+            async def slow_execute(tool_name, args, timeout=None):
+                await asyncio.wait_for(asyncio.sleep(0.2), timeout)
+                return "done"
+            
+            self.client1.execute_tool.side_effect = slow_execute
+            loop.run_until_complete(self.orchestrator.initialize())
+            
+            async def run(args, first_timeout, second_timeout):
+                first = asyncio.ensure_future(self.orchestrator.execute("tool1", args, timeout=first_timeout))
+                # Let the first call start the shared flight
+                await asyncio.sleep(0.01)
+                started = loop.time()
+                second = await self.orchestrator.execute("tool1", args, timeout=second_timeout)
+                elapsed = loop.time() - started
+                return await first, second, elapsed
+            
+            # A short deadline joining an unbounded flight still times out on time
+            first, second, elapsed = loop.run_until_complete(run({"param1": "a"}, None, 0.05))
+            self.assertTrue(first.success)
+            self.assertTrue(second.timed_out)
+            self.assertLess(elapsed, 0.15)
+            self.assertEqual(self.client1.execute_tool.call_count, 1)
+            
+            # An unbounded caller does not inherit the first caller's timeout
+            first, second, _ = loop.run_until_complete(run({"param1": "b"}, 0.05, None))
+            self.assertTrue(first.timed_out)
+            self.assertTrue(second.success)
+            self.assertEqual(second.data, "done")
+            self.assertEqual(self.client1.execute_tool.call_count, 3)
+        finally:
+            loop.close()
+
+    def test_execute_timeout(self):
+        """Test that a call missing its deadline reports a timeout."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        try:
+            self.client1.execute_tool.side_effect = asyncio.TimeoutError()
+            loop.run_until_complete(self.orchestrator.initialize())
+            
+            result = loop.run_until_complete(
+                self.orchestrator.execute("tool1", {"param1": "test"}, timeout=2.0)
+            )
+            
+            # The remaining time is handed to the client
+            _, kwargs = self.client1.execute_tool.call_args
+            self.assertGreater(kwargs["timeout"], 0)
+            self.assertLessEqual(kwargs["timeout"], 2.0)
+            
+            self.assertFalse(result.success)
+            self.assertTrue(result.timed_out)
+            self.assertIn("timed out", result.error)
+        finally:
+            loop.close()
+
+    def test_execute_circuit_breaker(self):
+        """Test that a failing server is cut off after repeated failures."""
+        self.mock_client_constructor.side_effect = [self.client1, self.client2]
+        orchestrator = ToolOrchestrator(
+            [self.server_params1, self.server_params2],
+            log_dir=Path(self.log_dir.name),
+            health={"failure_threshold": 2, "reset_timeout": 60.0}
+        )
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        try:
+            self.client1.execute_tool.side_effect = RuntimeError("server down")
+            loop.run_until_complete(orchestrator.initialize())
+            
+            for _ in range(2):
+                result = loop.run_until_complete(orchestrator.execute("tool1", {"param1": "x"}))
+                self.assertIn("server down", result.error)
+            
+            result = loop.run_until_complete(orchestrator.execute("tool1", {"param1": "x"}))
+            self.assertFalse(result.success)
+            self.assertIn("Circuit open", result.error)
+            self.assertEqual(self.client1.execute_tool.call_count, 2)
+            
+            # Other servers are unaffected
+            self.client2.execute_tool.return_value = {"status": "success"}
+            result = loop.run_until_complete(orchestrator.execute("tool2", {"param2": 1}))
+            self.assertTrue(result.success)
+            self.assertEqual(orchestrator.health["memory"].latency.count, 1)
+        finally:
+            loop.close()
+
+    def test_execute_many_circuit_breaker(self):
+        """Test that batch calls count towards and respect a server's circuit breaker."""
+        self.mock_client_constructor.side_effect = [self.client1, self.client2]
+        orchestrator = ToolOrchestrator(
+            [self.server_params1, self.server_params2],
+            log_dir=Path(self.log_dir.name),
+            health={"failure_threshold": 2, "reset_timeout": 60.0}
+        )
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        sent = []
+        
+        async def execute_many(calls, dispatch):
+            async def send():
+                sent.append(True)
+                return ToolResult(success=False, data=None, error="server down")
+            return await asyncio.gather(*(dispatch(tool_name, send) for tool_name, _ in calls))
+        
+        try:
+            self.client1.execute_many = execute_many
+            loop.run_until_complete(orchestrator.initialize())
+            batch = [("tool1", {"param1": "a"}), ("tool1", {"param1": "b"})]
+            
+            results = loop.run_until_complete(orchestrator.execute_many(batch))
+            self.assertEqual([r.error for r in results], ["server down", "server down"])
+            health = orchestrator.health["filesystem"]
+            self.assertEqual(health.latency.count, 2)
+            self.assertEqual(health.limiter.in_flight, 0)
+            
+            # The open circuit rejects the next batch's calls without sending them
+            results = loop.run_until_complete(orchestrator.execute_many(batch))
+            self.assertTrue(all("Circuit open" in r.error for r in results))
+            self.assertEqual(len(sent), 2)
+        finally:
+            loop.close()
+
+    def test_execute_many_concurrency_limited_per_call(self):
+        """Test that each batch call holds its own limiter slot and records its own latency."""
+        self.mock_client_constructor.side_effect = [self.client1, self.client2]
+        orchestrator = ToolOrchestrator(
+            [self.server_params1, self.server_params2],
+            log_dir=Path(self.log_dir.name),
+            health={"initial_limit": 2, "max_limit": 2}
+        )
+        running = []
+        peak = []
+        
+        async def execute_many(calls, dispatch):
+            async def send():
+                running.append(True)
+                peak.append(len(running))
+                await asyncio.sleep(0.02)
+                running.pop()
+                return ToolResult(success=True, data="ok")
+            return await asyncio.gather(*(dispatch(tool_name, send) for tool_name, _ in calls))
+        
+        self.client1.execute_many = execute_many
+        batch = [("tool1", {"param1": str(n)}) for n in range(6)]
+        
+        async def run():
+            await orchestrator.initialize()
+            return await orchestrator.execute_many(batch)
+        
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            results = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertTrue(all(result.success for result in results))
+        health = orchestrator.health["filesystem"]
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual(health.limiter.in_flight, 0)
+        # Latencies are per call, not the whole batch's duration
+        self.assertEqual(health.latency.count, 6)
+        self.assertLess(health.latency.percentile(100), 0.05)
+
     def test_execute_unknown_tool(self):
         """Test executing an unknown tool."""
         # Create event loop
@@ -185,6 +630,46 @@ class TestToolOrchestrator(unittest.TestCase):
         finally:
             loop.close()
 
+    def test_execute_many(self):
+        """Test executing a batch of tools across clients."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        try:
+            self.client1.execute_many = AsyncMock(return_value=[
+                ToolResult(success=True, data="a"),
+                ToolResult(success=True, data="b"),
+            ])
+            self.client2.execute_many = AsyncMock(return_value=[
+                ToolResult(success=True, data=1),
+            ])
+            
+            loop.run_until_complete(self.orchestrator.initialize())
+            results = loop.run_until_complete(self.orchestrator.execute_many([
+                ("tool1", {"param1": "a"}),
+                ("tool2", {"param2": 1}),
+                ("unknown_tool", {}),
+                ("tool1", {"param1": "b"}),
+            ]))
+            
+            # Each client receives its share of the batch in one call
+            self.client1.execute_many.assert_called_once_with([
+                ("tool1", {"param1": "a"}),
+                ("tool1", {"param1": "b"}),
+            ], dispatch=ANY)
+            self.client2.execute_many.assert_called_once_with([("tool2", {"param2": 1})], dispatch=ANY)
+            
+            # Results come back in call order
+            self.assertEqual([r.data for r in results], ["a", 1, None, "b"])
+            self.assertEqual(
+                [r.client_name for r in results],
+                ["filesystem", "memory", None, "filesystem"]
+            )
+            self.assertFalse(results[2].success)
+            self.assertIn("No client found for tool", results[2].error)
+        finally:
+            loop.close()
+
     def test_close(self):
         """Test the close method."""
         # Create event loop
@@ -201,6 +686,291 @@ class TestToolOrchestrator(unittest.TestCase):
         finally:
             loop.close()
 
+    def test_replicated_server_uses_pool(self):
+        """Test that servers configured with several replicas get a pool."""
+        self.mock_client_constructor.side_effect = [self.client2]
+        orchestrator = ToolOrchestrator(
+            [self.server_params1, self.server_params2],
+            log_dir=Path(self.log_dir.name),
+            replicas={"filesystem": 2}
+        )
+        self.assertIsInstance(orchestrator.clients["filesystem"], MCPClientPool)
+        self.assertEqual(orchestrator.clients["filesystem"].size, 2)
+        self.assertNotIsInstance(orchestrator.clients["memory"], MCPClientPool)
+
+    def test_hedged_calls_for_read_only_tools(self):
+        """Test that only read-only tools on pooled servers are hedged."""
+        self.mock_client_constructor.side_effect = [self.client2]
+        orchestrator = ToolOrchestrator(
+            [self.server_params1, self.server_params2],
+            log_dir=Path(self.log_dir.name),
+            replicas={"filesystem": 2},
+            hedge_percentile=95
+        )
+        pool = orchestrator.clients["filesystem"]
+        pool.execute_hedged = AsyncMock(return_value="hedged")
+        pool.execute_tool = AsyncMock(return_value="direct")
+        
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            result = loop.run_until_complete(orchestrator._call_client("filesystem", "read_file", {"path": "a"}))
+            self.assertEqual(result.data, "hedged")
+            pool.execute_hedged.assert_called_once_with("read_file", {"path": "a"}, percentile=95)
+            
+            result = loop.run_until_complete(orchestrator._call_client("filesystem", "write_file", {"path": "a"}))
+            self.assertEqual(result.data, "direct")
+        finally:
+            loop.close()
+        self.assertFalse(orchestrator._should_hedge(orchestrator.clients["memory"], "read_graph"))
+
+    def test_execute_with_affinity_key(self):
+        """Test that affinity keys reach pooled servers and scope cached results."""
+        self.mock_client_constructor.side_effect = [self.client2]
+        orchestrator = ToolOrchestrator(
+            [self.server_params1, self.server_params2],
+            log_dir=Path(self.log_dir.name),
+            replicas={"filesystem": 2},
+            tool_catalogs={"filesystem": [self.tool1], "memory": [self.tool2]},
+            result_cache=ToolResultCache(cacheable={"tool1", "tool2"})
+        )
+        pool = orchestrator.clients["filesystem"]
+        pool.execute_tool = AsyncMock(side_effect=["alice", "bob"])
+        self.client2.execute_tool = AsyncMock(return_value="shared")
+        
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(orchestrator.initialize())
+            alice = loop.run_until_complete(orchestrator.execute("tool1", {"param1": "x"}, affinity_key="alice"))
+            bob = loop.run_until_complete(orchestrator.execute("tool1", {"param1": "x"}, affinity_key="bob"))
+            again = loop.run_until_complete(orchestrator.execute("tool1", {"param1": "x"}, affinity_key="alice"))
+            self.assertEqual([alice.data, bob.data, again.data], ["alice", "bob", "alice"])
+            self.assertEqual(pool.execute_tool.call_count, 2)
+            pool.execute_tool.assert_called_with("tool1", {"param1": "x"}, affinity_key="bob")
+            
+            # Servers without replicas ignore the key
+            result = loop.run_until_complete(orchestrator.execute("tool2", {"param2": 1}, affinity_key="alice"))
+            self.assertEqual(result.data, "shared")
+            self.client2.execute_tool.assert_called_once_with("tool2", {"param2": 1})
+        finally:
+            loop.close()
+
+    def test_execute_with_scheduler(self):
+        """Test that queued calls to a server run in priority order."""
+        self.mock_client_constructor.side_effect = [self.client1, self.client2]
+        orchestrator = ToolOrchestrator(
+            [self.server_params1, self.server_params2],
+            log_dir=Path(self.log_dir.name),
+            tool_catalogs={"filesystem": [self.tool1], "memory": [self.tool2]},
+            scheduler={"max_concurrent": 1}
+        )
+        self.assertEqual(set(orchestrator.schedulers), {"filesystem", "memory"})
+        
+        order = []
+        release = asyncio.Event()
+        
+        async def execute_tool(tool_name, args):
+            order.append(args["param1"])
+            if args["param1"] == "first":
+                await release.wait()
+            return args["param1"]
+        
+        self.client1.execute_tool = AsyncMock(side_effect=execute_tool)
+        
+        async def run():
+            await orchestrator.initialize()
+            first = asyncio.create_task(orchestrator.execute("tool1", {"param1": "first"}))
+            await asyncio.sleep(0)
+            batch = asyncio.create_task(orchestrator.execute(
+                "tool1", {"param1": "batch"}, tenant="jobs", priority=FairScheduler.BATCH
+            ))
+            await asyncio.sleep(0)
+            turn = asyncio.create_task(orchestrator.execute(
+                "tool1", {"param1": "turn"}, tenant="agent", priority=FairScheduler.INTERACTIVE
+            ))
+            await asyncio.sleep(0)
+            # A queued call still honours its deadline
+            late = await orchestrator.execute("tool1", {"param1": "late"}, timeout=0.01)
+            self.assertTrue(late.timed_out)
+            release.set()
+            return await asyncio.gather(first, batch, turn)
+        
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            results = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual(order, ["first", "turn", "batch"])
+        self.assertEqual(orchestrator.schedulers["filesystem"].running, 0)
+
+    def test_execute_rate_limited(self):
+        """Test that calls wait for rate limit capacity within their deadline."""
+        self.mock_client_constructor.side_effect = [self.client1, self.client2]
+        orchestrator = ToolOrchestrator(
+            [self.server_params1, self.server_params2],
+            log_dir=Path(self.log_dir.name),
+            tool_catalogs={"filesystem": [self.tool1], "memory": [self.tool2]},
+            rate_limits={"filesystem": {"rate": 100, "capacity": 1}},
+            tool_rate_limits={"tool2": 0.1}
+        )
+        self.client1.execute_tool.return_value = "ok"
+        self.client2.execute_tool.return_value = "ok"
+        
+        async def run():
+            await orchestrator.initialize()
+            # The second call waits ~10ms for a refill instead of failing
+            results = await asyncio.gather(*(orchestrator.execute("tool1", {"param1": "x"}) for _ in range(2)))
+            self.assertTrue(all(result.success for result in results))
+            
+            self.assertTrue((await orchestrator.execute("tool2", {"param2": 1})).success)
+            # The next token is 10s away, so a short deadline expires first
+            return await orchestrator.execute("tool2", {"param2": 1}, timeout=0.01)
+        
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            result = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertTrue(result.timed_out)
+        self.assertEqual(self.client1.execute_tool.call_count, 2)
+        self.assertEqual(self.client2.execute_tool.call_count, 1)
+
+    def test_execute_many_rate_limited_per_call(self):
+        """Test that a batch's calls are spaced out by the rate limit and bounded by their deadline."""
+        self.mock_client_constructor.side_effect = [self.client1, self.client2]
+        orchestrator = ToolOrchestrator(
+            [self.server_params1, self.server_params2],
+            log_dir=Path(self.log_dir.name),
+            tool_catalogs={"filesystem": [self.tool1], "memory": [self.tool2]},
+            rate_limits={"filesystem": {"rate": 20, "capacity": 1}}
+        )
+        sent = []
+        
+        async def execute_many(calls, dispatch):
+            async def send():
+                sent.append(asyncio.get_running_loop().time())
+                return ToolResult(success=True, data="ok")
+            return await asyncio.gather(*(dispatch(tool_name, send) for tool_name, _ in calls))
+        
+        self.client1.execute_many = execute_many
+        batch = [("tool1", {"param1": str(n)}) for n in range(4)]
+        
+        async def run():
+            await orchestrator.initialize()
+            results = await orchestrator.execute_many(batch)
+            self.assertTrue(all(result.success for result in results))
+            # Only the calls that get a token within the deadline are sent
+            return await orchestrator.execute_many(batch, timeout=0.075)
+        
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            results = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        # Calls of one batch go out ~50ms apart instead of at once
+        gaps = [later - earlier for earlier, later in zip(sent[:4], sent[1:4])]
+        self.assertTrue(all(gap >= 0.04 for gap in gaps), gaps)
+        self.assertEqual(len(sent), 5)
+        self.assertEqual([result.timed_out for result in results], [False, True, True, True])
+
+    def test_rate_limit_applies_after_scheduler(self):
+        """Test that calls queued behind the scheduler do not burst past the rate limit."""
+        self.mock_client_constructor.side_effect = [self.client1, self.client2]
+        orchestrator = ToolOrchestrator(
+            [self.server_params1, self.server_params2],
+            log_dir=Path(self.log_dir.name),
+            tool_catalogs={"filesystem": [self.tool1], "memory": [self.tool2]},
+            rate_limits={"filesystem": {"rate": 50, "capacity": 1}},
+            scheduler={"max_concurrent": 1}
+        )
+        sent = []
+        
+        async def execute_tool(tool_name, args):
+            sent.append(asyncio.get_running_loop().time())
+            if args["param1"] == "slow":
+                await asyncio.sleep(0.1)
+            return "ok"
+        
+        self.client1.execute_tool.side_effect = execute_tool
+        
+        async def run():
+            await orchestrator.initialize()
+            slow = asyncio.ensure_future(orchestrator.execute("tool1", {"param1": "slow"}))
+            await asyncio.sleep(0.01)
+            quick = [orchestrator.execute("tool1", {"param1": str(n)}) for n in range(4)]
+            await asyncio.gather(slow, *quick)
+        
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(run())
+        finally:
+            loop.close()
+        # After the slow call, queued calls are still spaced ~20ms apart
+        gaps = [later - earlier for earlier, later in zip(sent[1:], sent[2:])]
+        self.assertEqual(len(gaps), 3)
+        self.assertTrue(all(gap >= 0.015 for gap in gaps), gaps)
+
+    def test_execute_tool_calls(self):
+        """Test that the tool calls of one response run concurrently, keyed by call id."""
+        self.mock_client_constructor.side_effect = [self.client1, self.client2]
+        orchestrator = ToolOrchestrator(
+            [self.server_params1, self.server_params2],
+            log_dir=Path(self.log_dir.name),
+            tool_catalogs={"filesystem": [self.tool1], "memory": [self.tool2]}
+        )
+        running = []
+        
+        async def execute_tool(tool_name, args):
+            running.append(tool_name)
+            await asyncio.sleep(0.01)
+            # Both calls are in flight before either finishes
+            self.assertEqual(len(running), 2)
+            return tool_name
+        
+        self.client1.execute_tool = AsyncMock(side_effect=execute_tool)
+        self.client2.execute_tool = AsyncMock(side_effect=execute_tool)
+        calls = [
+            ToolCall(id="call_1", name="tool1", args={"param1": "x"}),
+            ToolCall(id="call_2", name="tool2", args={"param2": 1}),
+            ToolCall(id="call_3", name="missing", args={}),
+        ]
+        
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(orchestrator.initialize())
+            results = loop.run_until_complete(orchestrator.execute_tool_calls(calls))
+        finally:
+            loop.close()
+        self.assertEqual(list(results), ["call_1", "call_2", "call_3"])
+        self.assertEqual(results["call_1"].data, "tool1")
+        self.assertEqual(results["call_2"].data, "tool2")
+        self.assertFalse(results["call_3"].success)
+
+    def test_execute_plan(self):
+        """Test that a plan runs through the orchestrator's clients."""
+        self.client1.execute_tool.return_value = "one"
+        self.client2.execute_tool.return_value = "two"
+        steps = [
+            PlanStep("first", "tool1", {"param1": "x"}),
+            PlanStep("second", "tool2", {"param2": 1}, depends_on=["first"]),
+        ]
+        
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.orchestrator.initialize())
+            results = loop.run_until_complete(self.orchestrator.execute_plan(steps))
+        finally:
+            loop.close()
+        self.assertEqual({key: result.data for key, result in results.items()}, {"first": "one", "second": "two"})
+
     def test_client_mapping(self):
         """Test that tool_to_client maps tools to correct clients."""
         # Create event loop
@@ -0,0 +1,159 @@
+"""
+Tests for the plan executor in the MCP adapter.
+"""
+
+import unittest
+import asyncio
+from unittest.mock import Mock
+
+from src.core.plan import PlanExecutor, PlanStep, step_resources
+from src.core.tools import ToolResult
+
+class TestPlanExecutor(unittest.TestCase):
+    """Test the PlanExecutor class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.events = []
+        self.orchestrator = Mock()
+        self.orchestrator.execute = self._execute
+        self.orchestrator.tool_to_client = {
+            name: "filesystem" for name in ("create_directory", "write_file", "read_file", "list_allowed_directories")
+        }
+        self.orchestrator.tool_to_client.update({
+            name: "memory" for name in ("create_entities", "create_relations", "read_graph", "search_nodes", "open_nodes")
+        })
+        self.executor = PlanExecutor(self.orchestrator)
+        
+        # The research workflow: directory, notes, entities, relations
+        self.steps = [
+            PlanStep("dir", "create_directory", {"path": "./research"}),
+            PlanStep("notes", "write_file", {"path": "./research/notes.md", "content": "..."}),
+            PlanStep("entities", "create_entities", {"entities": [{"name": "MCP"}, {"name": "LLM"}]}),
+            PlanStep("relations", "create_relations", {"relations": [{"from": "MCP", "to": "LLM"}]}),
+            PlanStep("readme", "read_file", {"path": "./README.md"}),
+        ]
+
+    async def _execute(self, tool_name, args, **kwargs):
+        self.events.append(("start", tool_name))
+        await asyncio.sleep(0.01)
+        self.events.append(("end", tool_name))
+        return ToolResult(success=not args.get("fail"), data=tool_name)
+
+    def test_step_resources(self):
+        """Test that paths and entity names are read from the arguments."""
+        paths, entities = step_resources(PlanStep("s", "move_file", {"source": "a/../b/c", "destination": "d"}))
+        self.assertEqual(paths, {"b/c", "d"})
+        self.assertEqual(entities, set())
+        paths, entities = step_resources(PlanStep("s", "add_observations", {
+            "observations": [{"entityName": "MCP", "contents": ["x"]}]
+        }))
+        self.assertEqual(entities, {"MCP"})
+
+    def test_inferred_dependencies(self):
+        """Test that only conflicting steps are ordered."""
+        graph = self.executor.dependencies(self.steps)
+        self.assertEqual(graph["dir"], set())
+        self.assertEqual(graph["notes"], {"dir"})
+        self.assertEqual(graph["entities"], set())
+        self.assertEqual(graph["relations"], {"entities"})
+        self.assertEqual(graph["readme"], set())
+        
+        # Two reads never conflict, and sibling paths do not overlap
+        graph = self.executor.dependencies([
+            PlanStep("a", "read_file", {"path": "x"}),
+            PlanStep("b", "read_file", {"path": "x"}),
+            PlanStep("c", "write_file", {"path": "xy"}),
+        ])
+        self.assertEqual(graph["b"], set())
+        self.assertEqual(graph["c"], set())
+        
+        graph = PlanExecutor(self.orchestrator, infer_conflicts=False).dependencies(self.steps)
+        self.assertEqual(graph["notes"], set())
+
+    def test_whole_store_conflicts(self):
+        """Test that whole-store reads and unknown resources order against writes."""
+        graph = self.executor.dependencies([
+            PlanStep("a", "create_entities", {"entities": [{"name": "A"}]}),
+            PlanStep("b", "create_entities", {"entities": [{"name": "B"}]}),
+            PlanStep("graph", "read_graph", {}),
+            PlanStep("search", "search_nodes", {"query": "A"}),
+            PlanStep("open", "open_nodes", {"names": ["B"]}),
+            PlanStep("dirs", "list_allowed_directories", {}),
+        ])
+        # Memory writes rewrite the whole graph, so they never run together
+        self.assertEqual(graph["b"], {"a"})
+        self.assertEqual(graph["graph"], {"a", "b"})
+        self.assertEqual(graph["search"], {"a", "b"})
+        self.assertEqual(graph["open"], {"b"})
+        # Steps on another server are not ordered against them
+        self.assertEqual(graph["dirs"], set())
+        
+        graph = self.executor.dependencies([
+            PlanStep("write", "write_file", {"path": "x", "content": "..."}),
+            PlanStep("dirs", "list_allowed_directories", {}),
+            PlanStep("unknown", "create_directory", {}),
+        ])
+        self.assertEqual(graph["dirs"], {"write"})
+        self.assertEqual(graph["unknown"], {"write", "dirs"})
+
+    def test_invalid_plans(self):
+        """Test that bad dependencies are rejected before anything runs."""
+        with self.assertRaises(ValueError):
+            self.executor.dependencies([PlanStep("a", "read_file", {}, ["missing"])])
+        with self.assertRaises(ValueError):
+            self.executor.dependencies([PlanStep("a", "read_file", {}), PlanStep("a", "read_file", {})])
+        with self.assertRaises(ValueError):
+            self.executor.dependencies([
+                PlanStep("a", "read_file", {}, ["b"]),
+                PlanStep("b", "read_file", {}, ["a"]),
+            ])
+
+    def test_declared_order_wins(self):
+        """Test that an explicit dependency on a later step is not reversed by inference."""
+        graph = self.executor.dependencies([
+            PlanStep("read", "read_file", {"path": "a.txt"}, ["write"]),
+            PlanStep("write", "write_file", {"path": "a.txt"}),
+        ])
+        self.assertEqual(graph, {"read": {"write"}, "write": set()})
+
+    async def async_test_run(self):
+        """Test that independent steps overlap while dependent ones are ordered."""
+        results = await self.executor.run(self.steps)
+        self.assertEqual(list(results), ["dir", "notes", "entities", "relations", "readme"])
+        self.assertTrue(all(result.success for result in results.values()))
+        
+        started = [tool for event, tool in self.events[:3]]
+        self.assertEqual(set(started), {"create_directory", "create_entities", "read_file"})
+        self.assertLess(self.events.index(("end", "create_directory")), self.events.index(("start", "write_file")))
+        self.assertLess(self.events.index(("end", "create_entities")), self.events.index(("start", "create_relations")))
+
+    async def async_test_failed_dependency(self):
+        """Test that steps after a failed dependency are skipped."""
+        self.steps[0].args["fail"] = True
+        results = await self.executor.run(self.steps)
+        self.assertFalse(results["dir"].success)
+        self.assertFalse(results["notes"].success)
+        self.assertIn("dependency 'dir' failed", results["notes"].error)
+        self.assertNotIn(("start", "write_file"), self.events)
+        self.assertTrue(results["relations"].success)
+
+    # Helper to run async tests
+    def test_run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_run())
+        finally:
+            loop.close()
+
+    def test_failed_dependency(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_failed_dependency())
+        finally:
+            loop.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,315 @@
+"""
+Tests for the client pool module in the MCP adapter.
+"""
+
+import unittest
+import asyncio
+from unittest.mock import AsyncMock, patch
+from mcp import StdioServerParameters
+
+from src.core.pool import MCPClientPool
+
+class TestMCPClientPool(unittest.TestCase):
+    """Test the MCPClientPool class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.server_params = StdioServerParameters(
+            command="npx",
+            args=["-y", "@modelcontextprotocol/server-filesystem", "/path/to/files"],
+            env=None
+        )
+        self.pool = MCPClientPool(self.server_params, size=3, client_name="test_pool")
+
+    def test_invalid_size(self):
+        """Test that a pool needs at least one replica."""
+        with self.assertRaises(ValueError):
+            MCPClientPool(self.server_params, size=0)
+
+    def test_replicas_are_persistent(self):
+        """Test that every replica keeps its session open."""
+        self.assertEqual(self.pool.size, 3)
+        for replica in self.pool.replicas:
+            self.assertTrue(replica.persistent)
+        names = [replica.client_name for replica in self.pool.replicas]
+        self.assertEqual(len(set(names)), 3)
+
+    def test_select_least_loaded(self):
+        """Test that the replica with the fewest in-flight calls is chosen."""
+        self.pool.replicas[0].in_flight = 4
+        self.pool.replicas[1].in_flight = 1
+        self.pool.replicas[2].in_flight = 2
+        for _ in range(3):
+            self.assertIs(self.pool._select_replica(), self.pool.replicas[1])
+
+    def test_affinity_routing(self):
+        """Test that an affinity key always picks the same replica, whatever the load."""
+        replica = self.pool._select_replica("tenant-1")
+        replica.in_flight = 10
+        for _ in range(3):
+            self.assertIs(self.pool._select_replica("tenant-1"), replica)
+        owners = {self.pool.replica_for(f"tenant-{i}").client_name for i in range(50)}
+        self.assertEqual(len(owners), 3)
+        
+        # Removing another replica leaves the key where it was
+        other = next(r for r in self.pool.replicas if r is not replica)
+        self.pool._remove_replica(other)
+        self.assertIs(self.pool.replica_for("tenant-1"), replica)
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_affinity_stable_while_resizing(self, mock_session_class, mock_stdio_client):
+        """Test that growing and shrinking the pool never moves an affinity key."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session_class.return_value.__aenter__.return_value = AsyncMock()
+        
+        pool = MCPClientPool(self.server_params, size=2, max_size=6, client_name="sticky")
+        owners = {f"conversation-{i}": pool.replica_for(f"conversation-{i}") for i in range(50)}
+        await pool.scale_to(6)
+        self.assertEqual(pool.size, 6)
+        self.assertEqual({key: pool.replica_for(key) for key in owners}, owners)
+        
+        # Busy non-affinity traffic grows the pool without touching the ring
+        for replica in pool.replicas:
+            replica.in_flight = 1
+        pool.max_size = 7
+        pool._select_replica()
+        self.assertEqual(pool.size, 7)
+        self.assertEqual({key: pool.replica_for(key) for key in owners}, owners)
+        for replica in pool.replicas:
+            replica.in_flight = 0
+        pool.replicas[-1].in_flight = 1
+        
+        # Shrinking only retires idle replicas outside the ring, even when
+        # ring replicas are the idle ones
+        await pool.scale_to(2)
+        self.assertEqual(pool.size, 3)
+        self.assertEqual({key: pool.replica_for(key) for key in owners}, owners)
+        pool.replicas[-1].in_flight = 0
+        await pool.close()
+
+    def test_affinity_stable_while_resizing(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_affinity_stable_while_resizing())
+        finally:
+            loop.close()
+
+    def test_invalid_bounds(self):
+        """Test that the initial size must lie within the size bounds."""
+        with self.assertRaises(ValueError):
+            MCPClientPool(self.server_params, size=2, min_size=3)
+        with self.assertRaises(ValueError):
+            MCPClientPool(self.server_params, size=2, max_size=1)
+
+    def test_select_round_robin_when_idle(self):
+        """Test that idle replicas are used in turn."""
+        selected = [self.pool._select_replica() for _ in range(3)]
+        self.assertEqual(selected, self.pool.replicas)
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_concurrent_calls_spread(self, mock_session_class, mock_stdio_client):
+        """Test that concurrent calls land on different replicas."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        
+        release = asyncio.Event()
+        
+        async def slow_call(tool_name, tool_args):
+            await release.wait()
+            return {"tool": tool_name}
+        
+        mock_session.call_tool.side_effect = slow_call
+        
+        tasks = [
+            asyncio.create_task(self.pool.execute_tool("read_file", {"path": str(i)}))
+            for i in range(3)
+        ]
+        # Let every call reach the server
+        for _ in range(10):
+            await asyncio.sleep(0)
+        self.assertEqual([replica.in_flight for replica in self.pool.replicas], [1, 1, 1])
+        
+        release.set()
+        results = await asyncio.gather(*tasks)
+        self.assertEqual(results, [{"tool": "read_file"}] * 3)
+        self.assertEqual(self.pool.in_flight, 0)
+        
+        await self.pool.close()
+        for replica in self.pool.replicas:
+            self.assertFalse(replica.connected)
+
+    def test_concurrent_calls_spread(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_concurrent_calls_spread())
+        finally:
+            loop.close()
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_grow_and_reap(self, mock_session_class, mock_stdio_client):
+        """Test that a busy pool grows to max_size and idle extras are shut down."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        
+        release = asyncio.Event()
+        
+        async def slow_call(tool_name, tool_args):
+            await release.wait()
+            return "done"
+        
+        mock_session.call_tool.side_effect = slow_call
+        
+        pool = MCPClientPool(self.server_params, size=1, max_size=3, idle_timeout=0.05, client_name="elastic")
+        tasks = [asyncio.create_task(pool.execute_tool("read_file", {})) for _ in range(5)]
+        for _ in range(10):
+            await asyncio.sleep(0)
+        self.assertEqual(pool.size, 3)
+        self.assertEqual(pool.load, 5)
+        
+        release.set()
+        await asyncio.gather(*tasks)
+        await asyncio.sleep(0.2)
+        self.assertEqual(pool.size, 1)
+        self.assertEqual(mock_stdio_client.return_value.__aexit__.call_count, 2)
+        await pool.close()
+
+    def test_grow_and_reap(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_grow_and_reap())
+        finally:
+            loop.close()
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_autoscale(self, mock_session_class, mock_stdio_client):
+        """Test that the autoscaler grows a backed-up pool and shrinks it when load drops."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        
+        release = asyncio.Event()
+        
+        async def slow_call(tool_name, tool_args):
+            await release.wait()
+            return "done"
+        
+        mock_session.call_tool.side_effect = slow_call
+        
+        pool = MCPClientPool(
+            self.server_params,
+            size=1,
+            max_size=4,
+            max_in_flight=1,
+            client_name="autoscaled",
+            autoscale={"interval": 0.01, "cooldown": 0, "scale_down_delay": 0.02}
+        )
+        # The autoscaler grows the pool to cover the backlog
+        tasks = [asyncio.create_task(pool.execute_tool("read_file", {})) for _ in range(4)]
+        for _ in range(100):
+            if pool.size == 3:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(pool.size, 3)
+        
+        # New calls go to the added replicas instead of the queue
+        tasks.append(asyncio.create_task(pool.execute_tool("read_file", {})))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        self.assertEqual(pool.replicas[0].load, 4)
+        
+        release.set()
+        await asyncio.gather(*tasks)
+        for _ in range(100):
+            if pool.size == 1:
+                break
+            await asyncio.sleep(0.02)
+        self.assertEqual(pool.size, 1)
+        await pool.close()
+        
+        # Busy replicas alone do not grow the pool, only the autoscaler does,
+        # so a backlog under its target leaves the pool alone
+        release.clear()
+        pool = MCPClientPool(
+            self.server_params,
+            size=1,
+            max_size=8,
+            max_in_flight=1,
+            client_name="autoscaled",
+            autoscale={"target_queue_depth": 100, "interval": 0.01}
+        )
+        tasks = [asyncio.create_task(pool.execute_tool("read_file", {})) for _ in range(6)]
+        await asyncio.sleep(0.05)
+        self.assertEqual(pool.size, 1)
+        release.set()
+        await asyncio.gather(*tasks)
+        await pool.close()
+
+    def test_autoscale(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_autoscale())
+        finally:
+            loop.close()
+
+    @patch("src.core.client.stdio_client")
+    @patch("src.core.client.ClientSession")
+    async def async_test_execute_hedged(self, mock_session_class, mock_stdio_client):
+        """Test that a slow call is hedged on another replica and the loser is cancelled."""
+        mock_stdio_client.return_value.__aenter__.return_value = (AsyncMock(), AsyncMock())
+        mock_session = AsyncMock()
+        mock_session_class.return_value.__aenter__.return_value = mock_session
+        
+        attempts = []
+        cancelled = []
+        
+        async def call_tool(tool_name, tool_args):
+            attempts.append(tool_name)
+            if len(attempts) == 1:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(tool_name)
+                    raise
+            return f"answer {len(attempts)}"
+        
+        mock_session.call_tool.side_effect = call_tool
+        
+        # Without latency history there is nothing to hedge against
+        self.assertIsNone(self.pool.hedge_delay("read_file"))
+        for _ in range(10):
+            self.pool._record_latency("read_file", 0.01, True)
+        self.assertEqual(self.pool.hedge_delay("read_file"), 0.01)
+        
+        result = await self.pool.execute_hedged("read_file", {"path": "a"})
+        self.assertEqual(result, "answer 2")
+        self.assertEqual(self.pool.hedged, 1)
+        self.assertEqual(self.pool.hedge_wins, 1)
+        await asyncio.sleep(0)
+        self.assertEqual(cancelled, ["read_file"])
+        self.assertEqual(self.pool.in_flight, 0)
+        
+        # A fast answer is not hedged
+        self.assertEqual(await self.pool.execute_hedged("read_file", {"path": "b"}), "answer 3")
+        self.assertEqual(self.pool.hedged, 1)
+        await self.pool.close()
+
+    def test_execute_hedged(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_execute_hedged())
+        finally:
+            loop.close()
+
+if __name__ == "__main__":
+    unittest.main()
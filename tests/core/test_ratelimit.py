@@ -0,0 +1,64 @@
+"""
+Tests for the rate limit module in the MCP adapter.
+"""
+
+import unittest
+import asyncio
+import time
+
+from src.core.ratelimit import TokenBucket
+
+class TestTokenBucket(unittest.TestCase):
+    """Test the TokenBucket class."""
+
+    def test_invalid_config(self):
+        """Test that rate and capacity must allow at least one call."""
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=1, capacity=0.5)
+
+    def test_from_config(self):
+        """Test building buckets from a rate or keyword arguments."""
+        bucket = TokenBucket.from_config(5)
+        self.assertEqual((bucket.rate, bucket.capacity), (5, 5))
+        bucket = TokenBucket.from_config({"rate": 0.5, "capacity": 3})
+        self.assertEqual((bucket.rate, bucket.capacity), (0.5, 3))
+        self.assertEqual(TokenBucket(0.2).capacity, 1)
+
+    def test_try_acquire(self):
+        """Test that a burst up to capacity is allowed, then refused."""
+        bucket = TokenBucket(rate=1, capacity=2)
+        self.assertTrue(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+
+    async def async_test_acquire_waits(self):
+        """Test that callers wait for refills and are served in order."""
+        bucket = TokenBucket(rate=100, capacity=2)
+        order = []
+        
+        async def call(name):
+            await bucket.acquire()
+            order.append(name)
+        
+        started = time.monotonic()
+        await asyncio.gather(*(call(i) for i in range(5)))
+        elapsed = time.monotonic() - started
+        self.assertEqual(order, [0, 1, 2, 3, 4])
+        # Two tokens are available up front, the other three take 10ms each
+        self.assertGreaterEqual(elapsed, 0.025)
+        
+        with self.assertRaises(ValueError):
+            await bucket.acquire(3)
+
+    def test_acquire_waits(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_acquire_waits())
+        finally:
+            loop.close()
+
+if __name__ == "__main__":
+    unittest.main()
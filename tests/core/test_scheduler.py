@@ -0,0 +1,96 @@
+"""
+Tests for the scheduler module in the MCP adapter.
+"""
+
+import unittest
+import asyncio
+
+from src.core.scheduler import FairScheduler
+
+class TestFairScheduler(unittest.TestCase):
+    """Test the FairScheduler class."""
+
+    def test_invalid_concurrency(self):
+        """Test that at least one call must be able to run."""
+        with self.assertRaises(ValueError):
+            FairScheduler(max_concurrent=0)
+
+    async def _run_order(self, scheduler, calls):
+        """Queue calls behind a held slot and return the order they run in."""
+        order = []
+        await scheduler.acquire("holder")
+        
+        async def call(name, tenant, priority):
+            async with scheduler.slot(tenant, priority):
+                order.append(name)
+        
+        tasks = []
+        for name, tenant, priority in calls:
+            tasks.append(asyncio.create_task(call(name, tenant, priority)))
+            await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        return order
+
+    async def async_test_priority_first(self):
+        """Test that interactive calls overtake queued batch calls."""
+        scheduler = FairScheduler(max_concurrent=1)
+        order = await self._run_order(scheduler, [
+            ("batch-1", "jobs", FairScheduler.BATCH),
+            ("batch-2", "jobs", FairScheduler.BATCH),
+            ("turn", "agent", FairScheduler.INTERACTIVE),
+        ])
+        self.assertEqual(order, ["turn", "batch-1", "batch-2"])
+        self.assertEqual(scheduler.running, 0)
+
+    async def async_test_weighted_fair_share(self):
+        """Test that a tenant's backlog does not starve others, in proportion to weight."""
+        scheduler = FairScheduler(max_concurrent=1, weights={"big": 2.0})
+        calls = [(f"bulk-{i}", "bulk", FairScheduler.NORMAL) for i in range(4)]
+        calls += [(f"small-{i}", "small", FairScheduler.NORMAL) for i in range(2)]
+        calls += [(f"big-{i}", "big", FairScheduler.NORMAL) for i in range(4)]
+        order = await self._run_order(scheduler, calls)
+        self.assertEqual(order[:3], ["big-0", "bulk-0", "small-0"])
+        # The double-weight tenant gets twice the share until its queue drains
+        self.assertLess(order.index("big-3"), order.index("bulk-3"))
+        self.assertLess(order.index("small-1"), order.index("bulk-2"))
+
+    async def async_test_cancelled_waiter(self):
+        """Test that a cancelled waiter gives up its place without leaking a slot."""
+        scheduler = FairScheduler(max_concurrent=1)
+        await scheduler.acquire()
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(scheduler.acquire("late"), 0.01)
+        self.assertEqual(scheduler.queued, 0)
+        scheduler.release()
+        self.assertEqual(scheduler.running, 0)
+        await asyncio.wait_for(scheduler.acquire(), 0.1)
+        self.assertEqual(scheduler.running, 1)
+
+    # Helper to run async tests
+    def test_priority_first(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_priority_first())
+        finally:
+            loop.close()
+
+    def test_weighted_fair_share(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_weighted_fair_share())
+        finally:
+            loop.close()
+
+    def test_cancelled_waiter(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_cancelled_waiter())
+        finally:
+            loop.close()
+
+if __name__ == "__main__":
+    unittest.main()
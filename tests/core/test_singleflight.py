@@ -0,0 +1,102 @@
+"""
+Tests for single-flight call coalescing in the MCP adapter.
+"""
+
+import unittest
+import asyncio
+
+from src.core.singleflight import SingleFlight
+
+class TestSingleFlight(unittest.TestCase):
+    """Test the SingleFlight class."""
+
+    async def async_test_coalesces_identical_calls(self):
+        """Test that concurrent calls with the same key run once."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+        
+        async def work():
+            calls.append(1)
+            await release.wait()
+            return "result"
+        
+        tasks = [asyncio.create_task(flight.do("key", work)) for _ in range(5)]
+        await asyncio.sleep(0)
+        self.assertEqual(len(flight), 1)
+        
+        release.set()
+        results = await asyncio.gather(*tasks)
+        self.assertEqual(results, ["result"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.coalesced, 4)
+        self.assertEqual(len(flight), 0)
+        
+        # Once finished, the next call runs again
+        self.assertEqual(await flight.do("key", work), "result")
+        self.assertEqual(len(calls), 2)
+
+    async def async_test_distinct_keys_and_errors(self):
+        """Test that different keys run separately and errors reach every waiter."""
+        flight = SingleFlight()
+        
+        async def fail():
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+        
+        async def succeed():
+            return "ok"
+        
+        results = await asyncio.gather(
+            flight.do("a", fail), flight.do("a", fail), flight.do("b", succeed),
+            return_exceptions=True
+        )
+        self.assertIsInstance(results[0], RuntimeError)
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual(results[2], "ok")
+
+    async def async_test_cancelled_waiter(self):
+        """Test that cancelling one waiter does not cancel the shared call."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+        
+        async def work():
+            await release.wait()
+            return "result"
+        
+        first = asyncio.create_task(flight.do("key", work))
+        second = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        
+        self.assertEqual(await second, "result")
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+
+    def test_coalesces_identical_calls(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_coalesces_identical_calls())
+        finally:
+            loop.close()
+
+    def test_distinct_keys_and_errors(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_distinct_keys_and_errors())
+        finally:
+            loop.close()
+
+    def test_cancelled_waiter(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_cancelled_waiter())
+        finally:
+            loop.close()
+
+if __name__ == "__main__":
+    unittest.main()
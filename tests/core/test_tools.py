@@ -30,6 +30,12 @@ class TestTool(unittest.TestCase):
         self.assertEqual(len(self.tool.required), 1)
         self.assertEqual(self.tool.required[0], "param1")
 
+    def test_tool_dict_round_trip(self):
+        """Test serializing a tool to a dict and back."""
+        restored = Tool.from_dict(self.tool.to_dict())
+        self.assertEqual(restored.to_dict(), self.tool.to_dict())
+        self.assertEqual(restored.name, "test_tool")
+
 
 class TestMCPTools(unittest.TestCase):
     """Test the MCPTools class."""
@@ -108,6 +114,26 @@ class TestMCPTools(unittest.TestCase):
         # Should not add the invalid tool
         self.assertEqual(len(tools.tools), 0)
 
+    def test_fingerprint(self):
+        """Test that the catalog fingerprint follows the tools' content."""
+        tools = MCPTools()
+        tools.add([self.tool1, self.tool2])
+        fingerprint = tools.fingerprint
+        
+        same = MCPTools()
+        same.add([Tool.from_dict(self.tool1.to_dict()), Tool.from_dict(self.tool2.to_dict())])
+        self.assertEqual(same.fingerprint, fingerprint)
+        
+        tools.remove_tool("tool2")
+        self.assertNotEqual(tools.fingerprint, fingerprint)
+        tools.add([self.tool2])
+        self.assertEqual(tools.fingerprint, fingerprint)
+        
+        changed = Tool.from_dict(dict(self.tool2.to_dict(), description="Changed"))
+        self.assertNotEqual(changed.fingerprint, self.tool2.fingerprint)
+        tools.add([changed])
+        self.assertNotEqual(tools.fingerprint, fingerprint)
+
     def test_get_tool(self):
         """Test getting a tool by name."""
         tools = MCPTools()
@@ -5,6 +5,7 @@ Tests for the base LLM adapter.
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock
+from src.core.tools import ToolResult
 from src.llm.base import BaseLLMAdapter
 
 class ConcreteLLMAdapter(BaseLLMAdapter):
@@ -60,6 +61,21 @@ class TestBaseLLMAdapter(unittest.TestCase):
         self.assertIsNone(self.adapter.chat)
         self.assertIsNone(self.adapter.tools)
         
+    def test_extract_tool_calls_default(self):
+        """Test that the default extract_tool_calls wraps extract_tool_call."""
+        calls = self.adapter.extract_tool_calls("search|query=mcp")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((calls[0].id, calls[0].name, calls[0].args), ("call_0", "search", {"query": "mcp"}))
+        self.assertEqual(self.adapter.extract_tool_calls("plain text"), [])
+
+    def test_tool_result_content(self):
+        """Test rendering tool results for the LLM."""
+        self.assertEqual(self.adapter._tool_result_content(ToolResult(success=True, data="text")), "text")
+        self.assertEqual(self.adapter._tool_result_content(ToolResult(success=True, data={"a": 1})), '{"a": 1}')
+        self.assertEqual(self.adapter._tool_result_content(ToolResult(success=False, data=None, error="boom")), "Error: boom")
+        with self.assertRaises(NotImplementedError):
+            self.adapter.session()
+
     def test_extract_by_schema_string(self):
         """Test extracting string values."""
         schema = {"type": "string"}
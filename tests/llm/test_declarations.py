@@ -0,0 +1,91 @@
+"""
+Tests for memoized provider tool declarations.
+"""
+
+import unittest
+from src.core.tools import Tool, MCPTools
+from src.llm.declarations import ToolDeclarationCache, compile_extractor
+
+def make_tool(name, description="A tool"):
+    return Tool(name=name, description=description, function_type="object",
+                properties={"path": {"type": "string"}}, required=["path"])
+
+class TestToolDeclarationCache(unittest.TestCase):
+    """Test the ToolDeclarationCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache = ToolDeclarationCache(lambda tool: {"name": tool.name, "description": tool.description})
+
+    def test_same_catalog_is_reused(self):
+        """Test that equal catalogs share one declaration list."""
+        first = MCPTools()
+        first.add([make_tool("read_file"), make_tool("write_file")])
+        second = MCPTools()
+        second.add([make_tool("read_file"), make_tool("write_file")])
+        
+        declarations = self.cache.get(first).declarations
+        self.assertEqual([d["name"] for d in declarations], ["read_file", "write_file"])
+        self.assertIs(self.cache.get(second).declarations, declarations)
+        self.assertEqual(self.cache.conversions, 2)
+
+    def test_only_changed_tools_are_converted(self):
+        """Test incremental rebuilds when the catalog changes."""
+        tools = MCPTools()
+        tools.add([make_tool("read_file"), make_tool("write_file")])
+        before = self.cache.get(tools).declarations
+        
+        tools.add([make_tool("write_file", "Changed"), make_tool("list_directory")])
+        after = self.cache.get(tools).declarations
+        self.assertEqual(self.cache.conversions, 4)
+        self.assertIs(after[0], before[0])
+        self.assertEqual(after[1]["description"], "Changed")
+        self.assertEqual(len(self.cache), 2)
+
+    def test_eviction(self):
+        """Test that the least recently used catalogs are evicted."""
+        cache = ToolDeclarationCache(lambda tool: {"name": tool.name}, max_catalogs=1, max_tools=1)
+        first = MCPTools()
+        first.add([make_tool("a")])
+        second = MCPTools()
+        second.add([make_tool("b")])
+        cache.get(first)
+        cache.get(second)
+        self.assertEqual(len(cache), 1)
+        cache.get(first)
+        self.assertEqual(cache.conversions, 3)
+
+    def test_extractors_by_name(self):
+        """Test that each catalog has compiled extractors keyed by tool name."""
+        tools = MCPTools()
+        tools.add([make_tool("read_file")])
+        extractors = self.cache.get(tools).extractors
+        self.assertEqual(list(extractors), ["read_file"])
+        self.assertEqual(extractors["read_file"]({"path": 7, "extra": 1}), {"path": "7"})
+
+class TestCompileExtractor(unittest.TestCase):
+    """Test compiled schema extractors."""
+
+    def test_nested_schema(self):
+        """Test conversion of nested objects and arrays."""
+        extract = compile_extractor({
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer"},
+                "ratio": {"type": "number"},
+                "flag": {"type": "boolean"},
+                "items": {"type": "array", "items": {
+                    "type": "object", "properties": {"name": {"type": "string"}}
+                }},
+                "raw": {}
+            }
+        })
+        value = {"count": "3", "ratio": "0.5", "flag": 1, "items": [{"name": 1, "x": 2}], "raw": [1], "other": 0}
+        self.assertEqual(extract(value), {
+            "count": 3, "ratio": 0.5, "flag": True, "items": [{"name": "1"}], "raw": [1]
+        })
+        self.assertEqual(extract("not an object"), {})
+        self.assertEqual(compile_extractor({"type": "array"})(5), [])
+
+if __name__ == "__main__":
+    unittest.main()
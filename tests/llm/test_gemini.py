@@ -7,7 +7,7 @@ import asyncio
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
 from src.llm.gemini import GeminiAdapter
-from src.core.tools import Tool, MCPTools
+from src.core.tools import Tool, MCPTools, ToolCall, ToolResult
 
 class TestGeminiAdapter(unittest.TestCase):
     """Test the GeminiAdapter class."""
@@ -147,6 +147,87 @@ class TestGeminiAdapter(unittest.TestCase):
         self.assertEqual(tool_name, "test_tool")
         self.assertEqual(tool_args, {"param1": "test value", "param2": 42})
 
+    def test_extract_tool_calls(self):
+        """Test extracting every function call part, skipping text parts."""
+        self.adapter.tools = [{"function_declarations": [{
+            "name": "test_tool",
+            "parameters": {"type": "object", "properties": {"param2": {"type": "integer"}}}
+        }]}]
+        
+        def part(name, args):
+            mock_part = MagicMock()
+            mock_part.function_call.name = name
+            mock_part.function_call.args = args
+            return mock_part
+        
+        mock_response = MagicMock()
+        mock_response.parts = [part("", {}), part("test_tool", {"param2": "1"}), part("test_tool", {"param2": 2.0})]
+        
+        calls = self.adapter.extract_tool_calls(mock_response)
+        self.assertEqual([call.id for call in calls], ["call_0", "call_1"])
+        self.assertEqual([call.args for call in calls], [{"param2": 1}, {"param2": 2}])
+        
+        # Unknown tools raise, as with extract_tool_call
+        mock_response.parts = [part("other_tool", {})]
+        with self.assertRaises(ValueError):
+            self.adapter.extract_tool_calls(mock_response)
+
+    async def async_test_send_message_stream(self):
+        """Test streaming text parts and function calls from Gemini."""
+        self.adapter.tools = [{"function_declarations": [{
+            "name": "test_tool",
+            "parameters": {"type": "object", "properties": {"param2": {"type": "integer"}}}
+        }]}]
+        orchestrator = MagicMock()
+        orchestrator.execute = AsyncMock(return_value="result")
+        
+        def text_part(text):
+            mock_part = MagicMock(text=text)
+            mock_part.function_call = None
+            return mock_part
+        
+        def call_part(name, args):
+            mock_part = MagicMock()
+            mock_part.function_call.name = name
+            mock_part.function_call.args = args
+            return mock_part
+        
+        async def chunks():
+            yield MagicMock(parts=[text_part("Checking")])
+            yield MagicMock(parts=[call_part("test_tool", {"param2": "1"}), call_part("other_tool", {})])
+            yield MagicMock(parts=[text_part(" now")])
+        
+        self.adapter.chat = MagicMock()
+        self.adapter.chat.send_message_async = AsyncMock(return_value=chunks())
+        
+        response = await self.adapter.send_message("Hello", stream=True, orchestrator=orchestrator)
+        self.assertEqual(await response.consume(), "Checking now")
+        self.adapter.chat.send_message_async.assert_called_once_with("Hello", stream=True)
+        self.assertEqual([(call.id, call.args) for call in response.tool_calls], [("call_0", {"param2": 1})])
+        self.assertEqual(await response.tool_results(), {"call_0": "result"})
+
+    async def async_test_sessions(self):
+        """Test that each session gets its own Gemini chat on the shared model."""
+        self.adapter.model = MagicMock()
+        chats = [MagicMock(), MagicMock()]
+        for chat in chats:
+            chat.send_message_async = AsyncMock(return_value="response")
+        self.adapter.model.start_chat.side_effect = chats
+        
+        first = self.adapter.session()
+        second = self.adapter.session()
+        self.assertEqual((first.chat, second.chat), tuple(chats))
+        
+        await first.send_message("Hello")
+        await second.send_tool_results(
+            [ToolCall(id="call_0", name="test_tool", args={})],
+            {"call_0": ToolResult(success=False, data=None, error="boom")}
+        )
+        chats[0].send_message_async.assert_called_once_with("Hello")
+        parts = chats[1].send_message_async.call_args[0][0]
+        self.assertEqual(parts[0].function_response.name, "test_tool")
+        self.assertEqual(parts[0].function_response.response["result"], "Error: boom")
+
     # Helper to run async tests
     def test_configure(self):
         loop = asyncio.new_event_loop()
@@ -172,6 +253,22 @@ class TestGeminiAdapter(unittest.TestCase):
         finally:
             loop.close()
             
+    def test_send_message_stream(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_send_message_stream())
+        finally:
+            loop.close()
+            
+    def test_sessions(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_sessions())
+        finally:
+            loop.close()
+            
     def test_extract_tool_call_with_call(self):
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
@@ -5,9 +5,10 @@ Tests for the OpenAI LLM adapter.
 import unittest
 import asyncio
 import json
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
-from src.llm.openai import OpenAIAdapter
-from src.core.tools import Tool, MCPTools
+from src.llm.openai import OpenAIAdapter, get_shared_http_client, close_shared_http_clients
+from src.core.tools import Tool, MCPTools, ToolResult
 
 class TestOpenAIAdapter(unittest.TestCase):
     """Test the OpenAIAdapter class."""
@@ -31,7 +32,7 @@ class TestOpenAIAdapter(unittest.TestCase):
         self.tools = MCPTools()
         self.tools.add([self.tool1])
 
-    @patch("src.llm.openai.OpenAI")
+    @patch("src.llm.openai.AsyncOpenAI")
     async def async_test_configure(self, mock_openai):
         """Test the configure method."""
         # Mock the OpenAI client
@@ -41,13 +42,22 @@ class TestOpenAIAdapter(unittest.TestCase):
         # Configure the adapter
         await self.adapter.configure("fake-api-key")
         
-        # Check that the OpenAI client was created with the right API key
-        mock_openai.assert_called_once_with(api_key="fake-api-key")
+        # Check that the OpenAI client was created with the right API key and the shared pool
+        mock_openai.assert_called_once_with(api_key="fake-api-key", http_client=get_shared_http_client())
         
         # The adapter should store the client
         self.assertEqual(self.adapter.client, mock_client)
+        
+        # Adapters with the same limits share one connection pool
+        other = OpenAIAdapter(model_name="gpt-4o")
+        await other.configure("other-key")
+        self.assertIs(mock_openai.call_args[1]["http_client"], get_shared_http_client())
+        custom = OpenAIAdapter(max_connections=5)
+        await custom.configure("custom-key")
+        self.assertIsNot(mock_openai.call_args[1]["http_client"], get_shared_http_client())
+        await close_shared_http_clients()
 
-    @patch("src.llm.openai.OpenAI")
+    @patch("src.llm.openai.AsyncOpenAI")
     async def async_test_prepare_tools(self, mock_openai):
         """Test the prepare_tools method."""
         # Mock the OpenAI client
@@ -76,15 +86,15 @@ class TestOpenAIAdapter(unittest.TestCase):
         self.assertIn("param1", schema["properties"])
         self.assertIn("param2", schema["properties"])
 
-    @patch("src.llm.openai.OpenAI")
+    @patch("src.llm.openai.AsyncOpenAI")
     async def async_test_send_message(self, mock_openai):
         """Test the send_message method."""
         # Mock the OpenAI client
         mock_client = MagicMock()
         mock_openai.return_value = mock_client
         
-        # Mock the chat.completions.create method with a non-async mock
-        # since the actual implementation isn't awaiting the result
+        # The async client's create method is awaited
+        mock_client.chat.completions.create = AsyncMock()
         mock_response = MagicMock()
         mock_response.choices = [MagicMock()]
         mock_response.choices[0].message = MagicMock()
@@ -109,7 +119,7 @@ class TestOpenAIAdapter(unittest.TestCase):
         # Check the response
         self.assertEqual(response, mock_response)
 
-    @patch("src.llm.openai.OpenAI")
+    @patch("src.llm.openai.AsyncOpenAI")
     @patch("src.llm.openai.OpenAIAdapter.extract_tool_call")
     async def async_test_extract_tool_call_with_call(self, mock_extract, mock_openai):
         """Test extracting a tool call from a response."""
@@ -143,7 +153,7 @@ class TestOpenAIAdapter(unittest.TestCase):
         self.assertEqual(tool_name, "test_tool")
         self.assertEqual(tool_args, {"param1": "test value", "param2": 42})
 
-    @patch("src.llm.openai.OpenAI")
+    @patch("src.llm.openai.AsyncOpenAI")
     @patch("src.llm.openai.OpenAIAdapter.extract_tool_call")
     async def async_test_extract_tool_call_without_call(self, mock_extract, mock_openai):
         """Test extracting a tool call when there is none."""
@@ -170,7 +180,7 @@ class TestOpenAIAdapter(unittest.TestCase):
         self.assertIsNone(tool_name)
         self.assertIsNone(tool_args)
 
-    @patch("src.llm.openai.OpenAI")
+    @patch("src.llm.openai.AsyncOpenAI")
     @patch("src.llm.openai.OpenAIAdapter.extract_tool_call")
     async def async_test_extract_tool_call_invalid_json(self, mock_extract, mock_openai):
         """Test extracting a tool call with invalid JSON arguments."""
@@ -204,6 +214,159 @@ class TestOpenAIAdapter(unittest.TestCase):
         self.assertIsNone(tool_name)
         self.assertIsNone(tool_args)
 
+    def test_shared_http_client_per_event_loop(self):
+        """Test that each event loop gets its own shared HTTP client."""
+        clients = []
+        for _ in range(2):
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                clients.append(loop.run_until_complete(self._shared_client_twice()))
+                loop.run_until_complete(close_shared_http_clients())
+            finally:
+                loop.close()
+        self.assertIsNot(clients[0], clients[1])
+        self.assertTrue(clients[0].is_closed)
+
+    async def _shared_client_twice(self):
+        client = get_shared_http_client()
+        self.assertIs(get_shared_http_client(), client)
+        return client
+
+    def test_extract_tool_calls(self):
+        """Test extracting every tool call of a response, keyed by call id."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.adapter.prepare_tools(self.tools))
+        finally:
+            loop.close()
+        
+        def tool_call(call_id, name, arguments):
+            mock_call = MagicMock(id=call_id)
+            mock_call.function.name = name
+            mock_call.function.arguments = arguments
+            return mock_call
+        
+        mock_response = MagicMock()
+        mock_response.choices[0].message.tool_calls = [
+            tool_call("call_a", "test_tool", '{"param1": "a", "param2": "1"}'),
+            tool_call("call_b", "test_tool", '{"param1": invalid json'),
+            tool_call("call_c", "test_tool", '{"param1": "c"}'),
+        ]
+        
+        calls = self.adapter.extract_tool_calls(mock_response)
+        self.assertEqual([call.id for call in calls], ["call_a", "call_c"])
+        self.assertEqual(calls[0].args, {"param1": "a", "param2": 1})
+        self.assertEqual(calls[1].name, "test_tool")
+        self.assertEqual(self.adapter.extract_tool_call(mock_response), ("test_tool", {"param1": "a", "param2": 1}))
+        
+        mock_response.choices[0].message.tool_calls = None
+        self.assertEqual(self.adapter.extract_tool_calls(mock_response), [])
+
+    async def async_test_prepare_tools_shared(self):
+        """Test that adapters preparing the same catalog share declarations."""
+        other = OpenAIAdapter(model_name="gpt-4o")
+        catalog = MCPTools()
+        catalog.add([Tool.from_dict(self.tool1.to_dict())])
+        await self.adapter.prepare_tools(self.tools)
+        await other.prepare_tools(catalog)
+        self.assertIs(other.tools, self.adapter.tools)
+        self.assertIs(other._extractor("test_tool"), self.adapter._extractor("test_tool"))
+        self.assertIsNone(other._extractor("missing_tool"))
+
+    async def async_test_send_message_stream(self):
+        """Test streaming text and dispatching a tool call once its arguments parse."""
+        await self.adapter.prepare_tools(self.tools)
+        orchestrator = MagicMock()
+        orchestrator.execute = AsyncMock(return_value="result")
+        
+        def chunk(content=None, tool_calls=None):
+            delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+            return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+        
+        def fragment(index, arguments, call_id=None, name=None):
+            return SimpleNamespace(index=index, id=call_id,
+                                   function=SimpleNamespace(name=name, arguments=arguments))
+        
+        dispatched_early = []
+        
+        async def events():
+            yield chunk(content="Look")
+            yield chunk(content="ing")
+            yield chunk(tool_calls=[fragment(0, '{"param1": "a",', "call_a", "test_tool")])
+            yield chunk(tool_calls=[fragment(0, ' "param2": "2"}')])
+            yield chunk(tool_calls=[fragment(1, '{"param1": ', "call_b", "test_tool")])
+            # The first call is running while the model keeps generating
+            dispatched_early.append(orchestrator.execute.call_count)
+            yield chunk(tool_calls=[fragment(1, '"b"}')])
+            yield chunk(tool_calls=[fragment(2, '{"param1": invalid', "call_c", "test_tool")])
+            # A null integer cannot be extracted; the call is skipped, not the stream
+            yield chunk(tool_calls=[fragment(3, '{"param1": "d", "param2": null}', "call_d", "test_tool")])
+            yield chunk(content=" done")
+        
+        self.adapter.client = MagicMock()
+        self.adapter.client.chat.completions.create = AsyncMock(return_value=events())
+        
+        self.adapter._parse_arguments = MagicMock(wraps=self.adapter._parse_arguments)
+        response = await self.adapter.send_message("Hello", stream=True, orchestrator=orchestrator, timeout=3)
+        tokens = [token async for token in response]
+        
+        self.assertEqual(tokens, ["Look", "ing", " done"])
+        self.assertEqual(response.text, "Looking done")
+        self.assertTrue(self.adapter.client.chat.completions.create.call_args[1]["stream"])
+        self.assertEqual(dispatched_early, [1])
+        self.assertEqual([call.id for call in response.tool_calls], ["call_a", "call_b"])
+        # Arguments are only parsed once they can be complete
+        self.assertEqual(self.adapter._parse_arguments.call_count, 3)
+        self.assertEqual(response.tool_calls[0].args, {"param1": "a", "param2": 2})
+        self.assertEqual(await response.tool_results(), {"call_a": "result", "call_b": "result"})
+        orchestrator.execute.assert_any_await("test_tool", {"param1": "b"}, timeout=3)
+
+    async def async_test_sessions(self):
+        """Test that sessions on one adapter keep separate histories."""
+        await self.adapter.prepare_tools(self.tools)
+        
+        def completion(content, tool_calls=None):
+            message = SimpleNamespace(content=content, tool_calls=tool_calls)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        
+        tool_call = SimpleNamespace(
+            id="call_a", function=SimpleNamespace(name="test_tool", arguments='{"param1": "a"}')
+        )
+        malformed_call = SimpleNamespace(
+            id="call_b", function=SimpleNamespace(name="test_tool", arguments='{"param1": invalid')
+        )
+        self.adapter.client = MagicMock()
+        create = self.adapter.client.chat.completions.create = AsyncMock(side_effect=[
+            completion(None, [tool_call, malformed_call]),
+            completion("Hi B"),
+            completion("Done A"),
+        ])
+        
+        first = self.adapter.session("conversation-a")
+        second = self.adapter.session()
+        self.assertEqual(first.id, "conversation-a")
+        self.assertNotEqual(second.id, first.id)
+        
+        response = await first.send_message("Use the tool")
+        await second.send_message("Hello")
+        calls = first.extract_tool_calls(response)
+        await first.send_tool_results(calls, {"call_a": ToolResult(success=True, data={"ok": True})})
+        
+        self.assertEqual([message["role"] for message in first.chat], ["user", "assistant", "tool", "assistant"])
+        # Only calls that parse are recorded, so every recorded call gets an answer
+        self.assertEqual([call["id"] for call in first.chat[1]["tool_calls"]], ["call_a"])
+        self.assertEqual(first.chat[2], {"role": "tool", "tool_call_id": "call_a", "content": '{"ok": true}'})
+        self.assertEqual(first.chat[3]["content"], "Done A")
+        self.assertEqual(second.chat, [
+            {"role": "user", "content": "Hello"},
+            {"role": "assistant", "content": "Hi B"},
+        ])
+        self.assertIs(create.call_args_list[2][1]["messages"], first.chat)
+        # Messages sent without a session carry no history
+        self.assertIsNone(self.adapter.chat)
+
     # Helper to run async tests
     def test_configure(self):
         loop = asyncio.new_event_loop()
@@ -245,6 +408,30 @@ class TestOpenAIAdapter(unittest.TestCase):
         finally:
             loop.close()
             
+    def test_prepare_tools_shared(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_prepare_tools_shared())
+        finally:
+            loop.close()
+            
+    def test_send_message_stream(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_send_message_stream())
+        finally:
+            loop.close()
+            
+    def test_sessions(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_sessions())
+        finally:
+            loop.close()
+            
     def test_extract_tool_call_invalid_json(self):
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
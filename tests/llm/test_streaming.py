@@ -0,0 +1,69 @@
+"""
+Tests for streamed LLM responses.
+"""
+
+import unittest
+import asyncio
+from unittest.mock import MagicMock
+from src.core.tools import ToolCall
+from src.llm.streaming import StreamingResponse
+
+class TestStreamingResponse(unittest.TestCase):
+    """Test the StreamingResponse class."""
+
+    async def async_test_dispatch_before_stream_ends(self):
+        """Test that tool calls start executing while the stream continues."""
+        started = asyncio.Event()
+        
+        async def execute(name, args, **kwargs):
+            started.set()
+            return name
+        
+        orchestrator = MagicMock()
+        orchestrator.execute = execute
+        
+        async def events():
+            yield "a"
+            yield ToolCall(id="call_0", name="read_file", args={"path": "x"})
+            # Give the dispatched call a chance to run before the stream ends
+            await asyncio.sleep(0)
+            yield "b" if started.is_set() else "late"
+        
+        response = StreamingResponse(events(), orchestrator)
+        self.assertEqual([token async for token in response], ["a", "b"])
+        self.assertEqual(await response.tool_results(), {"call_0": "read_file"})
+        
+        with self.assertRaises(RuntimeError):
+            async for _ in response:
+                pass
+
+    async def async_test_without_orchestrator(self):
+        """Test that tool calls are only collected without an orchestrator."""
+        async def events():
+            yield ToolCall(id="call_0", name="read_file", args={})
+            yield "text"
+        
+        response = StreamingResponse(events())
+        self.assertEqual(await response.consume(), "text")
+        self.assertEqual([call.id for call in response.tool_calls], ["call_0"])
+        self.assertEqual(await response.tool_results(), {})
+
+    # Helper to run async tests
+    def test_dispatch_before_stream_ends(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_dispatch_before_stream_ends())
+        finally:
+            loop.close()
+            
+    def test_without_orchestrator(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.async_test_without_orchestrator())
+        finally:
+            loop.close()
+
+if __name__ == "__main__":
+    unittest.main()